@@ -0,0 +1,98 @@
+"""
+Latency of /search_events on a seeded event table: ranking the matches and
+loading the first page, as the command does.
+
+Events get a sport in the title, random words in the description and one
+of the cities as location, so queries range from common words matching
+~10% of events to rare ones. Everything runs in a transaction which is
+rolled back at the end.
+
+Usage:
+    python -m benchmarks.event_search --events 1000000 --rounds 50
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.database_config import async_engine
+from src.models.managers.event import EventManager
+from src.services.metrics import Histogram
+from src.utils.pagination import PAGE_SIZE
+
+SPORTS = ["football", "chess", "tennis", "hockey", "volleyball", "basketball", "running", "cycling", "swimming", "darts"]
+CITIES = ["Minsk", "Brest", "Grodno", "Gomel", "Vitebsk", "Mogilev", "Pinsk", "Lida", "Orsha", "Borisov"]
+# Description words are word0 .. word4999
+WORDS = 5000
+
+QUERIES = {
+    "common word": "football",
+    "two words": "chess Minsk",
+    "phrase": '"tennis cup"',
+    "rare word": "word4242",
+    "excluded": "hockey -final",
+    "no match": "curling",
+}
+
+
+def array(values) -> str:
+    return "ARRAY[" + ", ".join(f"'{value}'" for value in values) + "]"
+
+
+SEED = [
+    """
+    CREATE TEMP TABLE bench_owner ON COMMIT DROP AS
+    SELECT gen_random_uuid() AS user_id, gen_random_uuid() AS category_id
+    """,
+    """INSERT INTO "user" (id, username, created_at, updated_at)
+    SELECT user_id, 'search_bench_' || user_id, now(), now() FROM bench_owner""",
+    """INSERT INTO category (id, name, description, created_at, updated_at)
+    SELECT category_id, 'search_bench', '', now(), now() FROM bench_owner""",
+    f"""
+    INSERT INTO event (id, title, category_id, location, people_amount, experience, date_time, organizer_id,
+                       description, created_at, updated_at)
+    SELECT gen_random_uuid(),
+           initcap(({array(SPORTS)})[1 + i % {len(SPORTS)}]) || ' ' || (ARRAY['cup', 'league', 'final', 'meetup'])[1 + i % 4],
+           o.category_id,
+           ({array(CITIES)})[1 + (i / 7) % {len(CITIES)}],
+           10, 1, current_date, o.user_id,
+           'word' || (i::bigint * 7919) % {WORDS} || ' word' || (i::bigint * 104729) % {WORDS},
+           now(), now()
+    FROM generate_series(1, :events) s(i), bench_owner o
+    """,
+    "SELECT gin_clean_pending_list('ix_event_search_vector')",
+    "ANALYZE event",
+]
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    async with async_engine.connect() as connection:
+        transaction = await connection.begin()
+        started = time.perf_counter()
+        for statement in SEED:
+            await connection.execute(text(statement), {"events": args.events})
+        print(f"seeded {args.events} events in {time.perf_counter() - started:.1f} s")
+
+        session = AsyncSession(bind=connection, join_transaction_mode="create_savepoint")
+        for name, query in QUERIES.items():
+            histogram = Histogram()
+            for _ in range(args.rounds):
+                started = time.perf_counter()
+                event_ids = await EventManager.search_event_ids(session, query)
+                rows = await EventManager.get_events_by_ids(session, event_ids[:PAGE_SIZE])
+                histogram.record((time.perf_counter() - started) * 1_000_000)
+            summary = histogram.summary()
+            print(f"{name:<12} {query!r:<18} {len(rows)} rows  p50 {summary['p50_ms']:7.2f} ms  p95 {summary['p95_ms']:7.2f} ms")
+        await session.close()
+        await transaction.rollback()
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
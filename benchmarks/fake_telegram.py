@@ -0,0 +1,157 @@
+"""
+Local fake Telegram for offline throughput benchmarks of the webhook mode.
+
+It runs a fake Bot API server (so handlers can "send" messages without
+network access) and a client that POSTs synthetic updates to the webhook.
+
+Usage:
+    python -m benchmarks.fake_telegram --updates 5000 --concurrency 100
+    python -m benchmarks.fake_telegram --target http://127.0.0.1:8080/webhook
+"""
+import argparse
+import asyncio
+import itertools
+import time
+
+from aiohttp import ClientSession, web
+
+
+def make_message_update(update_id: int, chat_id: int, text: str) -> dict:
+    """Builds a synthetic message update from a private chat."""
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": "Bench"},
+            "text": text,
+            "entities": [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}]
+            if text.startswith("/") else [],
+        },
+    }
+
+
+def create_fake_api_app() -> web.Application:
+    """Fake Bot API answering every method with a successful result."""
+    message_ids = itertools.count(1)
+
+    async def handle_method(request: web.Request) -> web.Response:
+        method = request.match_info["method"].lower()
+        params = await request.post()
+
+        if method == "getme":
+            result = {"id": 1, "is_bot": True, "first_name": "FakeBot", "username": "fake_bot"}
+        elif method in ("sendmessage", "editmessagetext"):
+            result = {
+                "message_id": next(message_ids),
+                "date": int(time.time()),
+                "chat": {"id": int(params.get("chat_id", 0)), "type": "private"},
+                "text": params.get("text", ""),
+            }
+        else:
+            result = True
+        return web.json_response({"ok": True, "result": result})
+
+    app = web.Application()
+    app.router.add_post("/bot{token}/{method}", handle_method)
+    return app
+
+
+async def post_updates(
+    url: str,
+    updates: int,
+    concurrency: int,
+    chats: int,
+    text: str = "/menu",
+    secret: str | None = None,
+) -> dict:
+    """
+    Posts synthetic updates to the webhook and measures throughput.
+    Rejected (503) updates are retried, the same way Telegram does.
+    """
+    headers = {"X-Telegram-Bot-Api-Secret-Token": secret} if secret else {}
+    update_ids = iter(range(1, updates + 1))
+    rejected = 0
+
+    async def sender(session: ClientSession) -> None:
+        nonlocal rejected
+        for update_id in update_ids:
+            payload = make_message_update(update_id, 1000 + update_id % chats, text)
+            while True:
+                async with session.post(url, json=payload, headers=headers) as response:
+                    if response.status != 503:
+                        break
+                    rejected += 1
+                    await asyncio.sleep(float(response.headers.get("Retry-After", 1)) / 10)
+
+    started = time.perf_counter()
+    async with ClientSession() as session:
+        await asyncio.gather(*(sender(session) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "updates": updates,
+        "seconds": round(elapsed, 3),
+        "updates_per_second": round(updates / elapsed, 1),
+        "rejected": rejected,
+    }
+
+
+async def run_local_benchmark(args: argparse.Namespace) -> dict:
+    """Runs fake Bot API, webhook server and the client in one process."""
+    from aiogram import Bot
+    from aiogram.client.session.aiohttp import AiohttpSession
+    from aiogram.client.telegram import TelegramAPIServer
+
+    from main import create_dispatcher
+    from src.services.webhook import UpdateWorkerPool, create_webhook_app
+
+    api_runner = web.AppRunner(create_fake_api_app())
+    await api_runner.setup()
+    await web.TCPSite(api_runner, "127.0.0.1", args.api_port).start()
+
+    session = AiohttpSession(api=TelegramAPIServer.from_base(f"http://127.0.0.1:{args.api_port}"))
+    bot = Bot(token="123456:fake-token", session=session)
+    dispatcher = create_dispatcher()
+    pool = UpdateWorkerPool(dispatcher, bot, args.workers, args.queue_size)
+    webhook_runner = web.AppRunner(create_webhook_app(dispatcher, bot, pool, enqueue_timeout=0.1))
+    await webhook_runner.setup()
+    await web.TCPSite(webhook_runner, "127.0.0.1", args.webhook_port).start()
+
+    try:
+        stats = await post_updates(
+            f"http://127.0.0.1:{args.webhook_port}/webhook", args.updates, args.concurrency, args.chats
+        )
+        await pool.stop()
+        stats["processed"] = pool.processed
+        stats["failed"] = pool.failed
+        return stats
+    finally:
+        await webhook_runner.cleanup()
+        await api_runner.cleanup()
+        await bot.session.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", help="Webhook URL of an already running bot")
+    parser.add_argument("--secret", help="Webhook secret token of the target")
+    parser.add_argument("--updates", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--chats", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--queue-size", type=int, default=1000)
+    parser.add_argument("--api-port", type=int, default=8081)
+    parser.add_argument("--webhook-port", type=int, default=8082)
+    args = parser.parse_args()
+
+    if args.target:
+        stats = asyncio.run(post_updates(args.target, args.updates, args.concurrency, args.chats, secret=args.secret))
+    else:
+        stats = asyncio.run(run_local_benchmark(args))
+    print(stats)
+
+
+if __name__ == "__main__":
+    main()
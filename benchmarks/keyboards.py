@@ -0,0 +1,64 @@
+"""
+Cost of preparing the main menu keyboard for one outgoing message.
+
+"builder" rebuilds the menu with InlineKeyboardBuilder on every call and
+lets the session serialize it, which is what /menu and /start used to do.
+"prepared" sends the markup from the keyboard registry, built once and
+serialized once. "dynamic" looks up a cached picker by its data version.
+
+Usage:
+    python -m benchmarks.keyboards --rounds 20000
+"""
+import argparse
+import time
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.methods import SendMessage
+from aiogram.utils.keyboard import InlineKeyboardBuilder
+
+from src.utils.keyboards import MAIN_MENU, KeyboardRegistry, PreparedMarkupSession
+
+MENU_BUTTONS = [(button.text, button.callback_data) for row in MAIN_MENU.inline_keyboard for button in row]
+PICKER_BUTTONS = tuple((f"Category {index}", f"{index:032x}") for index in range(12))
+
+
+def builder_markup():
+    builder = InlineKeyboardBuilder()
+    for text, callback_data in MENU_BUTTONS:
+        builder.button(text=text, callback_data=callback_data)
+    builder.adjust(2)
+    return builder.as_markup()
+
+
+def measure(name: str, rounds: int, session: AiohttpSession, bot: Bot, markup_factory) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        session.build_form_data(bot, SendMessage(chat_id=1, text="Choose an action:", reply_markup=markup_factory()))
+    elapsed = time.perf_counter() - started
+    print(f"{name:<10} {elapsed / rounds * 1_000_000:8.1f} us/message")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20000)
+    args = parser.parse_args()
+
+    bot = Bot(token="123456:fake-token")
+    registry = KeyboardRegistry()
+
+    builder = measure("builder", args.rounds, AiohttpSession(), bot, builder_markup)
+    prepared = measure("prepared", args.rounds, PreparedMarkupSession(), bot, lambda: MAIN_MENU)
+    measure(
+        "dynamic",
+        args.rounds,
+        PreparedMarkupSession(),
+        bot,
+        lambda: registry.dynamic("categories", PICKER_BUTTONS, lambda: PICKER_BUTTONS),
+    )
+    print(f"speedup    {builder / prepared:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Throughput of chat-sharded worker processes.
+
+Every synthetic update is handled by a handler doing a bit of CPU work
+(parsing, rendering) and a short awaited pause (database round trip), so
+the numbers show how throughput scales with the number of processes.
+
+Usage:
+    python -m benchmarks.sharding_throughput --workers 1 2 4 --updates 4000
+"""
+import argparse
+import asyncio
+import hashlib
+import time
+
+from aiogram import Bot, Dispatcher, Router, types
+
+from benchmarks.fake_telegram import make_message_update
+from src.services.sharding import ShardSupervisor
+
+CPU_ROUNDS = 2000
+IO_DELAY = 0.002
+
+
+def create_bench_dispatcher() -> Dispatcher:
+    """Dispatcher with a synthetic CPU and IO bound handler."""
+    router = Router()
+
+    @router.message()
+    async def handle(message: types.Message):
+        digest = message.text.encode()
+        for _ in range(CPU_ROUNDS):
+            digest = hashlib.sha256(digest).digest()
+        await asyncio.sleep(IO_DELAY)
+
+    dispatcher = Dispatcher()
+    dispatcher.include_router(router)
+    return dispatcher
+
+
+def create_bench_bot(processes: int = 1) -> Bot:
+    return Bot(token="123456:fake-token")
+
+
+async def measure(workers: int, updates: int, chats: int) -> float:
+    supervisor = ShardSupervisor(
+        workers,
+        dispatcher_factory="benchmarks.sharding_throughput:create_bench_dispatcher",
+        bot_factory="benchmarks.sharding_throughput:create_bench_bot",
+        queue_size=updates,
+    )
+    supervisor.start()
+
+    started = time.perf_counter()
+    for update_id in range(1, updates + 1):
+        await supervisor.dispatch(make_message_update(update_id, 1000 + update_id % chats, "hello"))
+    await asyncio.get_running_loop().run_in_executor(None, supervisor.stop)
+    return updates / (time.perf_counter() - started)
+
+
+async def main(args: argparse.Namespace) -> None:
+    baseline = None
+    for workers in args.workers:
+        rate = await measure(workers, args.updates, args.chats)
+        baseline = baseline or rate
+        print(f"workers={workers:<3} updates/s={rate:>9.1f} speedup={rate / baseline:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--updates", type=int, default=4000)
+    parser.add_argument("--chats", type=int, default=1000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,69 @@
+"""
+Insert throughput and primary key index size of random (v4) and
+time-ordered (v7) UUID keys.
+
+Rows shaped like feedback (uuid key, user id, text, timestamps) are
+inserted in batches into a fresh table per scheme. Random keys land on
+random leaf pages, which are split half full; time-ordered keys fill the
+rightmost page. Everything runs in a transaction which is rolled back.
+
+Usage:
+    python -m benchmarks.uuid_keys --rows 1000000 --batch 1000
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+from src.config.database_config import async_engine
+from src.utils.helpers import uuid7
+
+SCHEMES = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+
+
+async def run(connection, scheme: str, rows: int, batch: int) -> None:
+    table = f"bench_keys_{scheme}"
+    await connection.execute(text(
+        f"CREATE TABLE {table} (id uuid PRIMARY KEY, user_id uuid NOT NULL, text text NOT NULL, "
+        f"created_at timestamptz NOT NULL, updated_at timestamptz NOT NULL)"
+    ))
+    raw_connection = (await connection.get_raw_connection()).driver_connection
+    statement = f"INSERT INTO {table} VALUES ($1, $2, $3, $4, $4)"
+    make_id = SCHEMES[scheme]
+    user_id = uuid.uuid4()
+
+    started = time.perf_counter()
+    for offset in range(0, rows, batch):
+        now = datetime.now(timezone.utc)
+        await raw_connection.executemany(
+            statement, [(make_id(), user_id, "Great bot", now) for _ in range(min(batch, rows - offset))]
+        )
+    elapsed = time.perf_counter() - started
+
+    index_size, table_size = (await connection.execute(text(
+        f"SELECT pg_relation_size('{table}_pkey'), pg_relation_size('{table}')"
+    ))).one()
+    print(
+        f"{scheme}  {rows / elapsed:10,.0f} rows/s  {elapsed:7.2f} s  "
+        f"pkey {index_size / 2 ** 20:7.1f} MiB ({index_size / rows:5.1f} B/row)  table {table_size / 2 ** 20:7.1f} MiB"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    async with async_engine.connect() as connection:
+        transaction = await connection.begin()
+        for scheme in SCHEMES:
+            await run(connection, scheme, args.rows, args.batch)
+        await transaction.rollback()
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,38 @@
+"""
+Bulk import of users, categories, events and teams from CSV or NDJSON files.
+
+Files are imported in the given order in one transaction, so referenced
+rows (users, categories) should come first.
+
+Usage:
+    python import_data.py users players.csv categories categories.csv events events.ndjson
+"""
+import argparse
+import asyncio
+import logging
+
+from src.config.database_config import async_engine
+from src.services.bulk_import import IMPORT_SPECS, import_file
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="+", metavar="KIND PATH", help=f"pairs of kind ({', '.join(IMPORT_SPECS)}) and path")
+    args = parser.parse_args()
+    if len(args.files) % 2 or any(kind not in IMPORT_SPECS for kind in args.files[::2]):
+        parser.error(f"expected pairs of KIND PATH, kind is one of: {', '.join(IMPORT_SPECS)}")
+    return args
+
+
+async def main():
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+    pairs = list(zip(args.files[::2], args.files[1::2]))
+
+    async with async_engine.begin() as connection:
+        for kind, path in pairs:
+            print(await import_file(connection, kind, path))
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,31 +1,116 @@
 import logging
 import asyncio
+from uuid import UUID
 
 from aiogram import Bot, Dispatcher
+from sqlalchemy import select
 
 from src.config.app_config import settings
+from src.config.database_config import async_engine, replica_engine, warm_up_pool
+from src.functionality.admin.handlers import admin_router
 from src.functionality.user.handlers import user_router
 from src.functionality.base.handlers import menu_router
 from src.functionality.event.handlers import event_router
 from src.functionality.team.handlers import team_router
 from src.functionality.feedback.handlers import feedback_router
+from src.functionality.leaderboard.handlers import leaderboard_router
+from src.functionality.rsvp.handlers import rsvp_router
 from src.functionality.settings.handlers import settings_router
+from src.middlewares.database import DbSessionMiddleware
+from src.middlewares.fsm import setup_fsm_batch
+from src.middlewares.latency import ApiTimingMiddleware, LatencyMiddleware
+from src.middlewares.send_rate_limit import SendRateLimitMiddleware
+from src.models.database_models import FSMState, User
+from src.services.category_catalog import category_catalog
+from src.services.fsm_storage import CoalescingStorage, create_storage
+from src.services.leaderboard import leaderboard
+from src.services.replica import replica_router
+from src.services.metrics import latency_recorder, track_db_time
+from src.services.send_scheduler import SendScheduler
+from src.services.webhook import run_webhook
+from src.services.write_behind import write_buffer
+from src.utils.keyboards import PreparedMarkupSession
 
-async def main():
-    """The main entry point for launching a Telegram bot."""
-    logging.basicConfig(level=logging.INFO)
 
-    bot = Bot(token=settings.API_KEY)
-    dp = Dispatcher()
+# Read statements run by most updates, prepared on every pooled connection at startup
+HOT_QUERIES = (
+    lambda session: session.get(User, UUID(int=0)),
+    lambda session: session.execute(select(FSMState.state, FSMState.data).where(FSMState.key == "")),
+)
+
+
+async def warm_up_database() -> None:
+    """Prepares the hot queries on pooled connections of the primary and the replica, failures are only logged."""
+    for engine in filter(None, (async_engine, replica_engine)):
+        try:
+            await warm_up_pool(engine, HOT_QUERIES)
+        except Exception as e:
+            logging.warning("Database pool warm-up failed: %s", e)
+
+
+def create_bot(processes: int = 1) -> Bot:
+    """
+    Creates the bot instance with outbound rate limiting. The global rate is
+    shared by the `processes` sending messages (shard workers), a chat is
+    served by one worker so its own rate is not divided.
+    """
+    bot = Bot(token=settings.API_KEY, session=PreparedMarkupSession())
+    if settings.METRICS_ENABLED:
+        bot.session.middleware(ApiTimingMiddleware())
+    scheduler = SendScheduler(settings.SEND_GLOBAL_RATE / processes, settings.SEND_CHAT_RATE, settings.SEND_CHAT_BURST)
+    bot.session.middleware(SendRateLimitMiddleware(scheduler, settings.SEND_MAX_RETRIES))
+    return bot
+
+
+def create_dispatcher() -> Dispatcher:
+    """Creates the dispatcher with all bot routers."""
+    storage = create_storage()
+    dp = Dispatcher(storage=storage)
+    if isinstance(storage, CoalescingStorage):
+        setup_fsm_batch(dp, storage)
+
+    if settings.METRICS_ENABLED:
+        for engine in filter(None, (async_engine, replica_engine)):
+            track_db_time(engine)
+        dp.message.middleware(LatencyMiddleware(latency_recorder))
+        dp.callback_query.middleware(LatencyMiddleware(latency_recorder))
 
+    dp.message.middleware(DbSessionMiddleware())
+    dp.callback_query.middleware(DbSessionMiddleware())
+
+    dp.startup.register(warm_up_database)
+    dp.startup.register(category_catalog.start)
+    dp.startup.register(replica_router.start)
+    dp.startup.register(leaderboard.start)
+    dp.shutdown.register(category_catalog.stop)
+    dp.shutdown.register(replica_router.stop)
+    dp.shutdown.register(leaderboard.stop)
+    dp.shutdown.register(write_buffer.close)
+
+    dp.include_router(admin_router)
     dp.include_router(menu_router)
     dp.include_router(user_router)
+    dp.include_router(rsvp_router)
     dp.include_router(event_router)
     dp.include_router(team_router)
     dp.include_router(feedback_router)
+    dp.include_router(leaderboard_router)
     dp.include_router(settings_router)
 
-    await dp.start_polling(bot)
+    return dp
+
+
+async def main():
+    """The main entry point for launching a Telegram bot."""
+    logging.basicConfig(level=logging.INFO)
+
+    bot = create_bot()
+    dp = create_dispatcher()
+
+    if settings.BOT_MODE == "webhook":
+        await run_webhook(dp, bot)
+    else:
+        await dp.start_polling(bot)
 
 if __name__ == "__main__":
     asyncio.run(main())
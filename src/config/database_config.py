@@ -1,24 +1,100 @@
+import asyncio
+import time
 from contextlib import asynccontextmanager
 
 from sqlalchemy.engine import URL
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from typing import AsyncGenerator
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, Sequence
 from src.config.app_config import settings
 from src.services.logger import LoggerProvider
+from src.services.metrics import Histogram
 
 log = LoggerProvider().get_logger(__name__)
 
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool recording checkout wait time and timeouts."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.wait = Histogram()
+        self.timeouts = 0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            # Includes connecting when the pool has to open a new connection
+            self.wait.record((time.perf_counter() - started) * 1_000_000)
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.wait, pool.timeouts = self.wait, self.timeouts
+        return pool
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "timeouts": self.timeouts,
+            "wait": self.wait.summary(),
+        }
+
+
+def create_engine(url: URL) -> AsyncEngine:
+    """Creates the engine with the pool configured by `DB_*` settings."""
+    return create_async_engine(
+        url,
+        # echo=True,
+        poolclass=InstrumentedQueuePool,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        connect_args={"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+    )
+
+
 database_url = URL.create(**settings.get_db_creds)
-async_engine = create_async_engine(
-    database_url,
-    # echo=True,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=60.0,
-)
+async_engine = create_engine(database_url)
 async_session = async_sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
 
+replica_engine = create_engine(URL.create(**settings.get_replica_db_creds)) if settings.DB_REPLICA_HOST else None
+replica_session = (
+    async_sessionmaker(replica_engine, expire_on_commit=False, class_=AsyncSession) if replica_engine else None
+)
+
+HotQuery = Callable[[AsyncSession], Awaitable[Any]]
+
+
+async def warm_up_pool(engine: AsyncEngine, queries: Sequence[HotQuery] = ()) -> int:
+    """
+    Opens `pool_size` connections at once and runs `queries` on each of them,
+    so the first updates neither connect nor prepare the hot statements.
+    Queries must be read-only, they are rolled back.
+    :return: number of warmed up connections
+    """
+    connections = [engine.connect() for _ in range(engine.pool.size())]
+    try:
+        await asyncio.gather(*(connection.start() for connection in connections))
+        for connection in connections:
+            async with AsyncSession(bind=connection) as session:
+                for query in queries:
+                    await query(session)
+    finally:
+        await asyncio.gather(*(connection.close() for connection in connections), return_exceptions=True)
+    log.info("Database pool warmed up: %s connections, %s statements", len(connections), len(queries))
+    return len(connections)
+
 
 @asynccontextmanager
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
@@ -23,8 +23,85 @@ class Settings(BaseModel):
     DB_USERNAME: str
     DB_PASSWORD: str
 
+    # Database connection pool, without pre-ping dead connections are dropped by recycling and on disconnect errors
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 5.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    # Prepared statements kept per connection by the asyncpg dialect, 0 disables the cache
+    DB_STATEMENT_CACHE_SIZE: int = 500
+
+    # Optional read replica (same credentials as the primary) for handlers flagged read_only.
+    # Reads fall back to the primary when the replica lags more than REPLICA_MAX_LAG seconds
+    # and for REPLICA_STICKY_SECONDS after the user wrote something
+    DB_REPLICA_HOST: Optional[str] = None
+    DB_REPLICA_PORT: Optional[str] = None
+    REPLICA_MAX_LAG: float = 5.0
+    REPLICA_STICKY_SECONDS: float = 10.0
+    REPLICA_LAG_CHECK_INTERVAL: float = 2.0
+
     LOG_FILE_PATH: str
 
+    # Update ingestion settings ("polling" or "webhook")
+    BOT_MODE: str = "polling"
+    WEBHOOK_URL: Optional[str] = None
+    WEBHOOK_PATH: str = "/webhook"
+    WEBHOOK_SECRET: Optional[str] = None
+    WEBAPP_HOST: str = "0.0.0.0"
+    WEBAPP_PORT: int = 8080
+    WEBHOOK_WORKERS: int = 8
+    WEBHOOK_QUEUE_SIZE: int = 1000
+    WEBHOOK_ENQUEUE_TIMEOUT: float = 1.0
+
+    # FSM storage settings ("memory", "postgres" or "file")
+    FSM_STORAGE: str = "memory"
+    FSM_FILE_PATH: str = "./fsm_storage.json"
+
+    # Multi-process sharding settings
+    SHARD_WORKERS: int = 2
+    SHARD_QUEUE_SIZE: int = 1000
+    SHARD_CONCURRENCY: int = 8
+
+    # Outbound message rate limits (Telegram allows ~30 msg/s and ~1 msg/s per chat),
+    # the global rate is split between shard workers
+    SEND_GLOBAL_RATE: float = 30
+    SEND_CHAT_RATE: float = 1
+    SEND_CHAT_BURST: int = 3
+    SEND_MAX_RETRIES: int = 3
+
+    # Handler latency metrics, ADMIN_IDS is a comma separated list of Telegram ids
+    METRICS_ENABLED: bool = False
+    METRICS_DUMP_PATH: str = "./logs/latency.json"
+    ADMIN_IDS: str = ""
+
+    # Default number of SQL statements a handler may run per update, strict mode raises instead of logging
+    QUERY_BUDGET: int = 10
+    QUERY_BUDGET_STRICT: bool = False
+
+    # In-process user profile cache, the TTL bounds how long other processes see a changed profile
+    PROFILE_CACHE_SIZE: int = 10000
+    PROFILE_CACHE_TTL: float = 300
+
+    # Seconds between category catalog change checks
+    CATEGORY_REFRESH_INTERVAL: float = 60
+
+    # Nearby events search radius and the grid cache of hot regions
+    NEAR_EVENTS_RADIUS_KM: float = 10
+    NEAR_EVENTS_CACHE_SIZE: int = 1024
+    NEAR_EVENTS_CACHE_TTL: float = 60
+
+    # Time zone of event dates entered in and shown by the bot
+    TIMEZONE: str = "UTC"
+
+    # Users kept per in-memory leaderboard (overall and per category) and seconds between reloads
+    LEADERBOARD_SIZE: int = 100
+    LEADERBOARD_REFRESH_INTERVAL: float = 60
+
+    # Write-behind buffer of append-only rows, flushed every N rows or M milliseconds
+    WRITE_BEHIND_MAX_ROWS: int = 100
+    WRITE_BEHIND_MAX_DELAY_MS: int = 50
+
     @property
     def get_db_creds(self):
         return {
@@ -36,6 +113,18 @@ class Settings(BaseModel):
             "password": self.DB_PASSWORD,
         }
 
+    @property
+    def get_replica_db_creds(self):
+        return {
+            **self.get_db_creds,
+            "host": self.DB_REPLICA_HOST,
+            "port": self.DB_REPLICA_PORT or self.DB_PORT,
+        }
+
+    @property
+    def get_admin_ids(self):
+        return [int(admin_id) for admin_id in self.ADMIN_IDS.split(",") if admin_id.strip()]
+
 
 class SettingsProvider:
     __settings: Optional[Settings] = None
@@ -0,0 +1,66 @@
+from aiogram import Router, types, F
+from aiogram.filters import Command
+
+from src.config.app_config import settings
+from src.config.database_config import async_engine
+from src.middlewares.database import checkouts_per_update
+from src.services.metrics import latency_recorder
+from src.services.geo_cache import near_events_cache
+from src.services.profile_cache import profile_cache
+
+admin_router = Router(name="admin")
+admin_router.message.filter(F.from_user.id.in_(settings.get_admin_ids))
+
+
+def format_route(row: dict) -> str:
+    wall, db, api = row["wall"], row["db"], row["api"]
+    return (
+        f"{row['router']}.{row['handler']} [{row['state']}] n={wall['count']}\n"
+        f"  wall p50/p95/p99: {wall['p50_ms']}/{wall['p95_ms']}/{wall['p99_ms']} ms\n"
+        f"  db p95: {db['p95_ms']} ms, api p95: {api['p95_ms']} ms"
+    )
+
+
+@admin_router.message(Command("latency"))
+async def show_latency(message: types.Message):
+    """Show the slowest handlers by p95 latency."""
+    rows = latency_recorder.snapshot()[:10]
+    if not rows:
+        await message.answer("No latency data yet. Is METRICS_ENABLED set?")
+        return
+
+    checkouts = ", ".join(f"{count}: {updates}" for count, updates in sorted(checkouts_per_update.items()))
+    text = "\n\n".join(format_route(row) for row in rows)
+    await message.answer(f"{text}\n\nPool checkouts per update: {checkouts or 'N/A'}")
+
+
+@admin_router.message(Command("latency_dump"))
+async def dump_latency(message: types.Message):
+    """Dump latency histograms to the file."""
+    latency_recorder.dump(settings.METRICS_DUMP_PATH)
+    await message.answer(f"Latency metrics saved to {settings.METRICS_DUMP_PATH}")
+
+
+@admin_router.message(Command("cache_stats"))
+async def show_cache_stats(message: types.Message):
+    """Show hit/miss counters of in-process caches."""
+    lines = []
+    for name, cache in (("Profile cache", profile_cache), ("Nearby events cache", near_events_cache)):
+        stats = cache.stats()
+        lines.append(
+            f"{name}: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_ratio']:.1%}), {stats['size']} entries"
+        )
+    await message.answer("\n".join(lines))
+
+
+@admin_router.message(Command("pool_stats"))
+async def show_pool_stats(message: types.Message):
+    """Show database connection pool usage."""
+    stats = async_engine.pool.stats()
+    wait = stats["wait"]
+    await message.answer(
+        f"Pool: {stats['checked_out']} checked out, {stats['idle']} idle of {stats['size']}, "
+        f"{stats['overflow']} overflow, {stats['timeouts']} timeouts\n"
+        f"Checkout wait p50/p95/p99: {wait['p50_ms']}/{wait['p95_ms']}/{wait['p99_ms']} ms (n={wait['count']})"
+    )
@@ -1,25 +1,43 @@
-from datetime import datetime
+from typing import List
 from uuid import UUID
 
 from aiogram import Router, types, F
-from aiogram.filters import Command, StateFilter
+from aiogram.filters import Command, CommandObject, StateFilter
+from aiogram.filters.callback_data import CallbackData
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.fsm.context import FSMContext
-from aiogram.utils.keyboard import InlineKeyboardBuilder
 
-from src.config.database_config import get_async_session
-from src.models.database_models import Event, User, Category, RSVP
+from src.functionality.rsvp.handlers import notify_promoted
+from src.models.database_models import Event, User, RSVP
+from src.models.managers.event import SEARCH_MAX_CANDIDATES, EventManager
+from src.models.managers.rsvp import RSVPManager
+from src.services.category_catalog import category_catalog
+from src.services.geo_cache import near_events_cache
 from src.services.logger import LoggerProvider
+from src.utils.dates import format_local, parse_local, weekend
+from src.utils.geohash import encode
 from src.utils.helpers import convert_telegram_id_to_uuid
+from src.utils.keyboards import build_markup
+from src.utils.pagination import PAGE_SIZE, PageCallback, fetch_page, page_markup
 
 from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
-event_router = Router()
+event_router = Router(name="event")
 log = LoggerProvider().get_logger(__name__)
 
 
+class SearchCallback(CallbackData, prefix="search"):
+    """Page of the last /search_events results, the query is kept in the FSM data."""
+    number: int
+
+
+class NearStates(StatesGroup):
+    LOCATION = State()
+
+
 class EventStates(StatesGroup):
     TITLE = State()
     EDIT_TITLE = State()
@@ -54,25 +72,21 @@ async def event_title(message: types.Message, state: FSMContext):
     """Store the event title and ask for the location."""
     title = message.text
     await state.update_data(title=title)
-    await message.answer("Enter the event location:")
+    await message.answer("Enter the event location or share it with 📎 → Location:")
     await state.set_state(EventStates.LOCATION)
 
 @event_router.message(EventStates.LOCATION)
 async def event_location(message: types.Message, state: FSMContext):
-    """Store the event location and ask for the category."""
+    """Store the event location (and coordinates if shared) and ask for the category."""
+    latitude = longitude = None
     location = message.text
-    await state.update_data(location=location)
-    async with get_async_session() as session:
-        categories = await session.execute(select(Category))
-        categories = categories.scalars().all()
-
-        builder = InlineKeyboardBuilder()
+    if message.location:
+        latitude, longitude = message.location.latitude, message.location.longitude
+        location = message.venue.title if message.venue else f"{latitude:.5f}, {longitude:.5f}"
+    await state.update_data(location=location, latitude=latitude, longitude=longitude)
+    markup = await category_catalog.markup()
 
-        for category in categories:
-            builder.button(text=f"{category.name}", callback_data=f"{category.id}")
-        builder.adjust(2)
-
-    await message.answer("Choose the category:", reply_markup=builder.as_markup())
+    await message.answer("Choose the category:", reply_markup=markup)
     await state.set_state(EventStates.CATEGORY)
 
 @event_router.callback_query(EventStates.CATEGORY)
@@ -88,8 +102,7 @@ async def event_category(callback: types.CallbackQuery, state: FSMContext):
 async def event_date_time(message: types.Message, state: FSMContext):
     """Store the event date and time and ask for the description."""
     try:
-        date_time_str = message.text
-        date_time = datetime.strptime(date_time_str, "%d.%m.%Y %H:%M")
+        date_time = parse_local(message.text)
         await state.update_data(date_time=date_time)
         await message.answer("Enter a brief description of the event:")
         await state.set_state(EventStates.DESCRIPTION)
@@ -116,7 +129,7 @@ async def event_people_amount(message: types.Message, state: FSMContext):
         await message.answer("Invalid number of people attending or experience. Please enter a valid number.")
 
 @event_router.message(EventStates.EXPERIENCE)
-async def event_experience(message: types.Message, state: FSMContext):
+async def event_experience(message: types.Message, state: FSMContext, session: AsyncSession):
     try:
         experience = int(message.text)
         data = await state.get_data()
@@ -128,71 +141,80 @@ async def event_experience(message: types.Message, state: FSMContext):
         date_time = data["date_time"]
         description = data["description"]
         people_amount = data["people_amount"]
+        latitude, longitude = data.get("latitude"), data.get("longitude")
+        geohash = encode(latitude, longitude) if latitude is not None else None
         user_id = convert_telegram_id_to_uuid(message.from_user.id)
 
-        async with get_async_session() as session:
-            if change_event:
-                event_id = data["event_id"]
-                event = await session.get(Event, event_id)
-
-                if not event:
-                    await message.answer("Event not found. Please try again.")
-                    return
-
-                event.title = title
-                event.location = location
-                event.category_id = category_id
-                event.date_time = date_time
-                event.description = description
-                event.people_amount = people_amount
-                event.experience = experience
-
-                await session.commit()
-                await session.refresh(event)
-                log.info(f"Event {event.id} updated by user {user_id}")
-                await message.answer(f"Event {event.title} updated successfully!")
-            else:
-                event = Event(
-                    title=title,
-                    location=location,
-                    category_id=category_id,
-                    date_time=date_time,
-                    description=description,
-                    people_amount=people_amount,
-                    experience=experience,
-                    organizer_id=user_id
-                )
-                session.add(event)
-                await session.commit()
-                await session.refresh(event)
-                log.info(f"Event {event.id} created by user {user_id}")
-                await message.answer("Event created successfully!")
-
-            await state.clear()
+        if change_event:
+            event_id = data["event_id"]
+            event = await session.get(Event, event_id)
+
+            if not event:
+                await message.answer("Event not found. Please try again.")
+                return
+
+            if event.geohash:
+                near_events_cache.invalidate(event.geohash)
+            event.title = title
+            event.location = location
+            event.latitude, event.longitude, event.geohash = latitude, longitude, geohash
+            event.category_id = category_id
+            event.date_time = date_time
+            event.description = description
+            event.people_amount = people_amount
+            event.experience = experience
+
+            await session.flush()
+            # A raised capacity gives seats to the waitlist
+            promoted = await RSVPManager.promote_waitlist(session, event.id)
+            await session.commit()
+            log.info(f"Event {event.id} updated by user {user_id}")
+            await message.answer(f"Event {event.title} updated successfully!")
+            await notify_promoted(message.bot, session, event.id, promoted)
+        else:
+            event = Event(
+                title=title,
+                location=location,
+                category_id=category_id,
+                date_time=date_time,
+                description=description,
+                people_amount=people_amount,
+                experience=experience,
+                organizer_id=user_id,
+                latitude=latitude,
+                longitude=longitude,
+                geohash=geohash,
+            )
+            session.add(event)
+            await session.commit()
+            log.info(f"Event {event.id} created by user {user_id}")
+            await message.answer("Event created successfully!")
+
+        if geohash:
+            near_events_cache.invalidate(geohash)
+
+        await state.clear()
 
     except ValueError:
         await message.answer("Invalid experience. Please enter a valid number.")
 
-@event_router.callback_query(F.data == "edit_event")
-async def edit_my_event(callback: types.CallbackQuery, state: FSMContext):
+@event_router.callback_query(F.data == "edit_event", flags={"query_budget": 2})
+async def edit_my_event(callback: types.CallbackQuery, state: FSMContext, session: AsyncSession):
     """Starts editing an existing event"""
     
-    async with get_async_session() as session:
-        user_id = convert_telegram_id_to_uuid(callback.message.chat.id)
-        result = await session.execute(select(Event).where(Event.organizer_id == user_id))
-        events = result.scalars().all()
-
-        if not events:
-            await callback.message.answer("You don't have any events to edit.")
-            await callback.answer()
+    user_id = convert_telegram_id_to_uuid(callback.message.chat.id)
+    result = await session.execute(select(Event.id, Event.title).where(Event.organizer_id == user_id))
+    events = result.all()
+    await session.commit()
 
-        builder = InlineKeyboardBuilder()
+    if not events:
+        await callback.message.answer("You don't have any events to edit.")
+        await callback.answer()
 
-        for event in events:
-            builder.button(text=event.title, callback_data=f"{event.id}")
-        builder.adjust(2)
-        await callback.message.edit_text("Choose an event to edit:", reply_markup=builder.as_markup())
-        await state.set_state(EventStates.EDIT_TITLE)
+    buttons = tuple((event.title, f"{event.id}") for event in events)
+    markup = build_markup(buttons)
+    await callback.message.edit_text("Choose an event to edit:", reply_markup=markup)
+    await state.set_state(EventStates.EDIT_TITLE)
 
 @event_router.callback_query(EventStates.EDIT_TITLE)
 async def edit_event_title(callback: types.CallbackQuery, state: FSMContext):
@@ -204,58 +226,174 @@ async def edit_event_title(callback: types.CallbackQuery, state: FSMContext):
     await state.update_data(event_id=callback.data)
     await state.set_state(EventStates.TITLE)
 
-@event_router.callback_query(F.data == "delete_event")
-async def delete_my_event(callback: types.CallbackQuery, state: FSMContext):
+@event_router.callback_query(F.data == "delete_event", flags={"query_budget": 2})
+async def delete_my_event(callback: types.CallbackQuery, state: FSMContext, session: AsyncSession):
     """Starts delete an existing event"""
-    async with get_async_session() as session:
-        user_id = convert_telegram_id_to_uuid(callback.message.chat.id)
-        result = await session.execute(select(Event).where(Event.organizer_id == user_id))
-        events = result.scalars().all()
-
-        if not events:
-            await callback.message.answer("You don't have any events to edit.")
-            await callback.answer()
+    user_id = convert_telegram_id_to_uuid(callback.message.chat.id)
+    result = await session.execute(select(Event.id, Event.title).where(Event.organizer_id == user_id))
+    events = result.all()
+    await session.commit()
 
-        builder = InlineKeyboardBuilder()
+    if not events:
+        await callback.message.answer("You don't have any events to edit.")
+        await callback.answer()
 
-        for event in events:
-            builder.button(text=event.title, callback_data=f"{event.id}")
-        builder.adjust(2)
-        await callback.message.edit_text("Choose an event to delete:", reply_markup=builder.as_markup())
-        await state.set_state(EventStates.DELETE_EVENT)
+    buttons = tuple((event.title, f"{event.id}") for event in events)
+    markup = build_markup(buttons)
+    await callback.message.edit_text("Choose an event to delete:", reply_markup=markup)
+    await state.set_state(EventStates.DELETE_EVENT)
 
 @event_router.callback_query(EventStates.DELETE_EVENT)
-async def delete_event(callback: types.CallbackQuery, state: FSMContext):
+async def delete_event(callback: types.CallbackQuery, state: FSMContext, session: AsyncSession):
     """Confirm the deletion of the event."""
     await callback.answer()
     event_id = callback.data
 
-    async with get_async_session() as session:
-        event = await session.get(Event, event_id)
-        if event:
-            await session.delete(event)
-            await session.commit()
-            log.info(f"Event {event_id} deleted by user {convert_telegram_id_to_uuid(callback.message.chat.id)}")
-            await callback.message.edit_text("Event deleted successfully!")
-            await state.clear()
-        else:
-            await callback.message.edit_text("Event not found. Please try again.")
+    event = await session.get(Event, event_id)
+    if event:
+        await session.delete(event)
+        await session.commit()
+        if event.geohash:
+            near_events_cache.invalidate(event.geohash)
+        log.info(f"Event {event_id} deleted by user {convert_telegram_id_to_uuid(callback.message.chat.id)}")
+        await callback.message.edit_text("Event deleted successfully!")
+        await state.clear()
+    else:
+        await callback.message.edit_text("Event not found. Please try again.")
 
 
-@event_router.callback_query(F.data == "view_events")
-async def view_events(callback: types.CallbackQuery, state: FSMContext):
+@event_router.callback_query(F.data == "view_events", flags={"query_budget": 2, "read_only": True})
+async def view_events(callback: types.CallbackQuery, state: FSMContext, session: AsyncSession):
     """Starts viewing all events."""
     await callback.answer()
     await callback.message.edit_text("Viewing all events:")
-    async with get_async_session() as session:
-        events = await session.execute(select(Event))
-        events = events.scalars().all()
-        message_text = ""
-        if not events:
-            await callback.message.answer("No events found.")
-        builder = InlineKeyboardBuilder()
+    message_text, markup = await render_events_page(session)
+    await callback.message.answer(message_text, reply_markup=markup)
+    await state.clear()
 
-        for index, event in enumerate(events, start=1):
-            message_text += f"{index}. {event.title}\n{event.description}\n{event.experience}\n\n"
-        await callback.message.answer(message_text)
-        await state.clear()
+
+@event_router.callback_query(PageCallback.filter(F.view == "events"), flags={"query_budget": 1, "read_only": True})
+async def view_events_page(callback: types.CallbackQuery, callback_data: PageCallback, session: AsyncSession):
+    """Shows the next or previous page of events."""
+    await callback.answer()
+    message_text, markup = await render_events_page(session, callback_data)
+    await callback.message.edit_text(message_text, reply_markup=markup)
+
+
+async def render_events_page(session: AsyncSession, callback_data: PageCallback = None):
+    """Text and Prev/Next buttons of one page of events."""
+    page = await fetch_page(
+        session,
+        select(Event.id, Event.created_at, Event.title, Event.description, Event.experience),
+        (Event.created_at, Event.id),
+        callback_data,
+    )
+    await session.commit()
+    if not page.rows:
+        return "No events found.", None
+
+    message_text = ""
+    for index, event in enumerate(page.rows, start=page.offset + 1):
+        message_text += f"{index}. {event.title}\n{event.description}\n{event.experience}\n\n"
+    return message_text, page_markup("events", page)
+
+
+@event_router.message(Command("search_events"), flags={"query_budget": 2, "read_only": True})
+async def search_events(message: types.Message, command: CommandObject, state: FSMContext, session: AsyncSession):
+    """Full-text search of events."""
+    query = (command.args or "").strip()
+    if not query:
+        await message.answer("Usage: /search_events <words>, e.g. /search_events football Minsk")
+        return
+    # Ranked once, Prev/Next page through the same ids
+    event_ids = await EventManager.search_event_ids(session, query)
+    await state.update_data(search_query=query, search_ids=[str(event_id) for event_id in event_ids])
+    message_text, markup = await render_search_page(session, query, event_ids, 0)
+    await message.answer(message_text, reply_markup=markup)
+
+
+@event_router.callback_query(SearchCallback.filter(), flags={"query_budget": 1, "read_only": True})
+async def search_events_page(
+    callback: types.CallbackQuery, callback_data: SearchCallback, state: FSMContext, session: AsyncSession
+):
+    """Shows another page of the search results."""
+    await callback.answer()
+    data = await state.get_data()
+    if "search_ids" not in data:
+        await callback.message.edit_text("The search has expired, please run /search_events again.")
+        return
+    event_ids = [UUID(event_id) for event_id in data["search_ids"]]
+    message_text, markup = await render_search_page(session, data["search_query"], event_ids, callback_data.number)
+    await callback.message.edit_text(message_text, reply_markup=markup)
+
+
+async def render_search_page(session: AsyncSession, query: str, event_ids: List[UUID], number: int):
+    """Text and Prev/Next buttons of one page of the ranked search results."""
+    events = await EventManager.get_events_by_ids(session, event_ids[number * PAGE_SIZE:(number + 1) * PAGE_SIZE])
+    await session.commit()
+    if not events:
+        return f"No events found for \"{query}\".", None
+
+    message_text = ""
+    for index, event in enumerate(events, start=number * PAGE_SIZE + 1):
+        message_text += f"{index}. {event.title}\n{event.description}\n{event.location}, {format_local(event.date_time)}\n\n"
+    if len(event_ids) >= SEARCH_MAX_CANDIDATES:
+        message_text += f"Only the first {SEARCH_MAX_CANDIDATES} matching events are ranked, add words to narrow it down."
+    buttons = []
+    if number > 0:
+        buttons.append(("⬅️ Prev", SearchCallback(number=number - 1).pack()))
+    if len(event_ids) > (number + 1) * PAGE_SIZE:
+        buttons.append(("Next ➡️", SearchCallback(number=number + 1).pack()))
+    return message_text, build_markup(buttons) if buttons else None
+
+
+@event_router.message(Command("upcoming"), flags={"query_budget": 1, "read_only": True})
+async def upcoming_events(message: types.Message, session: AsyncSession):
+    """Show the next events."""
+    events = await EventManager.get_upcoming_events(session, limit=PAGE_SIZE)
+    await session.commit()
+    await message.answer(render_event_dates(events) or "No upcoming events.")
+
+
+@event_router.message(Command("weekend"), flags={"query_budget": 1, "read_only": True})
+async def weekend_events(message: types.Message, session: AsyncSession):
+    """Show the events of this (or the next) weekend."""
+    start, end = weekend()
+    events = await EventManager.get_events_between(session, start, end, limit=PAGE_SIZE)
+    await session.commit()
+    await message.answer(render_event_dates(events) or "No events this weekend.")
+
+
+def render_event_dates(events) -> str:
+    """List of events with their place and start."""
+    message_text = ""
+    for index, event in enumerate(events, start=1):
+        message_text += f"{index}. {event.title}\n{event.location}, {format_local(event.date_time)}\n\n"
+    return message_text
+
+
+@event_router.message(Command("events_near"))
+async def events_near_command(message: types.Message, state: FSMContext):
+    """Ask for the location to search events around."""
+    markup = types.ReplyKeyboardMarkup(
+        keyboard=[[types.KeyboardButton(text="📍 Share location", request_location=True)]],
+        resize_keyboard=True,
+        one_time_keyboard=True,
+    )
+    await message.answer("Share your location to find events nearby:", reply_markup=markup)
+    await state.set_state(NearStates.LOCATION)
+
+
+@event_router.message(NearStates.LOCATION, F.location, flags={"query_budget": 1, "read_only": True})
+async def events_near(message: types.Message, state: FSMContext, session: AsyncSession):
+    """Show the nearest events with coordinates."""
+    events = await near_events_cache.get(session, message.location.latitude, message.location.longitude)
+    await session.commit()
+    await state.clear()
+    if not events:
+        message_text = f"No events found within {near_events_cache.radius_km:g} km."
+    else:
+        message_text = ""
+        for index, (event, distance) in enumerate(events, start=1):
+            message_text += f"{index}. {event.title} ({distance:.1f} km)\n{event.location}, {format_local(event.date_time)}\n\n"
+    await message.answer(message_text, reply_markup=types.ReplyKeyboardRemove())
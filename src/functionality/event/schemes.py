@@ -1,27 +1,42 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from uuid import UUID
-from datetime import date
+from datetime import datetime
+
+from src.utils.dates import as_local
 
 
 class EventBaseSchema(BaseModel):
+    title: str
     category_id: UUID
     location: str
     people_amount: int
     experience: int
-    date_time: date
+    date_time: datetime
     organizer_id: UUID
     description: str
 
+    @field_validator("date_time")
+    @classmethod
+    def localize_date_time(cls, value: datetime) -> datetime:
+        """Dates without an offset are in the bot time zone."""
+        return as_local(value)
+
 
 class EventCreateSchema(EventBaseSchema):
     pass
 
 
 class EventUpdateSchema(BaseModel):
+    title: str | None = None
     category_id: UUID | None = None
     location: str | None = None
     people_amount: int | None = None
     experience: int | None = None
-    date_time: date | None = None
+    date_time: datetime | None = None
     organizer_id: UUID | None = None
     description: str | None = None
+
+    @field_validator("date_time")
+    @classmethod
+    def localize_date_time(cls, value: datetime | None) -> datetime | None:
+        return value if value is None else as_local(value)
@@ -2,20 +2,25 @@ from aiogram import Router, types, F
 from aiogram.filters import Command, StateFilter
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.fsm.context import FSMContext
-from aiogram.utils.keyboard import InlineKeyboardBuilder
 
 from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.config.database_config import get_async_session
 from src.models.database_models import Feedback, User
 from src.services.logger import LoggerProvider
-from src.utils.helpers import convert_telegram_id_to_uuid
+from src.services.replica import replica_router
+from src.services.write_behind import write_buffer
+from src.utils.helpers import convert_telegram_id_to_uuid, shorten
+from src.utils.pagination import PageCallback, fetch_page, page_markup
 
 
-feedback_router = Router()
+feedback_router = Router(name="feedback")
 log = LoggerProvider().get_logger(__name__)
 
+# Feedback text is unbounded, long ones are cut to keep a page under Telegram's limit
+MAX_FEEDBACK_LENGTH = 500
+
 
 class FeedbackStates(StatesGroup):
     TEXT = State()
@@ -39,46 +44,56 @@ async def create_feedback(callback: types.CallbackQuery, state: FSMContext):
 
 @feedback_router.message(FeedbackStates.TEXT)
 async def save_feedback(message: types.Message, state: FSMContext):
-    """Save feedback to the database."""
+    """Save feedback through the write-behind buffer, the user is thanked once it is written."""
     feedback_text = message.text
     user_id = convert_telegram_id_to_uuid(message.from_user.id)
 
-    async with get_async_session() as session:
-        try:
-            feedback = Feedback(user_id=user_id, text=feedback_text)
-            session.add(feedback)
-            await session.commit()
-            await session.refresh(feedback)
+    try:
+        feedback = await write_buffer.add(Feedback, {"user_id": user_id, "text": feedback_text})
+        # Written outside of the session middleware, the user's next reads must see it
+        replica_router.mark_write(message.from_user.id)
 
-            log.info(f"Feedback {feedback.id} created by user {user_id}")
-            await message.answer("Thank you for your feedback!")
-        except SQLAlchemyError as e:
-            log.error(f"Failed to create feedback: {str(e)}")
-            await message.answer("An error occurred while saving your feedback. Please try again later.")
-        finally:
-            await state.clear()
+        log.info(f"Feedback {feedback['id']} created by user {user_id}")
+        await message.answer("Thank you for your feedback!")
+    except SQLAlchemyError as e:
+        log.error(f"Failed to create feedback: {str(e)}")
+        await message.answer("An error occurred while saving your feedback. Please try again later.")
+    finally:
+        await state.clear()
 
 
-@feedback_router.callback_query(F.data == "view_feedback")
-async def view_feedback(callback: types.CallbackQuery, state: FSMContext):
+@feedback_router.callback_query(F.data == "view_feedback", flags={"query_budget": 2, "read_only": True})
+async def view_feedback(callback: types.CallbackQuery, state: FSMContext, session: AsyncSession):
     """Displays all feedback."""
     await callback.answer()
     await callback.message.edit_text("Viewing all feedback:")
+    message_text, markup = await render_feedback_page(session)
+    await callback.message.answer(message_text, reply_markup=markup)
+    await state.clear()
 
-    async with get_async_session() as session:
-        feedbacks = await session.execute(select(Feedback))
-        feedbacks = feedbacks.scalars().all()
-
-        if not feedbacks:
-            await callback.message.answer("No feedback found.")
-            return
-
-        message_text = ""
-        for index, feedback in enumerate(feedbacks, start=1):
-            user = await session.get(User, feedback.user_id)
-            username = user.username if user else "Unknown User"
-            message_text += f"{index}. {username}:\n{feedback.text}\n\n"
-
-        await callback.message.answer(message_text)
 
-    await state.clear()
+@feedback_router.callback_query(PageCallback.filter(F.view == "feedback"), flags={"query_budget": 1, "read_only": True})
+async def view_feedback_page(callback: types.CallbackQuery, callback_data: PageCallback, session: AsyncSession):
+    """Shows the next or previous page of feedback."""
+    await callback.answer()
+    message_text, markup = await render_feedback_page(session, callback_data)
+    await callback.message.edit_text(message_text, reply_markup=markup)
+
+
+async def render_feedback_page(session: AsyncSession, callback_data: PageCallback = None):
+    """Text and Prev/Next buttons of one page of feedback."""
+    page = await fetch_page(
+        session,
+        select(Feedback.id, Feedback.created_at, Feedback.text, User.username).outerjoin(Feedback.user),
+        (Feedback.created_at, Feedback.id),
+        callback_data,
+    )
+    await session.commit()
+    if not page.rows:
+        return "No feedback found.", None
+
+    message_text = ""
+    for index, feedback in enumerate(page.rows, start=page.offset + 1):
+        username = feedback.username or "Unknown User"
+        message_text += f"{index}. {username}:\n{shorten(feedback.text, MAX_FEEDBACK_LENGTH)}\n\n"
+    return message_text, page_markup("feedback", page)
@@ -0,0 +1,69 @@
+from typing import List, Tuple
+from uuid import UUID
+
+from aiogram import Router, types
+from aiogram.filters import Command, CommandObject
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.database_models import User
+from src.services.category_catalog import category_catalog
+from src.services.leaderboard import leaderboard
+from src.utils.helpers import convert_telegram_id_to_uuid
+
+leaderboard_router = Router(name="leaderboard")
+
+LEADERBOARD_LENGTH = 10
+
+
+def display_name(user) -> str:
+    full_name = " ".join(name for name in (user.first_name, user.last_name) if name)
+    return full_name or user.username or "Anonymous"
+
+
+def positions(top: List[Tuple[UUID, int]]) -> List[int]:
+    """Positions of the sorted scores by the rank rule: 1 + the number of higher scores, ties share one."""
+    result = []
+    for index, (_, score) in enumerate(top):
+        result.append(result[-1] if index and score == top[index - 1][1] else index + 1)
+    return result
+
+
+@leaderboard_router.message(Command("leaderboard"), flags={"query_budget": 2, "read_only": True})
+async def show_leaderboard(message: types.Message, command: CommandObject, session: AsyncSession):
+    """Show the best players, overall or in the category, and the rank of the user."""
+    category = None
+    if command.args:
+        if category_catalog.version is None:
+            await category_catalog.load()
+        name = command.args.strip().lower()
+        category = next((item for item in category_catalog.categories if item.name.lower() == name), None)
+        if category is None:
+            names = ", ".join(item.name for item in category_catalog.categories)
+            await message.answer(f"Unknown category. Usage: /leaderboard [category], categories: {names}")
+            return
+    category_id = category.id if category else None
+
+    top = leaderboard.top(LEADERBOARD_LENGTH, category_id)
+    users = {}
+    if top:
+        rows = await session.execute(
+            select(User.id, User.username, User.first_name, User.last_name)
+            .where(User.id.in_([user_id for user_id, _ in top]))
+        )
+        users = {row.id: row for row in rows}
+    rank = await leaderboard.rank(session, convert_telegram_id_to_uuid(message.from_user.id), category_id)
+    await session.commit()
+
+    title = f"🏆 {category.name} leaderboard" if category else "🏆 Leaderboard"
+    if not top:
+        await message.answer(f"{title}\n\nNo scores yet.")
+        return
+    lines = [title, ""]
+    for position, (user_id, score) in zip(positions(top), top):
+        user = users.get(user_id)
+        lines.append(f"{position}. {display_name(user) if user else 'Unknown'} - {score}")
+    lines.append("")
+    lines.append(f"Your rank: #{rank[0]} with {rank[1]} points" if rank else "You have no scores yet.")
+    await message.answer("\n".join(lines))
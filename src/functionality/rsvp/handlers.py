@@ -0,0 +1,156 @@
+from typing import List, Optional
+from uuid import UUID
+
+from aiogram import Bot, Router, types, F
+from aiogram.exceptions import TelegramAPIError
+from aiogram.filters import Command
+from aiogram.filters.callback_data import CallbackData
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.functionality.rsvp.schemes import RSVPStatus
+from src.models.database_models import Event
+from src.models.managers.rsvp import WAITLISTED, RSVPManager
+from src.services.logger import LoggerProvider
+from src.utils.helpers import convert_telegram_id_to_uuid, convert_uuid_to_telegram_id
+from src.utils.keyboards import build_markup
+
+rsvp_router = Router(name="rsvp")
+log = LoggerProvider().get_logger(__name__)
+
+# Number of latest events offered in the RSVP picker
+RSVP_EVENTS_LIMIT = 20
+
+STATUS_TEXT = {
+    "accepted": "✅ Going",
+    "declined": "❌ Not going",
+    "pending": "🤔 Maybe",
+}
+# Statuses shown to users, the waitlist is not a choice
+STATUS_LABELS = {**STATUS_TEXT, WAITLISTED: "⏳ Waitlisted"}
+
+
+class RSVPCallback(CallbackData, prefix="rsvp"):
+    """Step of the RSVP flow: `pick` an event, `set` a status or `delete` the RSVP."""
+    action: str
+    event_id: UUID
+    # Validated on unpacking, a forged or missing status matches no handler
+    status: Optional[RSVPStatus] = None
+
+
+@rsvp_router.message(Command("create_rsvp"))
+async def choose_event_command(message: types.Message, session: AsyncSession):
+    """Ask which event to respond to."""
+    text, markup = await render_event_picker(session)
+    await message.answer(text, reply_markup=markup)
+
+
+@rsvp_router.callback_query(F.data.in_({"create_rsvp", "edit_rsvp"}), flags={"query_budget": 1})
+async def choose_event(callback: types.CallbackQuery, session: AsyncSession):
+    """Ask which event to respond to, answering again replaces the previous RSVP."""
+    await callback.answer()
+    text, markup = await render_event_picker(session)
+    await callback.message.edit_text(text, reply_markup=markup)
+
+
+async def render_event_picker(session: AsyncSession):
+    """Latest events as RSVP buttons."""
+    result = await session.execute(
+        select(Event.id, Event.title).order_by(Event.created_at.desc(), Event.id.desc()).limit(RSVP_EVENTS_LIMIT)
+    )
+    events = result.all()
+    await session.commit()
+    if not events:
+        return "No events found.", None
+    buttons = [(event.title, RSVPCallback(action="pick", event_id=event.id).pack()) for event in events]
+    return "Choose an event to respond to:", build_markup(buttons)
+
+
+@rsvp_router.callback_query(RSVPCallback.filter(F.action == "pick"))
+async def choose_status(callback: types.CallbackQuery, callback_data: RSVPCallback):
+    """Ask for the RSVP status."""
+    await callback.answer()
+    buttons = [
+        (text, RSVPCallback(action="set", event_id=callback_data.event_id, status=status).pack())
+        for status, text in STATUS_TEXT.items()
+    ]
+    await callback.message.edit_text("Will you attend?", reply_markup=build_markup(buttons, width=3))
+
+
+@rsvp_router.callback_query(RSVPCallback.filter((F.action == "set") & F.status), flags={"query_budget": 5})
+async def save_status(callback: types.CallbackQuery, callback_data: RSVPCallback, session: AsyncSession):
+    """Save the RSVP, accepting a full event puts the user on its waitlist."""
+    await callback.answer()
+    user_id = convert_telegram_id_to_uuid(callback.from_user.id)
+    try:
+        result = await RSVPManager.respond(session, user_id, callback_data.event_id, callback_data.status)
+    except RuntimeError as e:
+        log.error(f"Failed to save RSVP: {e}")
+        await callback.message.edit_text("Could not save your RSVP. Make sure you are registered with /start.")
+        return
+    rsvp = result.rsvp
+    log.info(f"RSVP {rsvp.id} set to {rsvp.status} by user {user_id}")
+    if rsvp.status == WAITLISTED:
+        await callback.message.edit_text("The event is full, you are on the waitlist. We will let you know when a seat frees up.")
+    else:
+        await callback.message.edit_text(f"Your RSVP is saved: {STATUS_TEXT[rsvp.status]}")
+    await notify_promoted(callback.bot, session, callback_data.event_id, result.promoted)
+
+
+async def notify_promoted(bot: Bot, session: AsyncSession, event_id: UUID, user_ids: List[UUID]) -> None:
+    """Tell users moved from the waitlist that they have a seat."""
+    if not user_ids:
+        return
+    title = await session.scalar(select(Event.title).where(Event.id == event_id))
+    await session.commit()
+    for user_id in user_ids:
+        log.info(f"User {user_id} promoted from the waitlist of event {event_id}")
+        try:
+            await bot.send_message(convert_uuid_to_telegram_id(user_id), f"A seat freed up, you are going to {title}! ✅")
+        except TelegramAPIError as e:
+            log.warning(f"Failed to notify user {user_id} about the seat: {e}")
+
+
+@rsvp_router.callback_query(F.data == "view_rsvp", flags={"query_budget": 1, "read_only": True})
+async def view_rsvps(callback: types.CallbackQuery, session: AsyncSession):
+    """Show RSVPs of the user."""
+    await callback.answer()
+    rsvps = await RSVPManager.get_user_rsvps(session, convert_telegram_id_to_uuid(callback.from_user.id))
+    await session.commit()
+    if not rsvps:
+        await callback.message.edit_text("You have no RSVPs yet.")
+        return
+
+    message_text = ""
+    for index, rsvp in enumerate(rsvps, start=1):
+        message_text += f"{index}. {rsvp.title}: {STATUS_LABELS[rsvp.status]}\n"
+    await callback.message.edit_text(message_text)
+
+
+@rsvp_router.callback_query(F.data == "delete_rsvp", flags={"query_budget": 1})
+async def choose_rsvp_to_delete(callback: types.CallbackQuery, session: AsyncSession):
+    """Ask which RSVP to delete."""
+    await callback.answer()
+    rsvps = await RSVPManager.get_user_rsvps(session, convert_telegram_id_to_uuid(callback.from_user.id))
+    await session.commit()
+    if not rsvps:
+        await callback.message.edit_text("You have no RSVPs to delete.")
+        return
+
+    buttons = [(rsvp.title, RSVPCallback(action="delete", event_id=rsvp.event_id).pack()) for rsvp in rsvps]
+    await callback.message.edit_text("Choose an RSVP to delete:", reply_markup=build_markup(buttons))
+
+
+@rsvp_router.callback_query(RSVPCallback.filter(F.action == "delete"), flags={"query_budget": 4})
+async def delete_rsvp(callback: types.CallbackQuery, callback_data: RSVPCallback, session: AsyncSession):
+    """Delete the RSVP, its seat goes to the waitlist."""
+    await callback.answer()
+    user_id = convert_telegram_id_to_uuid(callback.from_user.id)
+    promoted = await RSVPManager.delete_rsvp(session, user_id, callback_data.event_id)
+    if promoted is None:
+        await callback.message.edit_text("RSVP not found.")
+        return
+    log.info(f"RSVP for event {callback_data.event_id} deleted by user {user_id}")
+    await callback.message.edit_text("RSVP deleted successfully!")
+    await notify_promoted(callback.bot, session, callback_data.event_id, promoted)
@@ -0,0 +1,14 @@
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+RSVPStatus = Literal["accepted", "declined", "pending"]
+
+
+class RSVPChangeSchema(BaseModel):
+    user_id: UUID
+    event_id: UUID
+    status: RSVPStatus = Field(
+        description="New RSVP status of the user for the event"
+    )
@@ -2,7 +2,7 @@ from aiogram import Router, types, F
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 
-settings_router = Router()
+settings_router = Router(name="settings")
 
 
 @settings_router.message(Command("show_commands"))
@@ -22,10 +22,16 @@ async def show_commands_command(message: types.Message):
         "/view_events - View your created events\n"
         "/edit_event - Edit an existing event\n"
         "/delete_event - Delete an event\n"
+        "/search_events <words> - Search events by title, description and location\n"
+        "/events_near - Find events near your location\n"
+        "/upcoming - View the next events\n"
+        "/weekend - View events of this weekend\n"
         "/create_team - Create a new team\n"
         "/view_teams - View your teams\n"
         "/edit_team - Edit a team\n"
         "/delete_team - Delete a team\n"
+        "/create_rsvp - Respond to an event\n"
+        "/leaderboard [category] - View the best players and your rank\n"
     )
     await message.answer(commands_list)
 
@@ -67,10 +73,16 @@ async def show_commands_button(callback: types.CallbackQuery):
         "/view_events - View your created events\n"
         "/edit_event - Edit an existing event\n"
         "/delete_event - Delete an event\n"
+        "/search_events <words> - Search events by title, description and location\n"
+        "/events_near - Find events near your location\n"
+        "/upcoming - View the next events\n"
+        "/weekend - View events of this weekend\n"
         "/create_team - Create a new team\n"
         "/view_teams - View your teams\n"
         "/edit_team - Edit a team\n"
         "/delete_team - Delete a team\n"
+        "/create_rsvp - Respond to an event\n"
+        "/leaderboard [category] - View the best players and your rank\n"
     )
     await callback.answer()
     await callback.message.edit_text(commands_list)
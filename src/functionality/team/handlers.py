@@ -4,17 +4,18 @@ from aiogram import Router, types, F
 from aiogram.filters import Command, StateFilter
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.fsm.context import FSMContext
-from aiogram.utils.keyboard import InlineKeyboardBuilder
 
-from src.config.database_config import get_async_session
 from src.models.database_models import Team, User
 from src.services.logger import LoggerProvider
 from src.utils.helpers import convert_telegram_id_to_uuid
+from src.utils.keyboards import build_markup
+from src.utils.pagination import PageCallback, fetch_page, page_markup
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-team_router = Router()
+team_router = Router(name="team")
 log = LoggerProvider().get_logger(__name__)
 
 
@@ -64,7 +65,7 @@ async def team_description(message: types.Message, state: FSMContext):
 
 
 @team_router.message(TeamStates.LOGO_URL)
-async def team_logo_url(message: types.Message, state: FSMContext):
+async def team_logo_url(message: types.Message, state: FSMContext, session: AsyncSession):
     """Store the team's logo URL and finalize the creation or update."""
     logo_url = message.text
     await state.update_data(logo_url=logo_url)
@@ -77,63 +78,59 @@ async def team_logo_url(message: types.Message, state: FSMContext):
     user_id = convert_telegram_id_to_uuid(message.from_user.id)
 
     try:
-        async with get_async_session() as session:
-            if change_team:
-                team_id = data["team_id"]
-                team = await session.get(Team, team_id)
-
-                if not team:
-                    await message.answer("Team not found. Please try again.")
-                    return
-
-                team.name = name
-                team.description = description
-                team.logo_url = logo_url
-
-                await session.commit()
-                await session.refresh(team)
-                log.info(f"Team {team.id} updated by user {user_id}")
-                await message.answer(f"Team {team.name} updated successfully!")
-            else:
-                team = Team(
-                    name=name,
-                    description=description,
-                    logo_url=logo_url,
-                    creator_id=user_id
-                )
-                session.add(team)
-                await session.commit()
-                await session.refresh(team)
-                log.info(f"Team {team.id} created by user {user_id}")
-                await message.answer("Team created successfully!")
-
-            await state.clear()
+        if change_team:
+            team_id = data["team_id"]
+            team = (await session.scalars(
+                update(Team)
+                .where(Team.id == team_id)
+                .values(name=name, description=description, logo_url=logo_url)
+                .returning(Team)
+            )).one_or_none()
+
+            if not team:
+                await message.answer("Team not found. Please try again.")
+                return
+
+            await session.commit()
+            log.info(f"Team {team.id} updated by user {user_id}")
+            await message.answer(f"Team {team.name} updated successfully!")
+        else:
+            team = Team(
+                name=name,
+                description=description,
+                logo_url=logo_url,
+                creator_id=user_id
+            )
+            session.add(team)
+            await session.commit()
+            log.info(f"Team {team.id} created by user {user_id}")
+            await message.answer("Team created successfully!")
+
+        await state.clear()
 
     except SQLAlchemyError as e:
+        await session.rollback()
         log.error(f"Database error: {e}")
         await message.answer("An error occurred while saving the team. Please try again.")
 
 
-@team_router.callback_query(F.data == "edit_team")
-async def edit_my_team(callback: types.CallbackQuery, state: FSMContext):
+@team_router.callback_query(F.data == "edit_team", flags={"query_budget": 2})
+async def edit_my_team(callback: types.CallbackQuery, state: FSMContext, session: AsyncSession):
     """Starts editing an existing team."""
-    async with get_async_session() as session:
-        user_id = convert_telegram_id_to_uuid(callback.message.chat.id)
-        result = await session.execute(select(Team).where(Team.creator_id == user_id))
-        teams = result.scalars().all()
+    user_id = convert_telegram_id_to_uuid(callback.message.chat.id)
+    result = await session.execute(select(Team.id, Team.name).where(Team.creator_id == user_id))
+    teams = result.all()
+    await session.commit()
 
-        if not teams:
-            await callback.message.answer("You don't have any teams to edit.")
-            await callback.answer()
-            return
+    if not teams:
+        await callback.message.answer("You don't have any teams to edit.")
+        await callback.answer()
+        return
 
-        builder = InlineKeyboardBuilder()
-
-        for team in teams:
-            builder.button(text=team.name, callback_data=f"{team.id}")
-        builder.adjust(2)
-        await callback.message.edit_text("Choose a team to edit:", reply_markup=builder.as_markup())
-        await state.set_state(TeamStates.EDIT_NAME)
+    buttons = tuple((team.name, f"{team.id}") for team in teams)
+    markup = build_markup(buttons)
+    await callback.message.edit_text("Choose a team to edit:", reply_markup=markup)
+    await state.set_state(TeamStates.EDIT_NAME)
 
 
 @team_router.callback_query(TeamStates.EDIT_NAME)
@@ -146,59 +143,73 @@ async def edit_team_name(callback: types.CallbackQuery, state: FSMContext):
     await state.set_state(TeamStates.NAME)
 
 
-@team_router.callback_query(F.data == "delete_team")
-async def delete_my_team(callback: types.CallbackQuery, state: FSMContext):
+@team_router.callback_query(F.data == "delete_team", flags={"query_budget": 2})
+async def delete_my_team(callback: types.CallbackQuery, state: FSMContext, session: AsyncSession):
     """Starts deleting an existing team."""
-    async with get_async_session() as session:
-        user_id = convert_telegram_id_to_uuid(callback.message.chat.id)
-        result = await session.execute(select(Team).where(Team.creator_id == user_id))
-        teams = result.scalars().all()
-
-        if not teams:
-            await callback.message.answer("You don't have any teams to delete.")
-            await callback.answer()
-            return
+    user_id = convert_telegram_id_to_uuid(callback.message.chat.id)
+    result = await session.execute(select(Team.id, Team.name).where(Team.creator_id == user_id))
+    teams = result.all()
+    await session.commit()
 
-        builder = InlineKeyboardBuilder()
+    if not teams:
+        await callback.message.answer("You don't have any teams to delete.")
+        await callback.answer()
+        return
 
-        for team in teams:
-            builder.button(text=team.name, callback_data=f"{team.id}")
-        builder.adjust(2)
-        await callback.message.edit_text("Choose a team to delete:", reply_markup=builder.as_markup())
-        await state.set_state(TeamStates.DELETE_TEAM)
+    buttons = tuple((team.name, f"{team.id}") for team in teams)
+    markup = build_markup(buttons)
+    await callback.message.edit_text("Choose a team to delete:", reply_markup=markup)
+    await state.set_state(TeamStates.DELETE_TEAM)
 
 
 @team_router.callback_query(TeamStates.DELETE_TEAM)
-async def delete_team(callback: types.CallbackQuery, state: FSMContext):
+async def delete_team(callback: types.CallbackQuery, state: FSMContext, session: AsyncSession):
     """Confirm the deletion of the team."""
     await callback.answer()
     team_id = callback.data
 
-    async with get_async_session() as session:
-        team = await session.get(Team, team_id)
-        if team:
-            await session.delete(team)
-            await session.commit()
-            log.info(f"Team {team_id} deleted by user {convert_telegram_id_to_uuid(callback.message.chat.id)}")
-            await callback.message.edit_text("Team deleted successfully!")
-            await state.clear()
-        else:
-            await callback.message.edit_text("Team not found. Please try again.")
+    team = await session.get(Team, team_id)
+    if team:
+        await session.delete(team)
+        await session.commit()
+        log.info(f"Team {team_id} deleted by user {convert_telegram_id_to_uuid(callback.message.chat.id)}")
+        await callback.message.edit_text("Team deleted successfully!")
+        await state.clear()
+    else:
+        await callback.message.edit_text("Team not found. Please try again.")
 
 
-@team_router.callback_query(F.data == "view_teams")
-async def view_teams(callback: types.CallbackQuery, state: FSMContext):
+@team_router.callback_query(F.data == "view_teams", flags={"query_budget": 2, "read_only": True})
+async def view_teams(callback: types.CallbackQuery, state: FSMContext, session: AsyncSession):
     """Starts viewing all teams."""
     await callback.answer()
     await callback.message.edit_text("Viewing all teams:")
-    async with get_async_session() as session:
-        teams = await session.execute(select(Team))
-        teams = teams.scalars().all()
-        message_text = ""
-        if not teams:
-            await callback.message.answer("No teams found.")
-        else:
-            for index, team in enumerate(teams, start=1):
-                message_text += f"{index}. {team.name}\n{team.description}\n\n"
-            await callback.message.answer(message_text)
-        await state.clear()
+    message_text, markup = await render_teams_page(session)
+    await callback.message.answer(message_text, reply_markup=markup)
+    await state.clear()
+
+
+@team_router.callback_query(PageCallback.filter(F.view == "teams"), flags={"query_budget": 1, "read_only": True})
+async def view_teams_page(callback: types.CallbackQuery, callback_data: PageCallback, session: AsyncSession):
+    """Shows the next or previous page of teams."""
+    await callback.answer()
+    message_text, markup = await render_teams_page(session, callback_data)
+    await callback.message.edit_text(message_text, reply_markup=markup)
+
+
+async def render_teams_page(session: AsyncSession, callback_data: PageCallback = None):
+    """Text and Prev/Next buttons of one page of teams."""
+    page = await fetch_page(
+        session,
+        select(Team.id, Team.created_at, Team.name, Team.description),
+        (Team.created_at, Team.id),
+        callback_data,
+    )
+    await session.commit()
+    if not page.rows:
+        return "No teams found.", None
+
+    message_text = ""
+    for index, team in enumerate(page.rows, start=page.offset + 1):
+        message_text += f"{index}. {team.name}\n{team.description}\n\n"
+    return message_text, page_markup("teams", page)
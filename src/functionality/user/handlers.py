@@ -2,17 +2,19 @@ from aiogram import Router, types, F
 from aiogram.filters import Command, StateFilter
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.fsm.context import FSMContext
-from aiogram.utils.keyboard import InlineKeyboardBuilder
 
-from src.config.database_config import get_async_session
-from src.models.database_models import User
+from src.functionality.user.schemes import UserSchema
+from src.models.managers.user import UserManager
 from src.services.logger import LoggerProvider
+from src.services.profile_cache import profile_cache
 from src.utils.helpers import convert_telegram_id_to_uuid
 from src.utils.constants import WELCOME_TEXT, REGISTRATION_TEXT
+from src.utils.keyboards import START_MENU
 
-from sqlalchemy.exc import SQLAlchemyError
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-user_router = Router()
+user_router = Router(name="user")
 logger = LoggerProvider().get_logger(__name__)
 
 
@@ -24,45 +26,22 @@ class UserStates(StatesGroup):
 
 
 @user_router.message(Command("start"))
-async def register_user(message: types.Message, state: FSMContext):
+async def register_user(message: types.Message, state: FSMContext, session: AsyncSession):
     """Start user registration."""
     print("Received /start command")
     logger.info("Processing /start command...")
     user_id = convert_telegram_id_to_uuid(message.from_user.id)
     print(f"User ID: {user_id}")
 
-    async with get_async_session() as session:
-        user = await session.get(User, user_id)
-        print(f"User retrieved: {user}")
-        if user and (user.first_name or user.last_name or user.age or user.experience):
-            builder = InlineKeyboardBuilder()
-            builder.button(text="View Profile", callback_data="view_profile")
-            builder.button(text="Edit Profile", callback_data="edit_profile")
-            builder.button(text="Create Event", callback_data="create_event")
-            builder.button(text="View Events", callback_data="view_events")
-            builder.button(text="Edit Event", callback_data="edit_event")
-            builder.button(text="Delete Event", callback_data="delete_event")
-            builder.button(text="Create RSVP", callback_data="create_rsvp")
-            builder.button(text="View RSVP", callback_data="view_rsvp")
-            builder.button(text="Edit RSVP", callback_data="edit_rsvp")
-            builder.button(text="Delete RSVP", callback_data="delete_rsvp")
-            builder.button(text="Create Team", callback_data="create_team")
-            builder.button(text="View Teams", callback_data="view_teams")
-            builder.button(text="Edit Team", callback_data="edit_team")
-            builder.button(text="Delete Team", callback_data="delete_team")
-            builder.button(text="Create Feedback", callback_data="create_feedback")
-            builder.button(text="View Feedback", callback_data="view_feedback")
-            builder.button(text="Show Commands", callback_data="show_commands")
-            builder.button(text="Clear State", callback_data="clear")
-            builder.button(text="Settings", callback_data="settings")
-
-            builder.adjust(2)
-
-            await message.answer("Choose an action:", reply_markup=builder.as_markup())
-            await state.clear()
-        else:
-            await message.answer("Welcome! Let's start your registration. Please enter your first name:")
-            await state.set_state(UserStates.FIRST_NAME)
+    user = await profile_cache.get(session, user_id)
+    await session.commit()
+    print(f"User retrieved: {user}")
+    if user and user.is_registered:
+        await message.answer("Choose an action:", reply_markup=START_MENU)
+        await state.clear()
+    else:
+        await message.answer("Welcome! Let's start your registration. Please enter your first name:")
+        await state.set_state(UserStates.FIRST_NAME)
 
 
 
@@ -96,8 +75,8 @@ async def user_age(message: types.Message, state: FSMContext):
         await message.answer("Age must be a number. Please enter a valid age.")
 
 
-@user_router.message(UserStates.EXPERIENCE)
-async def user_experience(message: types.Message, state: FSMContext):
+@user_router.message(UserStates.EXPERIENCE, flags={"query_budget": 1})
+async def user_experience(message: types.Message, state: FSMContext, session: AsyncSession):
     """Save user's experience and complete registration."""
     try:
         experience = int(message.text.strip())
@@ -106,34 +85,21 @@ async def user_experience(message: types.Message, state: FSMContext):
         last_name = data["last_name"]
         age = data["age"]
 
-        user_id = convert_telegram_id_to_uuid(message.from_user.id)
+        profile = UserSchema(first_name=first_name, last_name=last_name, age=age, experience=experience)
 
-        async with get_async_session() as session:
-            user = await session.get(User, user_id)
-            if not user:
-                user = User(
-                    id=user_id,
-                    username=message.from_user.username,
-                    first_name=first_name,
-                    last_name=last_name,
-                    age=age,
-                    experience=experience,
-                )
-                session.add(user)
-            else:
-                user.first_name = first_name
-                user.last_name = last_name
-                user.age = age
-                user.experience = experience
-
-            await session.commit()
-            logger.info(f"User {user_id} registered or updated.")
+        user_id = convert_telegram_id_to_uuid(message.from_user.id)
+        await UserManager.upsert_profile(session, user_id, profile, message.from_user.username)
+        logger.info(f"User {user_id} registered or updated.")
 
         await message.answer("Registration completed successfully! You can now use the bot's features.")
         await state.clear()
+    except ValidationError:
+        await message.answer("Age must be greater than 0 and experience can't be negative. "
+                             "Please start the registration again with /start.")
+        await state.clear()
     except ValueError:
         await message.answer("Experience must be a number. Please enter a valid value.")
-    except SQLAlchemyError as e:
+    except RuntimeError as e:
         logger.error(f"Database error during registration: {e}")
         await message.answer("An error occurred during registration. Please try again later.")
 
@@ -145,34 +111,34 @@ async def edit_user(callback: types.CallbackQuery, state: FSMContext):
     await state.set_state(UserStates.FIRST_NAME)
 
 
-@user_router.callback_query(F.data == "view_profile")
-async def view_profile(callback_query: types.CallbackQuery):
+@user_router.callback_query(F.data == "view_profile", flags={"read_only": True})
+async def view_profile(callback_query: types.CallbackQuery, session: AsyncSession):
     """View profile."""
     user_id = convert_telegram_id_to_uuid(callback_query.from_user.id)
 
     try:
-        async with get_async_session() as session:
-            user = await session.get(User, user_id)
-            if not user:
-                await callback_query.message.edit_text("Profile not found. Please complete the registration.")
-                return
-
-            user_data = {
-                "first_name": user.first_name,
-                "last_name": user.last_name,
-                "age": user.age,
-                "experience": user.experience,
-            }
-
-            profile = (
-                f"👤 Your Profile:\n"
-                f"First Name: {user.first_name or 'N/A'}\n"
-                f"Last Name: {user.last_name or 'N/A'}\n"
-                f"Age: {user.age or 'N/A'}\n"
-                f"Experience: {user.experience or 'N/A'}\n"
-            )
-
-            await callback_query.message.edit_text(profile)
+        user = await profile_cache.get(session, user_id)
+        await session.commit()
+        if not user:
+            await callback_query.message.edit_text("Profile not found. Please complete the registration.")
+            return
+
+        user_data = {
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "age": user.age,
+            "experience": user.experience,
+        }
+
+        profile = (
+            f"👤 Your Profile:\n"
+            f"First Name: {user.first_name or 'N/A'}\n"
+            f"Last Name: {user.last_name or 'N/A'}\n"
+            f"Age: {user.age or 'N/A'}\n"
+            f"Experience: {user.experience or 'N/A'}\n"
+        )
+
+        await callback_query.message.edit_text(profile)
 
     except Exception as e:
         await callback_query.message.edit_text("An error occurred while retrieving the profile.")
@@ -1,6 +1,6 @@
 from typing import Optional
 
-from pydantic import BaseModel, Field, PositiveInt
+from pydantic import BaseModel, Field, NonNegativeInt, PositiveInt
 
 
 class UserSchema(BaseModel):
@@ -18,7 +18,7 @@ class UserSchema(BaseModel):
         None,
         description="Age of user (should be grater than 0)"
     )
-    experience: Optional[PositiveInt] = Field(
+    experience: Optional[NonNegativeInt] = Field(
         None,
-        description="Experience of user (age)"
+        description="Experience of user in years (0 for beginners)"
     )
@@ -0,0 +1,151 @@
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.types import TelegramObject
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.config.app_config import settings
+from src.config.database_config import async_engine, async_session, replica_engine
+from src.services.replica import ReplicaRouter, replica_router
+from src.services.logger import LoggerProvider
+
+log = LoggerProvider().get_logger(__name__)
+
+
+@dataclass
+class UpdateDbStats:
+    """Database usage of the update being processed."""
+    checkouts: int = 0
+    statements: int = 0
+    writes: int = 0
+
+
+update_db_stats: ContextVar[Optional[UpdateDbStats]] = ContextVar("update_db_stats", default=None)
+
+# Number of updates by number of pool checkouts they made
+checkouts_per_update: Counter = Counter()
+
+
+# Nested transaction bookkeeping, not counted as queries
+SAVEPOINT_STATEMENTS = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Handler ran more SQL statements than its query budget allows."""
+
+
+def track_pool_checkouts(engine: AsyncEngine) -> None:
+    """Counts pool checkouts of the engine per update."""
+
+    @event.listens_for(engine.sync_engine.pool, "checkout")
+    def on_checkout(*args: Any) -> None:
+        stats = update_db_stats.get()
+        if stats is not None:
+            stats.checkouts += 1
+
+
+def track_statements(engine: AsyncEngine) -> None:
+    """Counts SQL statements executed by the engine per update."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def on_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        stats = update_db_stats.get()
+        if stats is not None and not statement.startswith(SAVEPOINT_STATEMENTS):
+            stats.statements += 1
+            if not statement.lstrip().upper().startswith("SELECT"):
+                stats.writes += 1
+
+
+for engine in filter(None, (async_engine, replica_engine)):
+    track_pool_checkouts(engine)
+    track_statements(engine)
+
+
+@contextmanager
+def count_statements() -> Iterator[UpdateDbStats]:
+    """Counts statements and checkouts of tracked engines inside the block (for tests and scripts)."""
+    stats = UpdateDbStats()
+    token = update_db_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        update_db_stats.reset(token)
+
+
+class DbSessionMiddleware(BaseMiddleware):
+    """
+    Inner middleware providing the `session` argument to handlers.
+    The session is created only for handlers declaring it, is shared by
+    the whole update and is committed (or rolled back) once at the end.
+    Handlers may commit earlier to release the connection before replying.
+
+    Statements are checked against the `query_budget` handler flag
+    (QUERY_BUDGET by default): over budget is logged, or raised when strict.
+
+    Handlers flagged `read_only` get a replica session when the replica
+    router allows it. Users whose update wrote anything are reported to
+    the router, so their next reads go to the primary.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = async_session,
+        default_budget: int = settings.QUERY_BUDGET,
+        strict: bool = settings.QUERY_BUDGET_STRICT,
+        replicas: ReplicaRouter = replica_router,
+    ):
+        self.session_factory = session_factory
+        self.default_budget = default_budget
+        self.strict = strict
+        self.replicas = replicas
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        handler_object = data.get("handler")
+        if "session" in data or (handler_object and "session" not in handler_object.params):
+            return await handler(event, data)
+
+        handler_name = handler_object.callback.__name__ if handler_object else "unknown handler"
+        budget = get_flag(data, "query_budget", default=self.default_budget)
+        user = data.get("event_from_user")
+        user_id = user.id if user else None
+        if self.replicas.use_replica(user_id, get_flag(data, "read_only", default=False)):
+            session_factory = self.replicas.replica
+        else:
+            session_factory = self.session_factory
+        with count_statements() as stats:
+            try:
+                async with session_factory() as session:
+                    data["session"] = session
+                    try:
+                        result = await handler(event, data)
+                        self.check_budget(handler_name, stats, budget)
+                        if session.in_transaction():
+                            await session.commit()
+                        return result
+                    except Exception:
+                        await session.rollback()
+                        raise
+            finally:
+                if stats.writes and user_id is not None:
+                    self.replicas.mark_write(user_id)
+                checkouts_per_update[stats.checkouts] += 1
+                if stats.checkouts > 1:
+                    log.warning("Update used %s pool checkouts in %s", stats.checkouts, handler_name)
+
+    def check_budget(self, handler_name: str, stats: UpdateDbStats, budget: int) -> None:
+        if stats.statements <= budget:
+            return
+        if self.strict:
+            raise QueryBudgetExceeded(f"{handler_name} ran {stats.statements} statements, budget is {budget}")
+        log.warning("%s ran %s statements, budget is %s", handler_name, stats.statements, budget)
@@ -0,0 +1,33 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware, Dispatcher
+from aiogram.types import TelegramObject
+
+from src.services.fsm_storage import CoalescingStorage
+
+
+class FSMBatchMiddleware(BaseMiddleware):
+    """Outer update middleware flushing FSM storage writes once per update."""
+
+    def __init__(self, storage: CoalescingStorage):
+        self.storage = storage
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        async with self.storage.batch():
+            return await handler(event, data)
+
+
+def setup_fsm_batch(dispatcher: Dispatcher, storage: CoalescingStorage) -> None:
+    """
+    Registers FSMBatchMiddleware in front of aiogram's FSM middleware, which
+    the dispatcher registers itself. Its read of the current state then
+    happens inside the batch, so an update costs one storage read.
+    """
+    dispatcher.update.outer_middleware.unregister(dispatcher.fsm)
+    dispatcher.update.outer_middleware(FSMBatchMiddleware(storage))
+    dispatcher.update.outer_middleware(dispatcher.fsm)
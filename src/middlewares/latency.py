@@ -0,0 +1,63 @@
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import TelegramObject
+
+from src.services.metrics import HandlerTiming, LatencyRecorder, handler_timing
+
+
+class LatencyMiddleware(BaseMiddleware):
+    """
+    Inner middleware recording handler wall, DB and Telegram API time,
+    keyed by router, handler name and FSM state.
+    """
+
+    def __init__(self, recorder: LatencyRecorder):
+        self.recorder = recorder
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        timing = HandlerTiming()
+        token = handler_timing.set(timing)
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            wall = time.perf_counter() - started
+            handler_timing.reset(token)
+            router = data.get("event_router")
+            handler_object = data.get("handler")
+            key = (
+                router.name if router else "unknown",
+                handler_object.callback.__name__ if handler_object else "unknown",
+                data.get("raw_state") or "-",
+            )
+            self.recorder.record(key, wall, timing)
+
+
+class ApiTimingMiddleware(BaseRequestMiddleware):
+    """Bot session middleware adding Telegram API time to the current handler timing."""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        timing = handler_timing.get()
+        if timing is None:
+            return await make_request(bot, method)
+
+        started = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        finally:
+            timing.api += time.perf_counter() - started
@@ -0,0 +1,90 @@
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import (
+    CopyMessage,
+    CopyMessages,
+    EditMessageCaption,
+    EditMessageLiveLocation,
+    EditMessageMedia,
+    EditMessageReplyMarkup,
+    EditMessageText,
+    ForwardMessage,
+    ForwardMessages,
+    Response,
+    SendAnimation,
+    SendAudio,
+    SendContact,
+    SendDice,
+    SendDocument,
+    SendGame,
+    SendInvoice,
+    SendLocation,
+    SendMediaGroup,
+    SendMessage,
+    SendPaidMedia,
+    SendPhoto,
+    SendPoll,
+    SendSticker,
+    SendVenue,
+    SendVideo,
+    SendVideoNote,
+    SendVoice,
+    StopMessageLiveLocation,
+    StopPoll,
+    TelegramMethod,
+)
+from aiogram.methods.base import TelegramType
+
+from src.services.logger import LoggerProvider
+from src.services.send_scheduler import SendScheduler, send_priority
+
+log = LoggerProvider().get_logger(__name__)
+
+# Methods posting or changing messages, chat actions and chat settings are not limited
+LIMITED_METHODS = (
+    SendMessage, SendPhoto, SendVideo, SendAnimation, SendAudio, SendDocument, SendVoice, SendVideoNote,
+    SendSticker, SendMediaGroup, SendPaidMedia, SendLocation, SendVenue, SendContact, SendPoll, SendDice,
+    SendGame, SendInvoice, ForwardMessage, ForwardMessages, CopyMessage, CopyMessages,
+    EditMessageText, EditMessageCaption, EditMessageMedia, EditMessageReplyMarkup, EditMessageLiveLocation,
+    StopMessageLiveLocation, StopPoll,
+)
+
+
+def is_rate_limited(method: TelegramMethod) -> bool:
+    """Only methods posting or changing messages count towards Telegram limits."""
+    return isinstance(method, LIMITED_METHODS)
+
+
+class SendRateLimitMiddleware(BaseRequestMiddleware):
+    """
+    Bot session middleware passing outgoing messages through the send scheduler.
+    Requests answered with flood wait are requeued after `retry_after`.
+    """
+
+    def __init__(self, scheduler: SendScheduler, max_retries: int = 3):
+        self.scheduler = scheduler
+        self.max_retries = max_retries
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        if not is_rate_limited(method):
+            return await make_request(bot, method)
+
+        chat_id = getattr(method, "chat_id", None)
+        priority = send_priority.get()
+        attempt = 0
+        while True:
+            await self.scheduler.acquire(chat_id, priority)
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                log.warning("Flood wait %s s for chat %s, requeueing", e.retry_after, chat_id)
+                self.scheduler.penalize(chat_id, e.retry_after)
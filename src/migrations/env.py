@@ -58,10 +58,6 @@ def do_run_migrations(connection):
     context.configure(connection=connection, target_metadata=target_metadata)
 
     with context.begin_transaction():
-        context.configure(
-            connection=connection,
-            target_metadata=target_metadata,
-        )
         context.run_migrations()
 
 
@@ -0,0 +1,34 @@
+"""add fsm state table
+
+Revision ID: 191ecf028c6e
+Revises: 9ccfa95fc6c7
+Create Date: 2026-10-18 09:12:41.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '191ecf028c6e'
+down_revision: Union[str, None] = '9ccfa95fc6c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('fsm_state',
+    sa.Column('key', sa.String(length=255), nullable=False, comment='FSM storage key (bot, chat, user and destiny)'),
+    sa.Column('state', sa.String(length=255), nullable=True, comment='Current FSM state'),
+    sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), server_default='{}', nullable=False, comment='FSM data of the conversation'),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('fsm_state')
@@ -0,0 +1,57 @@
+"""add foreign key indexes
+
+Revision ID: 4b8e2f1a6d3c
+Revises: 191ecf028c6e
+Create Date: 2026-10-18 11:02:37.540921
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b8e2f1a6d3c'
+down_revision: Union[str, None] = '191ecf028c6e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column) pairs of foreign keys used by lookups and cascading deletes
+FOREIGN_KEYS = [
+    ('team', 'creator_id'),
+    ('event', 'category_id'),
+    ('event', 'organizer_id'),
+    ('rsvp', 'user_id'),
+    ('rsvp', 'event_id'),
+    ('player', 'user_id'),
+    ('player', 'rsvp_id'),
+    ('player', 'team_id'),
+    ('statistic', 'user_id'),
+    ('statistic', 'event_id'),
+    ('feedback', 'user_id'),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY does not lock writes but can't run in a transaction
+    with op.get_context().autocommit_block():
+        for table, column in FOREIGN_KEYS:
+            op.create_index(
+                op.f(f'ix_{table}_{column}'),
+                table,
+                [column],
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, column in reversed(FOREIGN_KEYS):
+            op.drop_index(
+                op.f(f'ix_{table}_{column}'),
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,57 @@
+"""add event search vector
+
+Revision ID: 5e8b2d7c9a13
+Revises: a3f1c6d2b9e4
+Create Date: 2026-10-18 15:02:41.736204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8b2d7c9a13'
+down_revision: Union[str, None] = 'a3f1c6d2b9e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EVENT_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    # Rewrites the table once to compute the column for existing events
+    op.add_column('event', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(EVENT_SEARCH_VECTOR, persisted=True),
+        nullable=True,
+        comment='Full-text search document of title, description and location',
+    ))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_event_search_vector',
+            'event',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_event_search_vector',
+            table_name='event',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column('event', 'search_vector')
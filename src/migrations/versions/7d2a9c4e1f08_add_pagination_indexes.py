@@ -0,0 +1,44 @@
+"""add pagination indexes
+
+Revision ID: 7d2a9c4e1f08
+Revises: 4b8e2f1a6d3c
+Create Date: 2026-10-18 12:26:05.318477
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2a9c4e1f08'
+down_revision: Union[str, None] = '4b8e2f1a6d3c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables with keyset paginated list views ordered by (created_at, id)
+TABLES = ['event', 'team', 'feedback']
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(
+                op.f(f'ix_{table}_created_at_id'),
+                table,
+                ['created_at', 'id'],
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.drop_index(
+                op.f(f'ix_{table}_created_at_id'),
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,72 @@
+"""event date_time as timestamp with time zone
+
+Revision ID: 9b7e3f1a6c28
+Revises: c41d7e9b2f65
+Create Date: 2026-10-18 17:02:44.512907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.config.app_config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b7e3f1a6c28'
+down_revision: Union[str, None] = 'c41d7e9b2f65'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows updated per committed backfill batch
+BACKFILL_BATCH = 10000
+
+# Existing dates have no time, they become midnight in the bot time zone, the one they are shown in
+BACKFILL = "UPDATE event SET starts_at = date_time::timestamp AT TIME ZONE :timezone WHERE {rows}"
+
+
+def upgrade() -> None:
+    op.add_column('event', sa.Column('starts_at', sa.DateTime(timezone=True), nullable=True))
+    # Backfilled in short transactions instead of a table rewrite under an exclusive lock
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        batch = BACKFILL.format(rows="id IN (SELECT id FROM event WHERE starts_at IS NULL LIMIT :limit)")
+        while connection.execute(sa.text(batch), {"limit": BACKFILL_BATCH, "timezone": settings.TIMEZONE}).rowcount:
+            pass
+    # Rows inserted or updated meanwhile, writes wait for the lock until date_time is dropped
+    op.execute("LOCK TABLE event IN EXCLUSIVE MODE")
+    op.get_bind().execute(
+        sa.text(BACKFILL.format(rows="starts_at IS DISTINCT FROM date_time::timestamp AT TIME ZONE :timezone")),
+        {"timezone": settings.TIMEZONE},
+    )
+    op.alter_column('event', 'starts_at', nullable=False)
+    op.drop_column('event', 'date_time')
+    op.alter_column('event', 'starts_at', new_column_name='date_time', comment='Date and time of the event')
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_event_date_time_id',
+            'event',
+            ['date_time', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_event_date_time_id',
+            table_name='event',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.alter_column(
+        'event',
+        'date_time',
+        type_=sa.Date(),
+        postgresql_using=f"(date_time AT TIME ZONE '{settings.TIMEZONE}')::date",
+        existing_nullable=False,
+        existing_comment='Date and time of the event',
+    )
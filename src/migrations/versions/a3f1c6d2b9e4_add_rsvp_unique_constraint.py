@@ -0,0 +1,43 @@
+"""add rsvp unique constraint
+
+Revision ID: a3f1c6d2b9e4
+Revises: 7d2a9c4e1f08
+Create Date: 2026-10-18 13:48:52.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f1c6d2b9e4'
+down_revision: Union[str, None] = '7d2a9c4e1f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep only the latest RSVP of every (user, event) pair
+    op.execute("""
+        DELETE FROM rsvp
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY user_id, event_id ORDER BY updated_at DESC, id DESC
+                ) AS position
+                FROM rsvp
+            ) ranked
+            WHERE position > 1
+        )
+    """)
+    # Build the index without blocking writes, then turn it into the constraint
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_rsvp_user_event ON rsvp (user_id, event_id)"
+        )
+        op.execute("ALTER TABLE rsvp ADD CONSTRAINT uq_rsvp_user_event UNIQUE USING INDEX uq_rsvp_user_event")
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_rsvp_user_event', 'rsvp', type_='unique')
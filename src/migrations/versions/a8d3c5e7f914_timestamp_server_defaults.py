@@ -0,0 +1,36 @@
+"""set created_at and updated_at defaults in the database
+
+Revision ID: a8d3c5e7f914
+Revises: f2c7a9e4d816
+Create Date: 2026-10-18 20:12:41.517302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d3c5e7f914'
+down_revision: Union[str, None] = 'f2c7a9e4d816'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TIMESTAMP_TABLES = (
+    'category', 'fsm_state', 'user', 'category_user_score', 'event', 'feedback',
+    'team', 'user_score', 'rsvp', 'statistic', 'player',
+)
+
+
+def upgrade() -> None:
+    # A default is catalog only, existing rows are not rewritten
+    for table in TIMESTAMP_TABLES:
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(table, column, server_default=sa.text('now()'))
+
+
+def downgrade() -> None:
+    for table in TIMESTAMP_TABLES:
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(table, column, server_default=None)
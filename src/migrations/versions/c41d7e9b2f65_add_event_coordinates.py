@@ -0,0 +1,49 @@
+"""add event coordinates
+
+Revision ID: c41d7e9b2f65
+Revises: 5e8b2d7c9a13
+Create Date: 2026-10-18 16:21:09.418350
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7e9b2f65'
+down_revision: Union[str, None] = '5e8b2d7c9a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('event', sa.Column('latitude', sa.Float(), nullable=True,
+                                     comment='Latitude of the event place, if shared as a Telegram location'))
+    op.add_column('event', sa.Column('longitude', sa.Float(), nullable=True,
+                                     comment='Longitude of the event place, if shared as a Telegram location'))
+    op.add_column('event', sa.Column('geohash', sa.String(length=12, collation='C'), nullable=True,
+                                     comment='Geohash of the coordinates, used for nearby events search'))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_event_geohash',
+            'event',
+            ['geohash'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_event_geohash',
+            table_name='event',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column('event', 'geohash')
+    op.drop_column('event', 'longitude')
+    op.drop_column('event', 'latitude')
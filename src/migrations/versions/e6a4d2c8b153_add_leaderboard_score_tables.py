@@ -0,0 +1,69 @@
+"""add leaderboard score tables
+
+Revision ID: e6a4d2c8b153
+Revises: 9b7e3f1a6c28
+Create Date: 2026-10-18 17:48:06.270531
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a4d2c8b153'
+down_revision: Union[str, None] = '9b7e3f1a6c28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('user_score',
+    sa.Column('user_id', sa.UUID(), nullable=False, comment='ID of the user'),
+    sa.Column('total_score', sa.Integer(), nullable=False, comment='Sum of the scores of the user'),
+    sa.Column('events_count', sa.Integer(), nullable=False, comment='Number of statistics of the user'),
+    sa.Column('rating_sum', sa.Float(), nullable=False, comment='Sum of the ratings of the user, divided by events_count for the average'),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index('ix_user_score_total_score', 'user_score', ['total_score'], unique=False)
+    op.create_table('category_user_score',
+    sa.Column('category_id', sa.UUID(), nullable=False, comment='ID of the category of the events'),
+    sa.Column('user_id', sa.UUID(), nullable=False, comment='ID of the user'),
+    sa.Column('total_score', sa.Integer(), nullable=False, comment='Sum of the scores of the user in the category'),
+    sa.Column('events_count', sa.Integer(), nullable=False, comment='Number of statistics of the user in the category'),
+    sa.Column('rating_sum', sa.Float(), nullable=False, comment='Sum of the ratings of the user in the category'),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['category.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('category_id', 'user_id')
+    )
+    op.create_index('ix_category_user_score_total_score', 'category_user_score', ['category_id', 'total_score'], unique=False)
+    op.create_index(op.f('ix_category_user_score_user_id'), 'category_user_score', ['user_id'], unique=False)
+
+    # Totals of the statistics written so far
+    op.execute("""
+        INSERT INTO user_score (user_id, total_score, events_count, rating_sum, created_at, updated_at)
+        SELECT user_id, sum(score), count(*), sum(rating), now(), now()
+        FROM statistic
+        GROUP BY user_id
+    """)
+    op.execute("""
+        INSERT INTO category_user_score (category_id, user_id, total_score, events_count, rating_sum,
+                                         created_at, updated_at)
+        SELECT event.category_id, statistic.user_id, sum(score), count(*), sum(rating), now(), now()
+        FROM statistic JOIN event ON event.id = statistic.event_id
+        GROUP BY event.category_id, statistic.user_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_category_user_score_user_id'), table_name='category_user_score')
+    op.drop_index('ix_category_user_score_total_score', table_name='category_user_score')
+    op.drop_table('category_user_score')
+    op.drop_index('ix_user_score_total_score', table_name='user_score')
+    op.drop_table('user_score')
@@ -0,0 +1,57 @@
+"""add event capacity counter and rsvp waitlist
+
+Revision ID: f2c7a9e4d816
+Revises: e6a4d2c8b153
+Create Date: 2026-10-18 18:35:27.904116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c7a9e4d816'
+down_revision: Union[str, None] = 'e6a4d2c8b153'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('event', sa.Column('accepted_count', sa.Integer(), server_default='0', nullable=False,
+                                     comment='Number of accepted RSVPs, changed only by RSVPManager against people_amount'))
+    op.create_check_constraint('ck_event_accepted_count', 'event', 'accepted_count >= 0')
+    op.add_column('rsvp', sa.Column('waitlisted_at', sa.DateTime(timezone=True), nullable=True,
+                                    comment='When the user joined the waitlist of the full event'))
+    # Events overbooked before the counter existed keep their RSVPs, they only take no new ones
+    op.execute("""
+        UPDATE event SET accepted_count = accepted.count
+        FROM (SELECT event_id, count(*) AS count FROM rsvp WHERE status = 'accepted' GROUP BY event_id) AS accepted
+        WHERE event.id = accepted.event_id
+    """)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_rsvp_waitlist',
+            'rsvp',
+            ['event_id', 'waitlisted_at', 'id'],
+            unique=False,
+            postgresql_where=sa.text("status = 'waitlisted'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_rsvp_waitlist',
+            table_name='rsvp',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    # Waitlisted users had no seat, "pending" is the closest status before the waitlist
+    op.execute("UPDATE rsvp SET status = 'pending' WHERE status = 'waitlisted'")
+    op.drop_column('rsvp', 'waitlisted_at')
+    op.drop_constraint('ck_event_accepted_count', 'event', type_='check')
+    op.drop_column('event', 'accepted_count')
@@ -6,18 +6,37 @@ from sqlalchemy import (
     Text,
     Float,
     CheckConstraint,
+    Computed,
+    Index,
+    UniqueConstraint,
     DateTime,
+    event,
     func,
+    text,
 )
-from sqlalchemy.orm import relationship, mapped_column, Mapped
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import backref, relationship, mapped_column, Mapped
 from sqlalchemy.orm import declarative_base
 # from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
 
 from src.models.mixins import TimestampMixin, IDMixin
 
 Base = declarative_base()
 
+# Many-to-one relationships are lazy="raise": related rows must be loaded
+# explicitly (joinedload/selectinload or a join projection), never per row.
+# Collections of rows removed by ON DELETE CASCADE are passive_deletes, the
+# ORM leaves them to the database instead of loading and orphaning them.
+
+# Event search document, title matches rank above description and location ones
+SEARCH_CONFIG = 'english'
+EVENT_SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(location, '')), 'C')"
+)
+
 
 class Category(Base, TimestampMixin, IDMixin):
     __tablename__ = 'category'
@@ -73,6 +92,10 @@ class User(Base, TimestampMixin, IDMixin):
 
 class Team(Base, TimestampMixin, IDMixin):
     __tablename__ = 'team'
+    __table_args__ = (
+        # Keyset pagination of list views
+        Index('ix_team_created_at_id', 'created_at', 'id'),
+    )
 
     name: Mapped[str] = mapped_column(
         String(255),
@@ -89,15 +112,25 @@ class Team(Base, TimestampMixin, IDMixin):
     )
     creator_id: Mapped[UUID] = mapped_column(
         ForeignKey('user.id', ondelete="SET NULL"),
+        index=True,
         nullable=False,
        comment="ID of the team creator"
     )
 
-    creator: Mapped[User] = relationship("User", backref="creator_team")
+    creator: Mapped[User] = relationship("User", backref="creator_team", lazy="raise")
 
 
 class Event(Base, TimestampMixin, IDMixin):
     __tablename__ = 'event'
+    __table_args__ = (
+        # Keyset pagination of list views
+        Index('ix_event_created_at_id', 'created_at', 'id'),
+        Index('ix_event_search_vector', 'search_vector', postgresql_using='gin'),
+        # Range scans of nearby geohash cells (all geohashes starting with the cell)
+        Index('ix_event_geohash', 'geohash'),
+        # Upcoming and date range queries, keyset ordered by start
+        Index('ix_event_date_time_id', 'date_time', 'id'),
+    )
 
     title: Mapped[str] = mapped_column(
         String(255),
@@ -106,6 +139,7 @@ class Event(Base, TimestampMixin, IDMixin):
     )
     category_id: Mapped[UUID] = mapped_column(
         ForeignKey('category.id', ondelete="CASCADE"),
+        index=True,
         nullable=False,
         comment="ID of the associated category"
     )
@@ -113,6 +147,22 @@ class Event(Base, TimestampMixin, IDMixin):
         Text,
         comment="Event location"
     )
+    latitude: Mapped[float] = mapped_column(
+        Float,
+        nullable=True,
+        comment="Latitude of the event place, if shared as a Telegram location"
+    )
+    longitude: Mapped[float] = mapped_column(
+        Float,
+        nullable=True,
+        comment="Longitude of the event place, if shared as a Telegram location"
+    )
+    geohash: Mapped[str] = mapped_column(
+        # Byte order, so a cell is the range [cell, cell + '~')
+        String(12, collation='C'),
+        nullable=True,
+        comment="Geohash of the coordinates, used for nearby events search"
+    )
     people_amount: Mapped[int] = mapped_column(
         Integer,
         CheckConstraint('people_amount >= 0'),
@@ -123,13 +173,22 @@ class Event(Base, TimestampMixin, IDMixin):
         CheckConstraint('experience >= 0'),
         comment="Experience level required"
     )
-    date_time: Mapped[Date] = mapped_column(
-        Date,
+    accepted_count: Mapped[int] = mapped_column(
+        Integer,
+        CheckConstraint('accepted_count >= 0', name='ck_event_accepted_count'),
+        nullable=False,
+        default=0,
+        server_default='0',
+        comment="Number of accepted RSVPs, changed only by RSVPManager against people_amount"
+    )
+    date_time: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True),
         nullable=False,
         comment="Date and time of the event"
     )
     organizer_id: Mapped[UUID] = mapped_column(
         ForeignKey('user.id', ondelete="SET NULL"),
+        index=True,
         nullable=False,
         comment="ID of the event organizer"
     )
@@ -137,36 +196,58 @@ class Event(Base, TimestampMixin, IDMixin):
         String(255),
         comment="Event description"
     )
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        # Explicit config: generated columns need an immutable expression
+        Computed(EVENT_SEARCH_VECTOR, persisted=True),
+        deferred=True,
+        comment="Full-text search document of title, description and location"
+    )
 
-    category: Mapped[Category] = relationship("Category", backref="events")
-    organizer: Mapped[User] = relationship("User", backref="organized_events")
+    category: Mapped[Category] = relationship("Category", backref="events", lazy="raise")
+    organizer: Mapped[User] = relationship("User", backref="organized_events", lazy="raise")
 
 
 class RSVP(Base, TimestampMixin, IDMixin):
     __tablename__ = 'rsvp'
+    __table_args__ = (
+        UniqueConstraint('user_id', 'event_id', name='uq_rsvp_user_event'),
+        # Waitlist of an event in join order
+        Index(
+            'ix_rsvp_waitlist', 'event_id', 'waitlisted_at', 'id',
+            postgresql_where=text("status = 'waitlisted'"),
+        ),
+    )
 
     user_id: Mapped[UUID] = mapped_column(
         ForeignKey('user.id', ondelete="CASCADE"),
+        index=True,
         nullable=False,
         comment="ID of the user"
     )
     event_id: Mapped[UUID] = mapped_column(
         ForeignKey('event.id', ondelete="CASCADE"),
+        index=True,
         nullable=False,
         comment="ID of the event"
     )
     status: Mapped[str] = mapped_column(
         String(50),
-        CheckConstraint("status IN ('accepted', 'declined', 'pending')"),
+        CheckConstraint("status IN ('accepted', 'declined', 'pending', 'waitlisted')"),
         comment="RSVP status of the user"
     )
+    waitlisted_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="When the user joined the waitlist of the full event"
+    )
     responded_at: Mapped[Date] = mapped_column(
         Date,
         comment="Date when the user responded"
     )
 
-    user: Mapped[User] = relationship("User", backref="rsvps")
-    event: Mapped[Event] = relationship("Event", backref="rsvps")
+    user: Mapped[User] = relationship("User", backref="rsvps", lazy="raise")
+    event: Mapped[Event] = relationship("Event", backref=backref("rsvps", passive_deletes=True), lazy="raise")
 
 
 class Player(Base, TimestampMixin, IDMixin):
@@ -174,22 +255,25 @@ class Player(Base, TimestampMixin, IDMixin):
 
     user_id: Mapped[UUID] = mapped_column(
         ForeignKey('user.id', ondelete="CASCADE"),
+        index=True,
         nullable=False,
         comment="ID of the user (player)"
     )
     rsvp_id: Mapped[UUID] = mapped_column(
         ForeignKey('rsvp.id', ondelete="CASCADE"),
+        index=True,
         nullable=False,
         comment="RSVP ID for the player"
     )
     team_id: Mapped[UUID] = mapped_column(
         ForeignKey('team.id', ondelete="SET NULL"),
+        index=True,
         comment="Team ID that the player belongs to"
     )
 
-    user: Mapped[User] = relationship("User", backref="players")
-    rsvp: Mapped[RSVP] = relationship("RSVP", backref="players")
-    team: Mapped[Team] = relationship("Team", backref="players")
+    user: Mapped[User] = relationship("User", backref="players", lazy="raise")
+    rsvp: Mapped[RSVP] = relationship("RSVP", backref="players", lazy="raise")
+    team: Mapped[Team] = relationship("Team", backref="players", lazy="raise")
 
 
 class Statistic(Base, TimestampMixin, IDMixin):
@@ -197,11 +281,13 @@ class Statistic(Base, TimestampMixin, IDMixin):
 
     user_id: Mapped[UUID] = mapped_column(
         ForeignKey('user.id', ondelete="CASCADE"),
+        index=True,
         nullable=False,
         comment="ID of the user"
     )
     event_id: Mapped[UUID] = mapped_column(
         ForeignKey('event.id', ondelete="CASCADE"),
+        index=True,
         nullable=False,
         comment="ID of the event"
     )
@@ -216,15 +302,97 @@ class Statistic(Base, TimestampMixin, IDMixin):
         comment="Rating for the user (1 to 5)"
     )
 
-    user: Mapped[User] = relationship("User", backref="statistics")
-    event: Mapped[Event] = relationship("Event", backref="statistics")
+    user: Mapped[User] = relationship("User", backref="statistics", lazy="raise")
+    event: Mapped[Event] = relationship("Event", backref=backref("statistics", passive_deletes=True), lazy="raise")
+
+
+@event.listens_for(Statistic, "before_insert")
+def reject_statistic_flush(mapper, connection, target) -> None:
+    """
+    StatisticManager.record_statistic is the only writer of statistics: it
+    updates the leaderboard totals in the same statement, a flushed
+    Statistic would silently make them diverge.
+    """
+    raise InvalidRequestError("Statistics are recorded with StatisticManager.record_statistic")
+
+
+# Leaderboard totals, updated by StatisticManager.record_statistic in the statement
+# inserting the statistic. Points stay counted when the event is deleted.
+
+class UserScore(Base, TimestampMixin):
+    __tablename__ = 'user_score'
+    __table_args__ = (
+        # Leaderboard order and rank counts
+        Index('ix_user_score_total_score', 'total_score'),
+    )
+
+    user_id: Mapped[UUID] = mapped_column(
+        ForeignKey('user.id', ondelete="CASCADE"),
+        primary_key=True,
+        comment="ID of the user"
+    )
+    total_score: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="Sum of the scores of the user"
+    )
+    events_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="Number of statistics of the user"
+    )
+    rating_sum: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        comment="Sum of the ratings of the user, divided by events_count for the average"
+    )
+
+
+class CategoryUserScore(Base, TimestampMixin):
+    __tablename__ = 'category_user_score'
+    __table_args__ = (
+        # Leaderboard order and rank counts per category
+        Index('ix_category_user_score_total_score', 'category_id', 'total_score'),
+    )
+
+    category_id: Mapped[UUID] = mapped_column(
+        ForeignKey('category.id', ondelete="CASCADE"),
+        primary_key=True,
+        comment="ID of the category of the events"
+    )
+    user_id: Mapped[UUID] = mapped_column(
+        ForeignKey('user.id', ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+        comment="ID of the user"
+    )
+    total_score: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="Sum of the scores of the user in the category"
+    )
+    events_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="Number of statistics of the user in the category"
+    )
+    rating_sum: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        comment="Sum of the ratings of the user in the category"
+    )
 
 
 class Feedback(Base, TimestampMixin, IDMixin):
     __tablename__ = 'feedback'
+    __table_args__ = (
+        # Keyset pagination of list views
+        Index('ix_feedback_created_at_id', 'created_at', 'id'),
+    )
 
     user_id: Mapped[UUID] = mapped_column(
         ForeignKey('user.id', ondelete="CASCADE"),
+        index=True,
         nullable=False,
         comment="ID of the user who left the feedback"
     )
@@ -234,4 +402,25 @@ class Feedback(Base, TimestampMixin, IDMixin):
         comment="Text of the feedback"
     )
 
-    user: Mapped[User] = relationship("User", backref="feedbacks")
+    user: Mapped[User] = relationship("User", backref="feedbacks", lazy="raise")
+
+
+class FSMState(Base, TimestampMixin):
+    __tablename__ = 'fsm_state'
+
+    key: Mapped[str] = mapped_column(
+        String(255),
+        primary_key=True,
+        comment="FSM storage key (bot, chat, user and destiny)"
+    )
+    state: Mapped[str] = mapped_column(
+        String(255),
+        nullable=True,
+        comment="Current FSM state"
+    )
+    data: Mapped[dict] = mapped_column(
+        JSONB,
+        nullable=False,
+        server_default='{}',
+        comment="FSM data of the conversation"
+    )
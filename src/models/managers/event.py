@@ -1,44 +1,179 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import and_, cast, func, or_, tuple_, update
+from sqlalchemy.dialects.postgresql import REGCONFIG, aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.future import select
+from sqlalchemy.orm import joinedload
 
-from src.models.database_models import Event, User
+from src.models.database_models import SEARCH_CONFIG, Event, User
 from src.functionality.event.schemes import EventCreateSchema, EventUpdateSchema
+from src.utils.geohash import EARTH_RADIUS_KM, cover
+from typing import List, Optional, Tuple
 from uuid import UUID
 
+# Loader options for showing an event with its category and organizer in one query
+EVENT_DETAILS = (joinedload(Event.category), joinedload(Event.organizer))
+
+# Matches ranked per search: a common word can match most events, and ranking
+# all of them would cost as much as a full scan
+SEARCH_MAX_CANDIDATES = 1000
+
 
 class EventManager:
     @staticmethod
     async def create_event(session: AsyncSession, event_data: EventCreateSchema) -> Event:
-        """Creates a new event."""
+        """Creates a new event, generated columns are read back by the INSERT itself."""
         new_event = Event(**event_data.model_dump())
         session.add(new_event)
         try:
             await session.commit()
-            await session.refresh(new_event)
             return new_event
         except SQLAlchemyError as e:
             await session.rollback()
             raise e
 
     @staticmethod
-    async def get_event_by_id(session: AsyncSession, event_id: UUID) -> Event | None:
-        """Get event by ID."""
-        result = await session.execute(select(Event).where(Event.id == event_id))
+    async def get_event_by_id(session: AsyncSession, event_id: UUID, with_details: bool = False) -> Event | None:
+        """Get event by ID, with category and organizer loaded if `with_details`."""
+        statement = select(Event).where(Event.id == event_id)
+        if with_details:
+            statement = statement.options(*EVENT_DETAILS)
+        result = await session.execute(statement)
         return result.scalar_one_or_none()
 
+    @staticmethod
+    async def get_events_by_organizer(session: AsyncSession, organizer_id: UUID) -> List[Event]:
+        """Get events of the organizer with their category and organizer loaded."""
+        result = await session.execute(
+            select(Event)
+            .where(Event.organizer_id == organizer_id)
+            .options(*EVENT_DETAILS)
+            .order_by(Event.created_at, Event.id)
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def get_upcoming_events(
+        session: AsyncSession,
+        now: Optional[datetime] = None,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, UUID]] = None,
+    ) -> List[Event]:
+        """
+        Events starting from `now` on, soonest first. `after` is the (date_time, id)
+        of the last event of the previous page. Past events are never read, the
+        range starts in the date_time index.
+        """
+        statement = select(Event).where(Event.date_time >= (now or datetime.now(timezone.utc)))
+        if after is not None:
+            statement = statement.where(tuple_(Event.date_time, Event.id) > tuple_(*after))
+        result = await session.execute(statement.order_by(Event.date_time, Event.id).limit(limit))
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def get_events_between(session: AsyncSession, start: datetime, end: datetime, limit: int = 100) -> List[Event]:
+        """Events starting in [start, end), soonest first, read with a range scan of the date_time index."""
+        result = await session.execute(
+            select(Event)
+            .where(Event.date_time >= start, Event.date_time < end)
+            .order_by(Event.date_time, Event.id)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def search_event_ids(session: AsyncSession, text: str) -> List[UUID]:
+        """
+        Ids of the events matching the web-search style query (words, "phrases",
+        -excluded), best ranked first. Matches are found with the GIN index and
+        only the first SEARCH_MAX_CANDIDATES of them are ranked; they are taken
+        in index order, as sorting would have to read every match. Pages are
+        cut from the returned ids, so they never change while the user pages.
+        """
+        query = func.websearch_to_tsquery(cast(SEARCH_CONFIG, REGCONFIG), text)
+        candidates = (
+            select(Event.id, Event.search_vector)
+            .where(Event.search_vector.bool_op("@@")(query))
+            .limit(SEARCH_MAX_CANDIDATES)
+            .subquery()
+        )
+        # Ranked outside of the subquery, so only the candidates are ranked;
+        # one array instead of a row per id is cheaper to decode
+        rank = func.ts_rank_cd(candidates.c.search_vector, query)
+        event_ids = await session.scalar(
+            select(func.array_agg(aggregate_order_by(candidates.c.id, rank.desc(), candidates.c.id)))
+        )
+        return event_ids or []
+
+    @staticmethod
+    async def get_events_by_ids(session: AsyncSession, event_ids: List[UUID]) -> list:
+        """Title, description, location and start of the events in the order of `event_ids`, deleted ones are skipped."""
+        if not event_ids:
+            return []
+        result = await session.execute(
+            select(Event.id, Event.title, Event.description, Event.location, Event.date_time)
+            .where(Event.id.in_(event_ids))
+        )
+        events = {event.id: event for event in result.all()}
+        return [events[event_id] for event_id in event_ids if event_id in events]
+
+    @staticmethod
+    async def get_events_near(
+        session: AsyncSession,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: int = 10,
+        now: Optional[datetime] = None,
+    ) -> list:
+        """
+        Events within `radius_km` of the point starting from `now` on, nearest
+        first. Candidates are read with range scans of the geohash index over
+        the cells covering the circle, the exact (haversine) distance is
+        computed only for them.
+        """
+        in_cells = or_(*(
+            and_(Event.geohash >= cell, Event.geohash < cell + "~") for cell in cover(latitude, longitude, radius_km)
+        ))
+        a = (
+            func.power(func.sin(func.radians(Event.latitude - latitude) / 2), 2)
+            + func.cos(func.radians(latitude)) * func.cos(func.radians(Event.latitude))
+            * func.power(func.sin(func.radians(Event.longitude - longitude) / 2), 2)
+        )
+        candidates = (
+            select(
+                Event.id,
+                Event.title,
+                Event.location,
+                Event.date_time,
+                Event.latitude,
+                Event.longitude,
+                (2 * EARTH_RADIUS_KM * func.asin(func.sqrt(func.least(a, 1.0)))).label("distance"),
+            )
+            .where(in_cells, Event.date_time >= (now or datetime.now(timezone.utc)))
+            .subquery()
+        )
+        result = await session.execute(
+            select(candidates)
+            .where(candidates.c.distance <= radius_km)
+            .order_by(candidates.c.distance, candidates.c.id)
+            .limit(limit)
+        )
+        return list(result.all())
+
     @staticmethod
     async def update_event(session: AsyncSession, event_id: UUID, event_data: EventUpdateSchema) -> Event | None:
-        """Update event by ID."""
-        event = await EventManager.get_event_by_id(session, event_id)
-        if not event:
-            return None
+        """Update event by ID with one UPDATE ... RETURNING."""
+        values = event_data.model_dump(exclude_unset=True)
+        if not values:
+            return await EventManager.get_event_by_id(session, event_id)
 
-        for key, value in event_data.dict(exclude_unset=True).items():
-            setattr(event, key, value)
+        statement = update(Event).where(Event.id == event_id).values(**values).returning(Event)
         try:
+            event = (await session.scalars(statement, execution_options={"populate_existing": True})).one_or_none()
             await session.commit()
-            await session.refresh(event)
             return event
         except SQLAlchemyError as e:
             await session.rollback()
@@ -1,87 +1,325 @@
+from dataclasses import dataclass, field
 from datetime import date
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
+from typing import Iterable, List, Optional, Tuple, get_args
 from uuid import UUID
-from src.models.rsvp import RSVP
-from src.models.event import Event
-from src.models.user import User
 
+from sqlalchemy import Integer, bindparam, cast, delete, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.types import String
+
+from src.functionality.rsvp.schemes import RSVPChangeSchema, RSVPStatus
+from src.models.database_models import Event, RSVP
+from src.utils.helpers import uuid7
+
+RSVP_UNIQUE_CONSTRAINT = "uq_rsvp_user_event"
+
+# Status of users who accepted a full event, set only by RSVPManager
+WAITLISTED = "waitlisted"
+
+
+@dataclass(frozen=True, slots=True)
+class RSVPResult:
+    rsvp: RSVP
+    # Users moved from the waitlist into the seat the user left
+    promoted: List[UUID] = field(default_factory=list)
+
+
+class RSVPManager:
+    """
+    Async manager of RSVP records, one RSVP per (user, event).
+    Accepted RSVPs are counted in Event.accepted_count, which is changed only
+    here and never exceeds people_amount through `respond`. Users accepting a
+    full event are waitlisted and promoted in join order when seats free up.
+    Lock order is the RSVP of the user, then the event row, so concurrent
+    RSVPs never deadlock.
+    """
+
+    @staticmethod
+    async def _lock(session: AsyncSession, user_id: UUID, event_id: UUID) -> str:
+        """
+        Locks the RSVP of the user until commit, inserting a "declined" one if
+        there is none, and returns its current status. Concurrent changes
+        of one RSVP (double clicks) wait here, so a seat is never taken twice.
+        """
+        statement = insert(RSVP).values(
+            user_id=user_id,
+            event_id=event_id,
+            status="declined",
+            responded_at=date.today(),
+        )
+        statement = statement.on_conflict_do_update(
+            constraint=RSVP_UNIQUE_CONSTRAINT,
+            set_={"status": RSVP.status},
+        ).returning(RSVP.status)
+        return (await session.execute(statement)).scalar_one()
+
+    @staticmethod
+    async def _upsert_unseated(session: AsyncSession, user_id: UUID, event_id: UUID, status: str) -> Optional[RSVP]:
+        """
+        Sets a status holding no seat with one INSERT ... ON CONFLICT, leaving
+        the waitlist if the user was on it. An accepted RSVP is not changed, as
+        its seat must be released: None is returned and the conflicting row
+        stays locked until commit, like after `_lock`.
+        """
+        statement = insert(RSVP).values(
+            user_id=user_id,
+            event_id=event_id,
+            status=status,
+            responded_at=date.today(),
+        )
+        statement = statement.on_conflict_do_update(
+            constraint=RSVP_UNIQUE_CONSTRAINT,
+            set_={
+                "status": statement.excluded.status,
+                "waitlisted_at": None,
+                "responded_at": statement.excluded.responded_at,
+                "updated_at": func.now(),
+            },
+            where=RSVP.status != "accepted",
+        ).returning(RSVP)
+        result = await session.scalars(statement, execution_options={"populate_existing": True})
+        return result.one_or_none()
+
+    @staticmethod
+    async def _take_seat(session: AsyncSession, event_id: UUID) -> bool:
+        """
+        Takes a seat of the event with a conditional UPDATE of accepted_count.
+        When the event is full its row is locked until commit instead: a seat
+        freed meanwhile is taken, and a seat freed later waits for this
+        transaction and then sees the new waitlist entry.
+        """
+        take = (
+            update(Event)
+            .where(Event.id == event_id, Event.accepted_count < Event.people_amount)
+            .values(accepted_count=Event.accepted_count + 1)
+            .returning(Event.id)
+            .execution_options(synchronize_session=False)
+        )
+        if (await session.execute(take)).first() is not None:
+            return True
+        # NO KEY UPDATE: RSVP inserts hold KEY SHARE locks on the event for their foreign key
+        free = await session.scalar(
+            select(Event.accepted_count < Event.people_amount)
+            .where(Event.id == event_id)
+            .with_for_update(key_share=True)
+        )
+        return bool(free) and (await session.execute(take)).first() is not None
+
+    @staticmethod
+    async def promote_waitlist(session: AsyncSession, event_id: UUID, released: int = 0) -> List[UUID]:
+        """
+        Gives back `released` seats and moves the first waitlisted users into
+        the free seats of the event (also after people_amount was raised).
+        Waitlisted RSVPs locked by their own users are skipped, not waited for.
+        :return: ids of the promoted users
+        """
+        free = await session.scalar(
+            update(Event)
+            .where(Event.id == event_id)
+            .values(accepted_count=Event.accepted_count - released)
+            .returning(Event.people_amount - Event.accepted_count)
+            .execution_options(synchronize_session=False)
+        )
+        if not free or free <= 0:
+            return []
 
-class RSVPCRUD:
-    """CRUD class for managing RSVP records."""
+        rsvp, event = RSVP.__table__, Event.__table__
+        waitlist = (
+            select(rsvp.c.id)
+            .where(rsvp.c.event_id == event_id, rsvp.c.status == WAITLISTED)
+            .order_by(rsvp.c.waitlisted_at, rsvp.c.id)
+            .limit(free)
+            .with_for_update(skip_locked=True)
+            .cte("waitlist")
+        )
+        promoted = (
+            update(rsvp)
+            .where(rsvp.c.id == waitlist.c.id)
+            .values(status="accepted", waitlisted_at=None, updated_at=func.now())
+            .returning(rsvp.c.user_id)
+            .cte("promoted")
+        )
+        seats = (
+            update(event)
+            .where(event.c.id == event_id)
+            .values(
+                accepted_count=event.c.accepted_count + select(func.count()).select_from(promoted).scalar_subquery(),
+                updated_at=func.now(),
+            )
+            .cte("seats")
+        )
+        result = await session.execute(select(promoted.c.user_id).add_cte(seats))
+        return list(result.scalars().all())
 
     @staticmethod
-    def create_rsvp(session: Session, user_id: UUID, event_id: UUID, status: str, responded_at: date) -> RSVP:
-        """Create a new RSVP record."""
+    async def respond(session: AsyncSession, user_id: UUID, event_id: UUID, status: RSVPStatus) -> RSVPResult:
+        """
+        Sets the RSVP status of the user. Accepting takes a seat, on a full
+        event the user is waitlisted instead (keeping the place when accepting
+        again). Leaving a seat promotes the first waitlisted user.
+        Changes that move no seat take a single statement.
+        Only the seat logic waitlists users, so `status` must be a RSVPStatus.
+        """
+        if status not in get_args(RSVPStatus):
+            raise ValueError(f"Unknown RSVP status: {status}")
         try:
-            rsvp = RSVP(
-                user_id=user_id,
-                event_id=event_id,
-                status=status,
-                responded_at=responded_at
+            if status != "accepted":
+                rsvp = await RSVPManager._upsert_unseated(session, user_id, event_id, status)
+                if rsvp is not None:
+                    await session.commit()
+                    return RSVPResult(rsvp)
+                # The RSVP is accepted and now locked, its seat goes to the waitlist
+                previous = "accepted"
+            else:
+                previous = await RSVPManager._lock(session, user_id, event_id)
+            promoted = []
+            waitlisted_at = None
+            if status == "accepted" and previous != "accepted":
+                if not await RSVPManager._take_seat(session, event_id):
+                    status = WAITLISTED
+                    waitlisted_at = RSVP.waitlisted_at if previous == WAITLISTED else func.clock_timestamp()
+            elif status != "accepted" and previous == "accepted":
+                promoted = await RSVPManager.promote_waitlist(session, event_id, released=1)
+
+            statement = (
+                update(RSVP)
+                .where(RSVP.user_id == user_id, RSVP.event_id == event_id)
+                .values(status=status, waitlisted_at=waitlisted_at, responded_at=date.today(),
+                        updated_at=func.now())
+                .returning(RSVP)
             )
-            session.add(rsvp)
-            session.commit()
-            session.refresh(rsvp)
-            return rsvp
+            result = await session.scalars(
+                statement, execution_options={"populate_existing": True, "synchronize_session": False}
+            )
+            rsvp = result.one()
+            await session.commit()
+            return RSVPResult(rsvp, promoted)
         except SQLAlchemyError as e:
-            session.rollback()
-            raise RuntimeError(f"Error creating RSVP: {e}")
+            await session.rollback()
+            raise RuntimeError(f"Error saving RSVP: {e}")
 
     @staticmethod
-    def get_rsvp(session: Session, rsvp_id: UUID) -> RSVP | None:
-        """Retrieve an RSVP by its ID."""
+    async def bulk_respond(session: AsyncSession, changes: Iterable[RSVPChangeSchema]) -> int:
+        """
+        Applies RSVP changes (e.g. an organizer import) in one statement.
+        Rows are passed as four arrays, so the statement size doesn't depend
+        on the number of changes. Later changes of the same (user, event) win
+        and rows already in the requested status are not rewritten.
+        Imports are not checked against capacity and do not promote the
+        waitlist, but accepted_count stays exact: the statement adds the
+        accepted difference of the changed rows to their events.
+        :return: number of created or changed RSVPs
+        """
+        latest = {(change.user_id, change.event_id): change.status for change in changes}
+        if not latest:
+            return 0
+
+        rows = select(
+            func.unnest(bindparam("ids", type_=ARRAY(PG_UUID(as_uuid=True)))),
+            func.unnest(bindparam("user_ids", type_=ARRAY(PG_UUID(as_uuid=True)))),
+            func.unnest(bindparam("event_ids", type_=ARRAY(PG_UUID(as_uuid=True)))),
+            func.unnest(bindparam("statuses", type_=ARRAY(String))),
+            bindparam("today", type_=RSVP.responded_at.type),
+        )
+        # Core table statement: the parameters are arrays, not ORM bulk insert rows
+        table = RSVP.__table__
+        statement = insert(table).from_select(
+            ["id", "user_id", "event_id", "status", "responded_at"], rows
+        )
+        statement = statement.on_conflict_do_update(
+            constraint=RSVP_UNIQUE_CONSTRAINT,
+            set_={
+                "status": statement.excluded.status,
+                "responded_at": statement.excluded.responded_at,
+                "updated_at": statement.excluded.updated_at,
+                "waitlisted_at": None,
+            },
+            where=table.c.status.is_distinct_from(statement.excluded.status),
+        ).returning(table.c.user_id, table.c.event_id, table.c.status)
+        changed = statement.cte("changed")
+
+        # Other parts of the statement read the RSVPs as they were before it
+        previous = aliased(table)
+        delta = func.sum(
+            cast(changed.c.status == "accepted", Integer)
+            - cast(func.coalesce(previous.c.status == "accepted", False), Integer)
+        )
+        deltas = (
+            select(changed.c.event_id, delta.label("delta"))
+            .outerjoin(previous, (previous.c.user_id == changed.c.user_id) & (previous.c.event_id == changed.c.event_id))
+            .group_by(changed.c.event_id)
+            .cte("deltas")
+        )
+        event = Event.__table__
+        seats = (
+            update(event)
+            .where(event.c.id == deltas.c.event_id, deltas.c.delta != 0)
+            .values(accepted_count=event.c.accepted_count + deltas.c.delta, updated_at=func.now())
+            .cte("seats")
+        )
+
+        keys: List[Tuple[UUID, UUID]] = list(latest)
+        params = {
+            "ids": [uuid7() for _ in keys],
+            "user_ids": [user_id for user_id, _ in keys],
+            "event_ids": [event_id for _, event_id in keys],
+            "statuses": list(latest.values()),
+            "today": date.today(),
+        }
         try:
-            return session.query(RSVP).filter_by(id=rsvp_id).first()
+            result = await session.execute(select(func.count()).select_from(changed).add_cte(seats), params)
+            count = result.scalar_one()
+            await session.commit()
+            return count
         except SQLAlchemyError as e:
-            raise RuntimeError(f"Error retrieving RSVP: {e}")
+            await session.rollback()
+            raise RuntimeError(f"Error importing RSVPs: {e}")
 
     @staticmethod
-    def get_rsvps_by_user(session: Session, user_id: UUID) -> list[RSVP]:
-        """Retrieve all RSVPs for a specific user."""
+    async def get_user_rsvps(session: AsyncSession, user_id: UUID) -> list:
+        """RSVPs of the user with event titles, newest first."""
         try:
-            return session.query(RSVP).filter_by(user_id=user_id).all()
+            result = await session.execute(
+                select(RSVP.event_id, RSVP.status, Event.title)
+                .join(RSVP.event)
+                .where(RSVP.user_id == user_id)
+                .order_by(RSVP.updated_at.desc())
+            )
+            return list(result.all())
         except SQLAlchemyError as e:
             raise RuntimeError(f"Error retrieving RSVPs for user: {e}")
 
     @staticmethod
-    def get_rsvps_by_event(session: Session, event_id: UUID) -> list[RSVP]:
+    async def get_rsvps_by_event(session: AsyncSession, event_id: UUID) -> List[RSVP]:
         """Retrieve all RSVPs for a specific event."""
         try:
-            return session.query(RSVP).filter_by(event_id=event_id).all()
+            result = await session.scalars(select(RSVP).where(RSVP.event_id == event_id))
+            return list(result.all())
         except SQLAlchemyError as e:
             raise RuntimeError(f"Error retrieving RSVPs for event: {e}")
 
     @staticmethod
-    def update_rsvp(session: Session, rsvp_id: UUID, status: str = None, responded_at: date = None) -> RSVP:
-        """Update an RSVP by its ID."""
+    async def delete_rsvp(session: AsyncSession, user_id: UUID, event_id: UUID) -> Optional[List[UUID]]:
+        """
+        Deletes the RSVP of the user for the event, a deleted accepted RSVP frees its seat.
+        :return: users promoted into the seat, None if there was no RSVP
+        """
         try:
-            rsvp = session.query(RSVP).filter_by(id=rsvp_id).first()
-            if not rsvp:
-                raise ValueError("RSVP with the specified ID was not found.")
-
-            if status:
-                rsvp.status = status
-            if responded_at:
-                rsvp.responded_at = responded_at
-
-            session.commit()
-            session.refresh(rsvp)
-            return rsvp
-        except SQLAlchemyError as e:
-            session.rollback()
-            raise RuntimeError(f"Error updating RSVP: {e}")
-
-    @staticmethod
-    def delete_rsvp(session: Session, rsvp_id: UUID) -> None:
-        """Delete an RSVP by its ID."""
-        try:
-            rsvp = session.query(RSVP).filter_by(id=rsvp_id).first()
-            if not rsvp:
-                raise ValueError("RSVP with the specified ID was not found.")
-
-            session.delete(rsvp)
-            session.commit()
+            result = await session.execute(
+                delete(RSVP).where(RSVP.user_id == user_id, RSVP.event_id == event_id).returning(RSVP.status)
+            )
+            status = result.scalar_one_or_none()
+            if status is None:
+                await session.rollback()
+                return None
+            promoted = []
+            if status == "accepted":
+                promoted = await RSVPManager.promote_waitlist(session, event_id, released=1)
+            await session.commit()
+            return promoted
         except SQLAlchemyError as e:
-            session.rollback()
+            await session.rollback()
             raise RuntimeError(f"Error deleting RSVP: {e}")
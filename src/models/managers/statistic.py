@@ -0,0 +1,133 @@
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Type
+from uuid import UUID
+
+from sqlalchemy import Select, func, literal, select, true
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from src.models.database_models import Base, Category, CategoryUserScore, Event, Statistic, UserScore
+from src.utils.helpers import uuid7
+
+
+@dataclass(frozen=True, slots=True)
+class ScoreTotals:
+    """Totals of the user after recording a statistic."""
+    user_id: UUID
+    category_id: UUID
+    total_score: int
+    category_score: int
+
+
+def add_to_totals(model: Type[Base], keys: List[str], rows: Select):
+    """
+    Upsert adding `rows` (keys, score, count, rating) to the totals of `model`,
+    returning the new total score. Concurrent upserts of one key wait for the
+    row lock, so no increment is lost.
+    """
+    statement = insert(model).from_select(
+        [*keys, "total_score", "events_count", "rating_sum", "created_at", "updated_at"], rows
+    )
+    return statement.on_conflict_do_update(
+        index_elements=keys,
+        set_={
+            "total_score": model.total_score + statement.excluded.total_score,
+            "events_count": model.events_count + statement.excluded.events_count,
+            "rating_sum": model.rating_sum + statement.excluded.rating_sum,
+            "updated_at": statement.excluded.updated_at,
+        },
+    ).returning(*(getattr(model, key) for key in keys), model.total_score)
+
+
+class StatisticManager:
+    """Statistics and the leaderboard totals kept from them."""
+
+    @staticmethod
+    async def record_statistic(
+        session: AsyncSession, user_id: UUID, event_id: UUID, score: int, rating: float
+    ) -> ScoreTotals:
+        """
+        Inserts the statistic and adds it to the user and the user-per-category
+        totals in one statement (data-modifying CTEs), so the totals never
+        diverge from the statistic table and are never recomputed. This is the
+        only allowed writer of statistics, flushing a Statistic object raises.
+        """
+        # Client side defaults (the id) are not applied to an INSERT in a CTE
+        inserted = (
+            insert(Statistic)
+            .values(id=uuid7(), user_id=user_id, event_id=event_id, score=score, rating=rating)
+            .returning(Statistic.user_id, Statistic.event_id, Statistic.score, Statistic.rating)
+            .cte("inserted")
+        )
+        user_totals = add_to_totals(UserScore, ["user_id"], select(
+            inserted.c.user_id, inserted.c.score, literal(1), inserted.c.rating, func.now(), func.now()
+        )).cte("user_totals")
+        category_totals = add_to_totals(CategoryUserScore, ["category_id", "user_id"], select(
+            Event.category_id, inserted.c.user_id, inserted.c.score, literal(1), inserted.c.rating, func.now(), func.now()
+        ).join_from(inserted, Event, Event.id == inserted.c.event_id)).cte("category_totals")
+
+        statement = select(
+            user_totals.c.user_id,
+            category_totals.c.category_id,
+            user_totals.c.total_score,
+            category_totals.c.total_score.label("category_score"),
+        ).join_from(user_totals, category_totals, category_totals.c.user_id == user_totals.c.user_id)
+        try:
+            row = (await session.execute(statement)).one()
+            await session.commit()
+            return ScoreTotals(row.user_id, row.category_id, row.total_score, row.category_score)
+        except SQLAlchemyError as e:
+            await session.rollback()
+            raise e
+
+    @staticmethod
+    async def get_top_scores(session: AsyncSession, limit: int) -> List[Tuple[UUID, int]]:
+        """(user id, total score) of the best users, read from the total_score index."""
+        result = await session.execute(
+            select(UserScore.user_id, UserScore.total_score)
+            .order_by(UserScore.total_score.desc(), UserScore.user_id)
+            .limit(limit)
+        )
+        return [tuple(row) for row in result.all()]
+
+    @staticmethod
+    async def get_category_top_scores(session: AsyncSession, limit: int) -> List[Tuple[UUID, UUID, int]]:
+        """
+        (category id, user id, total score) of the best `limit` users of every
+        category. Each category reads only its top of the (category_id,
+        total_score) index, the scores of the other users are not touched.
+        """
+        top = (
+            select(CategoryUserScore.user_id, CategoryUserScore.total_score)
+            .where(CategoryUserScore.category_id == Category.id)
+            .order_by(CategoryUserScore.total_score.desc(), CategoryUserScore.user_id)
+            .limit(limit)
+            .lateral("top")
+        )
+        result = await session.execute(select(Category.id, top.c.user_id, top.c.total_score).join(top, true()))
+        return [tuple(row) for row in result.all()]
+
+    @staticmethod
+    async def get_rank(
+        session: AsyncSession, user_id: UUID, category_id: Optional[UUID] = None
+    ) -> Optional[Tuple[int, int]]:
+        """
+        (rank, total score) of the user, overall or in the category, None without
+        statistics. The rank is 1 + the number of higher totals (an index range count).
+        """
+        if category_id is None:
+            model, keys = UserScore, (UserScore.user_id == user_id,)
+        else:
+            model, keys = CategoryUserScore, (
+                CategoryUserScore.category_id == category_id, CategoryUserScore.user_id == user_id
+            )
+        other = aliased(model)
+        higher = select(func.count()).select_from(other).where(other.total_score > model.total_score)
+        if category_id is not None:
+            higher = higher.where(other.category_id == category_id)
+        row = (await session.execute(
+            select(higher.scalar_subquery() + 1, model.total_score).where(*keys)
+        )).one_or_none()
+        return None if row is None else tuple(row)
@@ -1,9 +1,15 @@
 from uuid import UUID
 
+from typing import Optional
+
+from sqlalchemy import func, or_, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import SQLAlchemyError
+from src.functionality.user.schemes import UserSchema
 from src.models.database_models import User
+from src.services.profile_cache import profile_cache
 
 
 class UserManager:
@@ -43,7 +49,7 @@ class UserManager:
             new_user = User(id=user_id, username=username)
             session.add(new_user)
             await session.commit()
-            await session.refresh(new_user)
+            profile_cache.invalidate(user_id)
             return new_user
         except SQLAlchemyError as e:
             await session.rollback()
@@ -64,18 +70,59 @@ class UserManager:
         :param value: значение, которое нужно установить.
         :return: User — объект пользователя с обновленными данными.
         """
+        if field not in User.__table__.c:
+            raise ValueError(f"Поле '{field}' отсутствует в модели User.")
         try:
-            user = await UserManager.get_user(session, user_id)
+            # Один UPDATE ... RETURNING вместо чтения, записи и повторного чтения
+            statement = update(User).where(User.id == user_id).values({field: value}).returning(User)
+            user = (await session.scalars(statement, execution_options={"populate_existing": True})).one_or_none()
             if not user:
                 raise ValueError("Пользователь не найден.")
 
-            if not hasattr(user, field):
-                raise ValueError(f"Поле '{field}' отсутствует в модели User.")
-
-            setattr(user, field, value)
             await session.commit()
-            await session.refresh(user)
+            profile_cache.invalidate(user_id)
             return user
         except SQLAlchemyError as e:
             await session.rollback()
             raise RuntimeError(f"Ошибка обновления пользователя: {str(e)}")
+
+    @staticmethod
+    async def upsert_profile(
+        session: AsyncSession,
+        user_id: UUID,
+        profile: UserSchema,
+        username: str = None
+    ) -> Optional[User]:
+        """
+        Создание пользователя или обновление заданных полей профиля одним
+        INSERT ... ON CONFLICT (id) DO UPDATE ... RETURNING.
+        Обновляются только поля, переданные в `profile` и отличающиеся от
+        сохраненных (IS DISTINCT FROM), username существующего пользователя не меняется.
+        :param session: AsyncSession — асинхронная сессия SQLAlchemy.
+        :param user_id: UUID — UUID пользователя.
+        :param profile: UserSchema — проверенные поля профиля.
+        :param username: str — Имя пользователя Telegram для нового пользователя (опционально).
+        :return: User | None — созданный или измененный пользователь, None если ничего не изменилось.
+        """
+        values = profile.model_dump(exclude_unset=True)
+        statement = insert(User).values(id=user_id, username=username, **values)
+        if values:
+            statement = statement.on_conflict_do_update(
+                index_elements=[User.id],
+                set_={**{name: statement.excluded[name] for name in values}, "updated_at": func.now()},
+                where=or_(*(getattr(User, name).is_distinct_from(statement.excluded[name]) for name in values)),
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=[User.id])
+        try:
+            result = await session.scalars(
+                statement.returning(User), execution_options={"populate_existing": True}
+            )
+            user = result.one_or_none()
+            await session.commit()
+            if user:
+                profile_cache.invalidate(user_id)
+            return user
+        except SQLAlchemyError as e:
+            await session.rollback()
+            raise RuntimeError(f"Ошибка сохранения профиля: {str(e)}")
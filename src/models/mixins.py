@@ -1,20 +1,27 @@
 from sqlalchemy import (
     DateTime,
+    func,
 )
 from sqlalchemy.orm import mapped_column, Mapped
 from sqlalchemy.dialects.postgresql import UUID
-import uuid
-from datetime import datetime
+
+from src.utils.helpers import uuid7
 
 
 class IDMixin:
-    """Mixin to add unique identifier PK with UUID."""
-    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    """Mixin to add unique identifier PK with UUID, time-ordered (v7) for new rows."""
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
 
 
 # Mixin for adding timestamp fields
 class TimestampMixin:
-    """Mixin to add timestamp fields: created_at and updated_at with UTC time."""
-    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
-    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow,
-                                                 onupdate=datetime.utcnow)
+    """
+    Mixin to add timestamp fields: created_at and updated_at, set by the database.
+    Eager defaults read them back with RETURNING of the INSERT/UPDATE itself,
+    so a flushed object needs no refresh.
+    """
+    __mapper_args__ = {"eager_defaults": True}
+
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now(),
+                                                 onupdate=func.now())
@@ -0,0 +1,259 @@
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
+from uuid import UUID
+
+from pydantic import BaseModel, Field, PositiveInt, ValidationError, computed_field
+from sqlalchemy import (
+    Table,
+    Text,
+    and_,
+    any_,
+    case,
+    column,
+    delete,
+    exists,
+    func,
+    literal,
+    or_,
+    select,
+    table,
+    text,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.functionality.event.schemes import EventCreateSchema
+from src.functionality.user.schemes import UserSchema
+from src.models.database_models import Base, Category, Event, Team, User
+from src.services.logger import LoggerProvider
+from src.utils.helpers import convert_telegram_id_to_uuid, uuid7
+
+log = LoggerProvider().get_logger(__name__)
+
+# Invalid rows logged per file, the rest are only counted
+MAX_LOGGED_ERRORS = 20
+
+
+class UserImportSchema(UserSchema):
+    telegram_id: PositiveInt
+    username: Optional[str] = Field(None, max_length=255)
+    role: Optional[str] = Field(None, max_length=50)
+
+    @computed_field
+    @property
+    def id(self) -> UUID:
+        """The id the bot uses for this Telegram user."""
+        return convert_telegram_id_to_uuid(self.telegram_id)
+
+
+class CategoryImportSchema(BaseModel):
+    id: UUID = Field(default_factory=uuid7)
+    name: str = Field(max_length=255)
+    description: str = Field("", max_length=255)
+
+
+class EventImportSchema(EventCreateSchema):
+    id: UUID = Field(default_factory=uuid7)
+
+
+class TeamImportSchema(BaseModel):
+    id: UUID = Field(default_factory=uuid7)
+    name: str = Field(max_length=255)
+    description: str = Field("", max_length=255)
+    logo_url: str = Field("", max_length=255)
+    creator_id: UUID
+
+
+@dataclass(frozen=True)
+class ImportSpec:
+    """How rows of one model are validated and merged, rows are matched by `id`."""
+    model: Type[Base]
+    schema: Type[BaseModel]
+    # Foreign key column -> referenced model, rows referencing missing rows are skipped
+    references: Dict[str, Type[Base]] = field(default_factory=dict)
+
+    @property
+    def table(self) -> Table:
+        return self.model.__table__
+
+    @property
+    def columns(self) -> List[str]:
+        names = [*self.schema.model_fields, *self.schema.model_computed_fields]
+        return [name for name in names if name in self.table.c]
+
+
+IMPORT_SPECS = {
+    "users": ImportSpec(User, UserImportSchema),
+    "categories": ImportSpec(Category, CategoryImportSchema),
+    "events": ImportSpec(Event, EventImportSchema, {"category_id": Category, "organizer_id": User}),
+    "teams": ImportSpec(Team, TeamImportSchema, {"creator_id": User}),
+}
+
+
+@dataclass
+class ImportReport:
+    kind: str
+    read: int = 0
+    invalid: int = 0
+    # Rows sharing a username with another id of the same file
+    conflicting: int = 0
+    merged: int = 0
+    seconds: float = 0.0
+
+    @property
+    def copied(self) -> int:
+        return self.read - self.invalid
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.read / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.kind}: {self.read} rows read, {self.invalid} invalid, {self.conflicting} with a conflicting "
+            f"username, {self.merged} inserted or changed, "
+            f"{self.copied - self.conflicting - self.merged} unchanged, duplicated or with missing references "
+            f"in {self.seconds:.2f} s ({self.rows_per_second:,.0f} rows/s)"
+        )
+
+
+def read_rows(path: str) -> Iterator[Dict[str, Any]]:
+    """Streams rows of a CSV file (with a header) or an NDJSON file (`.ndjson`, `.jsonl`)."""
+    with open(path, encoding="utf-8", newline="") as file:
+        if path.endswith((".ndjson", ".jsonl")):
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            for row in csv.DictReader(file):
+                # Empty CSV cells mean "not set", so schema defaults apply
+                yield {key: value for key, value in row.items() if value != ""}
+
+
+def validate_rows(spec: ImportSpec, rows: Iterator[Dict[str, Any]], report: ImportReport) -> Iterator[Tuple]:
+    """
+    Valid rows as COPY records (schema columns, the columns the row sets and
+    the line number), invalid ones are counted.
+    """
+    columns = spec.columns
+    for line, row in enumerate(rows, start=1):
+        report.read += 1
+        try:
+            record = spec.schema.model_validate(row)
+        except ValidationError as e:
+            report.invalid += 1
+            if report.invalid <= MAX_LOGGED_ERRORS:
+                log.warning("%s row %s is invalid: %s", report.kind, line, e.errors(include_url=False))
+            continue
+        values = record.model_dump()
+        present = [name for name in columns if name in record.model_fields_set or name in record.model_computed_fields]
+        yield *(values[name] for name in columns), present, line
+
+
+def drop_conflicting_usernames(staging_name: str):
+    """
+    DELETE of staging rows whose username is used by another id in the same
+    file: which user should get it is unknown, and merging both would fail
+    the unique constraint and with it the whole import.
+    """
+    staging = table(staging_name, column("id"), column("username"))
+    other = staging.alias("other")
+    return delete(staging).where(
+        staging.c.username.is_not(None),
+        exists().where(and_(other.c.username == staging.c.username, other.c.id != staging.c.id)),
+    )
+
+
+def staging_table(spec: ImportSpec, staging_name: str):
+    """The temporary table rows are copied into, `present` lists the columns each row sets."""
+    return table(staging_name, *(column(name) for name in spec.columns), column("present", ARRAY(Text)), column("line"))
+
+
+def latest_rows(spec: ImportSpec, staging):
+    """SELECT of the last row of each id, rows with missing references are skipped."""
+    rows = (
+        select(*(staging.c[name] for name in spec.columns), staging.c.present)
+        .distinct(staging.c.id)
+        .order_by(staging.c.id, staging.c.line.desc())
+    )
+    for name, model in spec.references.items():
+        rows = rows.where(exists().where(model.id == staging.c[name]))
+    if spec.model is User:
+        # Usernames are unique, a row may not take the username of another user
+        rows = rows.where(~exists().where(and_(User.username == staging.c.username, User.id != staging.c.id)))
+    return rows
+
+
+def update_statement(spec: ImportSpec, staging_name: str):
+    """
+    UPDATE of existing rows from the staging table: only the columns a row
+    sets are written, so a file with fewer columns keeps the others, and
+    unchanged rows are not rewritten.
+    """
+    rows = latest_rows(spec, staging_table(spec, staging_name)).subquery("row")
+    target = spec.table
+    updated = [name for name in spec.columns if name != "id"]
+
+    def present(name: str):
+        return literal(name, Text) == any_(rows.c.present)
+
+    return (
+        update(target)
+        .where(target.c.id == rows.c.id)
+        .where(or_(*(and_(present(name), target.c[name].is_distinct_from(rows.c[name])) for name in updated)))
+        .values(
+            **{name: case((present(name), rows.c[name]), else_=target.c[name]) for name in updated},
+            updated_at=func.now(),
+        )
+    )
+
+
+def insert_statement(spec: ImportSpec, staging_name: str):
+    """INSERT ... SELECT of the new rows from the staging table, schema defaults fill the columns a row omits."""
+    columns = spec.columns
+    rows = latest_rows(spec, staging_table(spec, staging_name)).subquery("row")
+    statement = insert(spec.table).from_select(
+        [*columns, "created_at", "updated_at"],
+        select(*(rows.c[name] for name in columns), func.now(), func.now()),
+    )
+    # Existing ids were merged by the update
+    return statement.on_conflict_do_nothing(index_elements=[spec.table.c.id])
+
+
+async def import_file(connection: AsyncConnection, kind: str, path: str) -> ImportReport:
+    """
+    Imports the file into the table of `kind` (see IMPORT_SPECS) inside the
+    transaction of `connection`: rows are validated, streamed with COPY into
+    a temporary staging table and merged into the real table with an update
+    of the existing rows and an insert of the new ones.
+    """
+    spec = IMPORT_SPECS[kind]
+    report = ImportReport(kind)
+    started = time.perf_counter()
+
+    staging_name = f"import_{spec.table.name}"
+    column_list = ", ".join(f'"{name}"' for name in spec.columns)
+    await connection.execute(text(f"DROP TABLE IF EXISTS {staging_name}"))
+    await connection.execute(text(
+        f"CREATE TEMP TABLE {staging_name} AS SELECT {column_list}, '{{}}'::text[] AS present, 0::bigint AS line "
+        f'FROM "{spec.table.name}" WITH NO DATA'
+    ))
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        staging_name,
+        records=validate_rows(spec, read_rows(path), report),
+        columns=[*spec.columns, "present", "line"],
+    )
+    if spec.model is User:
+        report.conflicting = (await connection.execute(drop_conflicting_usernames(staging_name))).rowcount
+    updated = await connection.execute(update_statement(spec, staging_name))
+    inserted = await connection.execute(insert_statement(spec, staging_name))
+    report.merged = updated.rowcount + inserted.rowcount
+    await connection.execute(text(f"DROP TABLE {staging_name}"))
+
+    report.seconds = time.perf_counter() - started
+    return report
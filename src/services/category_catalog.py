@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config.app_config import settings
+from src.config.database_config import async_session
+from src.models.database_models import Category
+from src.services.logger import LoggerProvider
+from src.services.periodic import PeriodicTask
+from src.utils.keyboards import PreparedKeyboardMarkup, keyboards
+
+log = LoggerProvider().get_logger(__name__)
+
+# Hash of every (id, name, updated_at), changes on every insert, update and delete. A max(updated_at)
+# would miss a transaction committing after a newer one, as updated_at is the transaction start time
+CATALOG_VERSION = func.coalesce(func.md5(func.string_agg(
+    func.concat_ws(":", Category.id, Category.name, Category.updated_at), aggregate_order_by(",", Category.id)
+)), "")
+
+
+@dataclass(frozen=True, slots=True)
+class CategoryItem:
+    id: UUID
+    name: str
+
+
+class CategoryCatalog(PeriodicTask):
+    """
+    In-memory copy of the category table with a version stamp.
+    It is loaded once and reloaded only when a cheap stamp query (a hash
+    of the rows, computed in the database) shows a change, either on a
+    periodic check or after `invalidate()`.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = async_session,
+        refresh_interval: float = 60,
+    ):
+        super().__init__(refresh_interval)
+        self.session_factory = session_factory
+        self.categories: Tuple[CategoryItem, ...] = ()
+        self.version: Optional[str] = None
+
+    async def load(self) -> None:
+        """Reads all categories and their version stamp in one statement (one snapshot)."""
+        version = select(CATALOG_VERSION).scalar_subquery()
+        async with self.session_factory() as session:
+            rows = (await session.execute(
+                select(Category.id, Category.name, version.label("version")).order_by(Category.name, Category.id)
+            )).all()
+        self.categories = tuple(CategoryItem(row.id, row.name) for row in rows)
+        # The stamp of an empty table
+        self.version = rows[0].version if rows else ""
+        log.info("Category catalog loaded: %s categories", len(rows))
+
+    async def refresh(self) -> bool:
+        """Reloads the catalog if the table changed, returns True if it did."""
+        async with self.session_factory() as session:
+            version = await session.scalar(select(CATALOG_VERSION))
+        if version == self.version:
+            return False
+        await self.load()
+        return True
+
+    def invalidate(self) -> None:
+        """Makes the next `markup()` reload the catalog (call after writing categories)."""
+        self.version = None
+
+    async def markup(self) -> PreparedKeyboardMarkup:
+        """Category picker, prebuilt once per catalog version."""
+        if self.version is None:
+            await self.load()
+        categories = self.categories
+        return keyboards.dynamic(
+            "categories",
+            self.version,
+            lambda: [(category.name, f"{category.id}") for category in categories],
+        )
+
+    async def start(self) -> None:
+        """Loads the catalog and starts the periodic refresh."""
+        await self.load()
+        self.start_periodic()
+
+    async def tick(self) -> None:
+        await self.refresh()
+
+category_catalog = CategoryCatalog(refresh_interval=settings.CATEGORY_REFRESH_INTERVAL)
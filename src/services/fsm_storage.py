@@ -0,0 +1,239 @@
+import asyncio
+import json
+import os
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, AsyncGenerator, Dict, Optional
+from uuid import UUID
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, KeyBuilder, StateType, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.config.app_config import settings
+from src.config.database_config import async_engine
+from src.models.database_models import FSMState
+
+
+def encode_data(value: Any) -> Any:
+    """Converts FSM data into JSON-compatible structure keeping dates and UUIDs."""
+    if isinstance(value, dict):
+        return {key: encode_data(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_data(item) for item in value]
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"__uuid__": str(value)}
+    return value
+
+
+def decode_data(value: Any) -> Any:
+    """Reverse of :func:`encode_data`."""
+    if isinstance(value, list):
+        return [decode_data(item) for item in value]
+    if isinstance(value, dict):
+        if len(value) == 1:
+            (tag, item), = value.items()
+            if tag == "__datetime__":
+                return datetime.fromisoformat(item)
+            if tag == "__date__":
+                return date.fromisoformat(item)
+            if tag == "__uuid__":
+                return UUID(item)
+        return {key: decode_data(item) for key, item in value.items()}
+    return value
+
+
+@dataclass
+class StorageRecord:
+    state: Optional[str] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+    dirty: bool = False
+
+
+class CoalescingStorage(BaseStorage, ABC):
+    """
+    Base class for persistent FSM storages.
+    Inside :meth:`batch` all reads are cached and all writes are buffered,
+    so every `set_state`/`update_data` made while handling one update
+    results in a single write at the end of the batch.
+    """
+
+    def __init__(self, key_builder: Optional[KeyBuilder] = None):
+        self.key_builder = key_builder or DefaultKeyBuilder(with_bot_id=True, with_destiny=True)
+        self._pending: ContextVar[Optional[Dict[str, StorageRecord]]] = ContextVar(
+            f"fsm_pending_{id(self)}", default=None
+        )
+
+    @abstractmethod
+    async def _read(self, key: str) -> Optional[StorageRecord]:
+        """Reads a single record."""
+
+    @abstractmethod
+    async def _write(self, records: Dict[str, StorageRecord]) -> None:
+        """Writes records, records without state and data are removed."""
+
+    @asynccontextmanager
+    async def batch(self) -> AsyncGenerator[None, None]:
+        """Coalesces all storage writes made inside the block into one write."""
+        if self._pending.get() is not None:
+            yield
+            return
+
+        token = self._pending.set({})
+        try:
+            yield
+        finally:
+            pending = self._pending.get()
+            self._pending.reset(token)
+            dirty = {key: record for key, record in pending.items() if record.dirty}
+            if dirty:
+                await self._write(dirty)
+
+    async def _get_record(self, key: StorageKey) -> StorageRecord:
+        name = self.key_builder.build(key)
+        pending = self._pending.get()
+        if pending is not None and name in pending:
+            return pending[name]
+
+        record = await self._read(name) or StorageRecord()
+        if pending is not None:
+            pending[name] = record
+        return record
+
+    async def _put_record(self, key: StorageKey, record: StorageRecord) -> None:
+        name = self.key_builder.build(key)
+        pending = self._pending.get()
+        if pending is None:
+            await self._write({name: record})
+            return
+        record.dirty = True
+        pending[name] = record
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        record = await self._get_record(key)
+        record.state = state.state if isinstance(state, State) else state
+        await self._put_record(key, record)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        record = await self._get_record(key)
+        return record.state
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        record = await self._get_record(key)
+        record.data = data.copy()
+        await self._put_record(key, record)
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        record = await self._get_record(key)
+        return record.data.copy()
+
+
+class PostgresStorage(CoalescingStorage):
+    """FSM storage keeping states in the `fsm_state` table."""
+
+    def __init__(self, engine: AsyncEngine, key_builder: Optional[KeyBuilder] = None):
+        super().__init__(key_builder)
+        self.engine = engine
+
+    async def _read(self, key: str) -> Optional[StorageRecord]:
+        async with self.engine.connect() as connection:
+            result = await connection.execute(
+                select(FSMState.state, FSMState.data).where(FSMState.key == key)
+            )
+            row = result.first()
+        if row is None:
+            return None
+        return StorageRecord(state=row.state, data=decode_data(row.data))
+
+    async def _write(self, records: Dict[str, StorageRecord]) -> None:
+        removed = [key for key, record in records.items() if record.state is None and not record.data]
+        values = [
+            {"key": key, "state": record.state, "data": encode_data(record.data)}
+            for key, record in records.items()
+            if key not in removed
+        ]
+
+        async with self.engine.begin() as connection:
+            if removed:
+                await connection.execute(delete(FSMState).where(FSMState.key.in_(removed)))
+            if values:
+                statement = insert(FSMState).values(values)
+                await connection.execute(
+                    statement.on_conflict_do_update(
+                        index_elements=[FSMState.key],
+                        set_={
+                            "state": statement.excluded.state,
+                            "data": statement.excluded.data,
+                            "updated_at": func.now(),
+                        },
+                    )
+                )
+
+    async def close(self) -> None:
+        pass
+
+
+class FileStorage(CoalescingStorage):
+    """
+    FSM storage keeping states in a local JSON file.
+    Suitable for single-process deployments without the database.
+    """
+
+    def __init__(self, path: str, key_builder: Optional[KeyBuilder] = None):
+        super().__init__(key_builder)
+        self.path = path
+        self._records: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = asyncio.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._records is None:
+            if os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as file:
+                    self._records = json.load(file)
+            else:
+                self._records = {}
+        return self._records
+
+    def _dump(self, records: Dict[str, Dict[str, Any]]) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(records, file, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    async def _read(self, key: str) -> Optional[StorageRecord]:
+        raw = self._load().get(key)
+        if raw is None:
+            return None
+        return StorageRecord(state=raw["state"], data=decode_data(raw["data"]))
+
+    async def _write(self, records: Dict[str, StorageRecord]) -> None:
+        async with self._lock:
+            stored = self._load()
+            for key, record in records.items():
+                if record.state is None and not record.data:
+                    stored.pop(key, None)
+                else:
+                    stored[key] = {"state": record.state, "data": encode_data(record.data)}
+            await asyncio.to_thread(self._dump, dict(stored))
+
+    async def close(self) -> None:
+        pass
+
+
+def create_storage() -> BaseStorage:
+    """Creates FSM storage selected by `FSM_STORAGE` setting."""
+    if settings.FSM_STORAGE == "postgres":
+        return PostgresStorage(async_engine)
+    if settings.FSM_STORAGE == "file":
+        return FileStorage(settings.FSM_FILE_PATH)
+    return MemoryStorage()
@@ -0,0 +1,100 @@
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Tuple
+from uuid import UUID
+
+from cachetools import TTLCache
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.app_config import settings
+from src.models.managers.event import EventManager
+from src.utils.geohash import cover, distance_km, encode
+
+# Users in one cell of this precision (~150 x 150 m) share cached results
+CACHE_PRECISION = 7
+
+
+@dataclass(frozen=True, slots=True)
+class NearbyEvent:
+    id: UUID
+    title: str
+    location: str
+    date_time: datetime
+    latitude: float
+    longitude: float
+
+
+class NearEventsCache:
+    """
+    Read-through grid cache of nearby upcoming events searches for hot regions.
+    Results are cached per geohash cell of the user (CACHE_PRECISION) and the
+    distances are recomputed for every user. Entries expire after `ttl`
+    seconds, writes of events call `invalidate` with the event geohash.
+    """
+
+    def __init__(
+        self,
+        radius_km: float = 10,
+        limit: int = 10,
+        maxsize: int = 1024,
+        ttl: float = 60,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.radius_km = radius_km
+        self.limit = limit
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl, timer=timer)
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, session: AsyncSession, latitude: float, longitude: float) -> List[Tuple[NearbyEvent, float]]:
+        """Nearby events with their distance in km, nearest first."""
+        cell = encode(latitude, longitude, CACHE_PRECISION)
+        entry = self._entries.get(cell)
+        if entry is not None:
+            self.hits += 1
+            _, events = entry
+        else:
+            self.misses += 1
+            rows = await EventManager.get_events_near(session, latitude, longitude, self.radius_km, self.limit)
+            events = tuple(
+                NearbyEvent(row.id, row.title, row.location, row.date_time, row.latitude, row.longitude) for row in rows
+            )
+            self._entries[cell] = (tuple(cover(latitude, longitude, self.radius_km)), events)
+
+        # Events that started since the entry was cached are dropped
+        now = datetime.now(timezone.utc)
+        nearby = [
+            (event, distance_km(latitude, longitude, event.latitude, event.longitude))
+            for event in events
+            if event.date_time >= now
+        ]
+        return sorted(
+            ((event, distance) for event, distance in nearby if distance <= self.radius_km),
+            key=lambda item: item[1],
+        )
+
+    def invalidate(self, geohash: str) -> None:
+        """Drops cached searches whose area contains the geohash."""
+        for cell, (area, _) in list(self._entries.items()):
+            if geohash.startswith(area):
+                self._entries.pop(cell, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / requests if requests else 0.0,
+            "size": len(self._entries),
+        }
+
+
+near_events_cache = NearEventsCache(
+    settings.NEAR_EVENTS_RADIUS_KM,
+    maxsize=settings.NEAR_EVENTS_CACHE_SIZE,
+    ttl=settings.NEAR_EVENTS_CACHE_TTL,
+)
@@ -0,0 +1,127 @@
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config.app_config import settings
+from src.config.database_config import async_session
+from src.models.managers.statistic import ScoreTotals, StatisticManager
+from src.services.logger import LoggerProvider
+from src.services.periodic import PeriodicTask
+
+log = LoggerProvider().get_logger(__name__)
+
+
+class TopK:
+    """
+    The `size` highest scores, kept sorted as (-score, key) so the top, the
+    score and the rank of a key are found with a bisect. Ties are ordered by key.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._entries: List[Tuple[int, UUID]] = []
+        self._scores: Dict[UUID, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def update(self, key: UUID, score: int) -> None:
+        """Sets the score of the key, keys falling out of the top are dropped."""
+        old = self._scores.pop(key, None)
+        if old is not None:
+            del self._entries[bisect_left(self._entries, (-old, key))]
+        entry = (-score, key)
+        if len(self._entries) >= self.size and entry > self._entries[-1]:
+            return
+        insort(self._entries, entry)
+        self._scores[key] = score
+        if len(self._entries) > self.size:
+            _, dropped = self._entries.pop()
+            del self._scores[dropped]
+
+    def top(self, limit: int) -> List[Tuple[UUID, int]]:
+        """(key, score) of the best `limit` keys."""
+        return [(key, -score) for score, key in self._entries[:limit]]
+
+    def rank(self, key: UUID) -> Optional[Tuple[int, int]]:
+        """(rank, score) of a key in the top, the rank is 1 + the number of higher scores."""
+        score = self._scores.get(key)
+        if score is None:
+            return None
+        return bisect_left(self._entries, (-score,)) + 1, score
+
+
+class Leaderboard(PeriodicTask):
+    """
+    In-memory top users by total score, overall and per category. It is
+    loaded from the score tables at startup and reloaded periodically, since
+    other processes record statistics too, and updated in place by `record()`.
+    Ranks of users outside the top are counted in the score tables.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = async_session,
+        size: int = 100,
+        refresh_interval: float = 60,
+    ):
+        super().__init__(refresh_interval)
+        self.session_factory = session_factory
+        self.size = size
+        self.overall = TopK(size)
+        self.categories: Dict[UUID, TopK] = {}
+
+    async def load(self) -> None:
+        """Reads the top of every leaderboard."""
+        async with self.session_factory() as session:
+            overall_rows = await StatisticManager.get_top_scores(session, self.size)
+            category_rows = await StatisticManager.get_category_top_scores(session, self.size)
+        overall = TopK(self.size)
+        for user_id, score in overall_rows:
+            overall.update(user_id, score)
+        categories: Dict[UUID, TopK] = {}
+        for category_id, user_id, score in category_rows:
+            categories.setdefault(category_id, TopK(self.size)).update(user_id, score)
+        self.overall, self.categories = overall, categories
+        log.info("Leaderboard loaded: %s users, %s categories", len(overall), len(categories))
+
+    def apply(self, totals: ScoreTotals) -> None:
+        """Puts the new totals of a user into the leaderboards."""
+        self.overall.update(totals.user_id, totals.total_score)
+        self.categories.setdefault(totals.category_id, TopK(self.size)).update(totals.user_id, totals.category_score)
+
+    async def record(
+        self, session: AsyncSession, user_id: UUID, event_id: UUID, score: int, rating: float
+    ) -> ScoreTotals:
+        """Records the statistic of the user and updates the leaderboards."""
+        totals = await StatisticManager.record_statistic(session, user_id, event_id, score, rating)
+        self.apply(totals)
+        return totals
+
+    def top(self, limit: int = 10, category_id: Optional[UUID] = None) -> List[Tuple[UUID, int]]:
+        """(user id, total score) of the best users, overall or in the category."""
+        board = self.overall if category_id is None else self.categories.get(category_id)
+        return board.top(limit) if board is not None else []
+
+    async def rank(
+        self, session: AsyncSession, user_id: UUID, category_id: Optional[UUID] = None
+    ) -> Optional[Tuple[int, int]]:
+        """(rank, total score) of the user, None without statistics. Users in the top need no query."""
+        board = self.overall if category_id is None else self.categories.get(category_id)
+        if board is not None:
+            rank = board.rank(user_id)
+            if rank is not None:
+                return rank
+        return await StatisticManager.get_rank(session, user_id, category_id)
+
+    async def start(self) -> None:
+        """Loads the leaderboards and starts the periodic reload."""
+        await self.load()
+        self.start_periodic()
+
+    async def tick(self) -> None:
+        await self.load()
+
+leaderboard = Leaderboard(size=settings.LEADERBOARD_SIZE, refresh_interval=settings.LEADERBOARD_REFRESH_INTERVAL)
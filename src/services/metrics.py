@@ -0,0 +1,141 @@
+import json
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT // 2
+
+
+class Histogram:
+    """
+    HDR-style histogram of integer values (microseconds).
+    Buckets are log-linear with 64 sub-buckets per power of two, so any
+    recorded value is reported with at most ~1.6% relative error while the
+    memory stays proportional to the number of distinct magnitudes.
+    """
+
+    def __init__(self):
+        self.counts: Dict[int, int] = defaultdict(int)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def _index(value: int) -> int:
+        if value < SUB_BUCKET_COUNT:
+            return value
+        shift = value.bit_length() - SUB_BUCKET_BITS
+        return shift * SUB_BUCKET_HALF + (value >> shift)
+
+    @staticmethod
+    def _value(index: int) -> int:
+        if index < SUB_BUCKET_COUNT:
+            return index
+        shift = index // SUB_BUCKET_HALF - 1
+        return (index - shift * SUB_BUCKET_HALF) << shift
+
+    def record(self, value: int) -> None:
+        value = max(0, int(value))
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, percent: float) -> int:
+        """Lowest bucket value at or below which `percent` of values fall."""
+        if not self.count:
+            return 0
+        threshold = self.count * percent / 100
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= threshold:
+                return self._value(index)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, p50/p95/p99 and max in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count / 1000, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(50) / 1000,
+            "p95_ms": self.percentile(95) / 1000,
+            "p99_ms": self.percentile(99) / 1000,
+            "max_ms": self.max / 1000,
+        }
+
+
+@dataclass
+class HandlerTiming:
+    """Time spent by the current handler in the database and Telegram API."""
+    db: float = 0.0
+    api: float = 0.0
+
+
+handler_timing: ContextVar[Optional[HandlerTiming]] = ContextVar("handler_timing", default=None)
+
+RouteKey = Tuple[str, str, str]
+
+
+class LatencyRecorder:
+    """Per-route (router, handler, FSM state) histograms of wall, DB and API time."""
+
+    def __init__(self):
+        self._routes: Dict[RouteKey, Dict[str, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: RouteKey, wall: float, timing: HandlerTiming) -> None:
+        with self._lock:
+            histograms = self._routes.get(key)
+            if histograms is None:
+                histograms = self._routes[key] = {"wall": Histogram(), "db": Histogram(), "api": Histogram()}
+            histograms["wall"].record(wall * 1_000_000)
+            histograms["db"].record(timing.db * 1_000_000)
+            histograms["api"].record(timing.api * 1_000_000)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Summaries of all routes, slowest p95 first."""
+        with self._lock:
+            rows = [
+                {
+                    "router": router,
+                    "handler": handler,
+                    "state": state,
+                    **{name: histogram.summary() for name, histogram in histograms.items()},
+                }
+                for (router, handler, state), histograms in self._routes.items()
+            ]
+        return sorted(rows, key=lambda row: row["wall"]["p95_ms"], reverse=True)
+
+    def dump(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"generated_at": time.time(), "routes": self.snapshot()}, file, indent=2)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+latency_recorder = LatencyRecorder()
+
+
+def track_db_time(engine: AsyncEngine) -> None:
+    """Adds statement execution time of the engine to the current handler timing."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_started"] = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        timing = handler_timing.get()
+        if timing is not None:
+            timing.db += time.perf_counter() - conn.info["query_started"]
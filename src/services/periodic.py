@@ -0,0 +1,40 @@
+import asyncio
+from typing import Optional
+
+from src.services.logger import LoggerProvider
+
+log = LoggerProvider().get_logger(__name__)
+
+
+class PeriodicTask:
+    """
+    Base of the services calling `tick()` every `interval` seconds in a
+    background task, from `start_periodic()` until `stop()`. A failing tick
+    is logged and retried on the next interval.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def tick(self) -> None:
+        raise NotImplementedError
+
+    def start_periodic(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            # Waits for the task to finish, its CancelledError is returned, not raised
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.tick()
+            except Exception as e:
+                log.warning("%s periodic task failed: %s", type(self).__name__, e)
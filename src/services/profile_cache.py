@@ -0,0 +1,89 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+from uuid import UUID
+
+from cachetools import TTLCache
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.app_config import settings
+from src.models.database_models import User
+
+
+@dataclass(frozen=True, slots=True)
+class UserProfile:
+    """Immutable snapshot of a user row, safe to share between updates and sessions."""
+    id: UUID
+    username: Optional[str]
+    role: Optional[str]
+    first_name: Optional[str]
+    last_name: Optional[str]
+    age: Optional[int]
+    experience: Optional[int]
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserProfile":
+        return cls(
+            id=user.id,
+            username=user.username,
+            role=user.role,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            age=user.age,
+            experience=user.experience,
+        )
+
+    @property
+    def is_registered(self) -> bool:
+        return bool(self.first_name or self.last_name or self.age or self.experience)
+
+
+class ProfileCache:
+    """
+    Read-through cache of user profiles.
+    Entries expire after `ttl` seconds and the least recently used one is
+    evicted when `maxsize` is reached. Every write to a user must call
+    `invalidate` (or `put` with the new row), which only reaches the cache of
+    the writing process. Other processes may hold the old profile until `ttl`
+    expires: shard workers (chats are sharded, not users, so a user writing
+    in a group and in private is served by two workers) and writes outside
+    the bot such as import_data.py. `ttl` bounds how stale a profile can be.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 300, timer: Callable[[], float] = time.monotonic):
+        self._profiles: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl, timer=timer)
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, session: AsyncSession, user_id: UUID) -> Optional[UserProfile]:
+        """Profile of the user, read from the database on a miss. Unknown users are not cached."""
+        profile = self._profiles.get(user_id)
+        if profile is not None:
+            self.hits += 1
+            return profile
+
+        self.misses += 1
+        user = await session.get(User, user_id)
+        return self.put(user) if user else None
+
+    def put(self, user: User) -> UserProfile:
+        profile = self._profiles[user.id] = UserProfile.from_user(user)
+        return profile
+
+    def invalidate(self, user_id: UUID) -> None:
+        self._profiles.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._profiles.clear()
+
+    def stats(self) -> Dict[str, float]:
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / requests if requests else 0.0,
+            "size": len(self._profiles),
+        }
+
+
+profile_cache = ProfileCache(settings.PROFILE_CACHE_SIZE, settings.PROFILE_CACHE_TTL)
@@ -0,0 +1,94 @@
+import time
+from typing import Callable, Optional
+
+from cachetools import TTLCache
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config.app_config import settings
+from src.config.database_config import replica_session
+from src.services.logger import LoggerProvider
+from src.services.periodic import PeriodicTask
+
+log = LoggerProvider().get_logger(__name__)
+
+# Seconds the replica is behind the primary, 0 when it replayed everything it received (or is a primary).
+# NULL (unavailable) when it is not streaming from the primary: a replica that lost its upstream has
+# replayed all it received and would report no lag while falling behind. Reading the receiver status
+# needs the pg_read_all_stats role, without it the replica is never used.
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN NOT EXISTS (SELECT FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+    " END"
+)
+
+
+class ReplicaRouter(PeriodicTask):
+    """
+    Decides whether a read-only handler may read from the replica.
+    The replica is used only while its measured lag is at most `max_lag`
+    seconds, and not for users who wrote in the last `sticky_seconds`, so
+    they always read their own writes. `sticky_seconds` should exceed
+    `max_lag` plus the lag check interval.
+    """
+
+    def __init__(
+        self,
+        replica: Optional[async_sessionmaker[AsyncSession]],
+        max_lag: float = 5.0,
+        sticky_seconds: float = 10.0,
+        check_interval: float = 2.0,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(check_interval)
+        self.replica = replica
+        self.max_lag = max_lag
+        self.lag: Optional[float] = None
+        self._recent_writers: TTLCache = TTLCache(maxsize=100000, ttl=sticky_seconds, timer=timer)
+
+    def mark_write(self, user_id: int) -> None:
+        self._recent_writers[user_id] = True
+
+    @property
+    def replica_available(self) -> bool:
+        return self.replica is not None and self.lag is not None and self.lag <= self.max_lag
+
+    def use_replica(self, user_id: Optional[int], read_only: bool) -> bool:
+        return read_only and self.replica_available and user_id not in self._recent_writers
+
+    async def check_lag(self) -> Optional[float]:
+        """
+        Measures the replica lag, it stays unknown (reads go to the primary)
+        if the replica is down or not streaming from the primary.
+        """
+        try:
+            async with self.replica() as session:
+                lag = (await session.execute(REPLICA_LAG_QUERY)).scalar()
+            self.lag = float(lag) if lag is not None else None
+            if self.lag is None:
+                log.warning("Replica is not streaming from the primary, reading from the primary")
+        except Exception as e:
+            log.warning("Failed to check replica lag: %s", e)
+            self.lag = None
+        if self.lag is not None and self.lag > self.max_lag:
+            log.warning("Replica lags %.1f s behind, reading from the primary", self.lag)
+        return self.lag
+
+    async def start(self) -> None:
+        if self.replica is None or self._task is not None:
+            return
+        await self.check_lag()
+        self.start_periodic()
+
+    async def tick(self) -> None:
+        await self.check_lag()
+
+replica_router = ReplicaRouter(
+    replica_session,
+    settings.REPLICA_MAX_LAG,
+    settings.REPLICA_STICKY_SECONDS,
+    settings.REPLICA_LAG_CHECK_INTERVAL,
+)
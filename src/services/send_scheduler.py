@@ -0,0 +1,178 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Deque, Dict, Iterator, Optional, Union
+
+from cachetools import LRUCache
+
+
+class Priority(IntEnum):
+    """Send lanes, lower value is served first."""
+    INTERACTIVE = 0
+    BULK = 1
+
+
+send_priority: ContextVar[Priority] = ContextVar("send_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def bulk_sending() -> Iterator[None]:
+    """Marks all messages sent inside the block as bulk (broadcasts, reminders)."""
+    token = send_priority.set(Priority.BULK)
+    try:
+        yield
+    finally:
+        send_priority.reset(token)
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously with `rate` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until one token is available."""
+        self._refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self) -> None:
+        self.tokens -= 1
+
+    def block(self, now: float, seconds: float) -> None:
+        """Stops granting tokens for `seconds` (Telegram retry_after)."""
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = 0
+
+
+@dataclass
+class LaneStats:
+    sent: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+
+
+@dataclass
+class Waiter:
+    chat_id: Optional[Union[int, str]]
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class SendScheduler:
+    """
+    Outbound send scheduler with global and per-chat token buckets.
+    Callers wait in priority lanes, interactive replies are granted before
+    bulk sends. A waiter whose chat is throttled does not block waiters of
+    other chats.
+    """
+
+    def __init__(self, global_rate: float = 30, chat_rate: float = 1, chat_burst: int = 3, max_chats: int = 10000):
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self._global = TokenBucket(global_rate, global_rate)
+        self._chats: LRUCache = LRUCache(maxsize=max_chats)
+        self._lanes: Dict[Priority, Deque[Waiter]] = {priority: deque() for priority in Priority}
+        self._stats: Dict[Priority, LaneStats] = {priority: LaneStats() for priority in Priority}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.requeued = 0
+
+    def _chat_bucket(self, chat_id: Union[int, str]) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            bucket = self._chats[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+        return bucket
+
+    async def acquire(self, chat_id: Optional[Union[int, str]], priority: Priority = Priority.INTERACTIVE) -> None:
+        """Waits until a message to the chat may be sent."""
+        waiter = Waiter(chat_id, asyncio.get_running_loop().create_future())
+        self._lanes[priority].append(waiter)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._wakeup.set()
+        await waiter.future
+
+    def penalize(self, chat_id: Optional[Union[int, str]], retry_after: float) -> None:
+        """Applies Telegram flood wait to the chat, or globally if chat is unknown."""
+        self.requeued += 1
+        bucket = self._global if chat_id is None else self._chat_bucket(chat_id)
+        bucket.block(time.monotonic(), retry_after)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Queue depth, sent count and wait time per lane."""
+        result = {}
+        for priority, stats in self._stats.items():
+            result[priority.name.lower()] = {
+                "queue_depth": len(self._lanes[priority]),
+                "sent": stats.sent,
+                "wait_avg": stats.wait_total / stats.sent if stats.sent else 0.0,
+                "wait_max": stats.wait_max,
+            }
+        result["requeued"] = {"count": self.requeued}
+        return result
+
+    def _grant(self, now: float) -> float:
+        """Grants at most one waiter, returns how long to sleep before the next try."""
+        global_delay = self._global.delay(now)
+        if global_delay > 0:
+            return global_delay
+
+        next_delay = float("inf")
+        for priority, lane in self._lanes.items():
+            for waiter in list(lane):
+                if waiter.future.done():
+                    lane.remove(waiter)
+                    continue
+                bucket = None if waiter.chat_id is None else self._chat_bucket(waiter.chat_id)
+                delay = bucket.delay(now) if bucket else 0.0
+                if delay > 0:
+                    next_delay = min(next_delay, delay)
+                    continue
+
+                lane.remove(waiter)
+                self._global.consume()
+                if bucket:
+                    bucket.consume()
+                waited = now - waiter.enqueued_at
+                stats = self._stats[priority]
+                stats.sent += 1
+                stats.wait_total += waited
+                stats.wait_max = max(stats.wait_max, waited)
+                waiter.future.set_result(None)
+                return 0.0
+        return next_delay
+
+    async def _run(self) -> None:
+        while True:
+            if not any(self._lanes.values()):
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            delay = self._grant(time.monotonic())
+            if delay == 0:
+                await asyncio.sleep(0)
+                continue
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), None if delay == float("inf") else delay)
+            except asyncio.TimeoutError:
+                pass
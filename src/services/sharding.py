@@ -0,0 +1,253 @@
+import asyncio
+import importlib
+import multiprocessing
+import queue as queue_module
+import zlib
+from typing import Any, Callable, Dict, List, Optional
+
+from aiogram import Bot
+from aiogram.types import Update
+from aiohttp import web
+
+from src.config.app_config import settings
+from src.services.logger import LoggerProvider
+from src.services.webhook import SECRET_HEADER, UpdateWorkerPool
+
+log = LoggerProvider().get_logger(__name__)
+
+CHAT_UPDATE_TYPES = (
+    "message",
+    "edited_message",
+    "channel_post",
+    "edited_channel_post",
+    "business_message",
+    "edited_business_message",
+    "callback_query",
+    "message_reaction",
+    "chat_member",
+    "my_chat_member",
+    "chat_join_request",
+)
+
+
+def raw_update_chat_id(update: Any) -> int:
+    """
+    Returns chat id of a raw (JSON) update without parsing it into models.
+    Falls back to the sender id and then to the update id.
+    :raises ValueError: if the update has no integer id to route it by.
+    """
+    if not isinstance(update, dict):
+        raise ValueError("Update is not a JSON object")
+    for update_type, event in update.items():
+        if not isinstance(event, dict):
+            continue
+        chat = event.get("chat")
+        if chat is None and update_type in CHAT_UPDATE_TYPES:
+            message = event.get("message")
+            chat = message.get("chat") if isinstance(message, dict) else None
+        if chat is not None:
+            return routing_id(chat)
+        sender = event.get("from") or event.get("user")
+        if sender is not None:
+            return routing_id(sender)
+    return routing_id(update, "update_id")
+
+
+def routing_id(entity: Any, key: str = "id") -> int:
+    """Integer id of a chat, user or update, ValueError for anything else."""
+    value = entity.get(key) if isinstance(entity, dict) else None
+    if not isinstance(value, int):
+        raise ValueError(f"Update has no integer {key} to route by")
+    return value
+
+
+def shard_index(chat_id: int, shards: int) -> int:
+    """Stable shard index of the chat, the same in every process."""
+    return zlib.crc32(chat_id.to_bytes(8, "little", signed=True)) % shards
+
+
+def load_object(path: str) -> Callable:
+    """Imports an object by 'module:attribute' path."""
+    module_name, attribute = path.split(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def run_shard_worker(
+    index: int,
+    updates: multiprocessing.Queue,
+    ready: Any,
+    dispatcher_factory: str,
+    bot_factory: str,
+    concurrency: int,
+    workers: int,
+) -> None:
+    """Entry point of a worker process."""
+    asyncio.run(_shard_worker(index, updates, ready, dispatcher_factory, bot_factory, concurrency, workers))
+
+
+async def _shard_worker(
+    index: int,
+    updates: multiprocessing.Queue,
+    ready: Any,
+    dispatcher_factory: str,
+    bot_factory: str,
+    concurrency: int,
+    workers: int,
+) -> None:
+    dispatcher = load_object(dispatcher_factory)()
+    # Workers send messages in parallel, each gets its share of the global send rate
+    bot = load_object(bot_factory)(processes=workers)
+    pool = UpdateWorkerPool(dispatcher, bot, concurrency, concurrency * 4)
+    loop = asyncio.get_running_loop()
+
+    await dispatcher.emit_startup(bot=bot, dispatcher=dispatcher, **dispatcher.workflow_data)
+    pool.start()
+    ready.set()
+    log.info("Shard worker %s started", index)
+
+    running = True
+    while running:
+        batch = [await loop.run_in_executor(None, updates.get)]
+        try:
+            while len(batch) < concurrency:
+                batch.append(updates.get_nowait())
+        except queue_module.Empty:
+            pass
+
+        for data in batch:
+            if data is None:
+                running = False
+                break
+            try:
+                update = Update.model_validate(data, context={"bot": bot})
+            except ValueError as e:
+                log.warning("Skipping malformed update %s: %s", data.get("update_id"), e)
+                continue
+            await pool.submit(update, timeout=None)
+
+    await pool.stop()
+    await dispatcher.emit_shutdown(bot=bot, dispatcher=dispatcher, **dispatcher.workflow_data)
+    await bot.session.close()
+    log.info("Shard worker %s stopped, processed %s updates", index, pool.processed)
+
+
+class ShardSupervisor:
+    """
+    Runs N worker processes and routes updates to them by chat id.
+    Every chat always lands on the same worker, so FSM conversations keep
+    their order, while different chats are processed on different cores.
+    `bot_factory` is called with `processes`, the number of workers sharing
+    the global send rate.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        dispatcher_factory: str = "main:create_dispatcher",
+        bot_factory: str = "main:create_bot",
+        queue_size: int = 1000,
+        concurrency: int = 8,
+    ):
+        context = multiprocessing.get_context("spawn")
+        self._queues: List[multiprocessing.Queue] = [context.Queue(maxsize=queue_size) for _ in range(workers)]
+        self._ready = [context.Event() for _ in range(workers)]
+        self._processes = [
+            context.Process(
+                target=run_shard_worker,
+                args=(
+                    index, self._queues[index], self._ready[index], dispatcher_factory, bot_factory, concurrency,
+                    workers,
+                ),
+                name=f"shard-{index}",
+                daemon=True,
+            )
+            for index in range(workers)
+        ]
+
+    def start(self, timeout: Optional[float] = 60.0) -> None:
+        """Starts worker processes and waits until they are ready."""
+        for process in self._processes:
+            process.start()
+        for ready in self._ready:
+            if not ready.wait(timeout):
+                raise RuntimeError("Shard worker did not start in time")
+
+    def stop(self) -> None:
+        """Lets workers finish queued updates and waits for them to exit."""
+        for updates in self._queues:
+            updates.put(None)
+        for process in self._processes:
+            process.join()
+
+    async def dispatch(self, update: Dict[str, Any], timeout: Optional[float] = None) -> bool:
+        """
+        Routes a raw update to its worker.
+        :return: False if the worker queue stayed full for `timeout` seconds.
+        """
+        updates = self._queues[shard_index(raw_update_chat_id(update), len(self._queues))]
+        try:
+            updates.put_nowait(update)
+        except queue_module.Full:
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, updates.put, update, True, timeout)
+            except queue_module.Full:
+                return False
+        return True
+
+    async def run_polling(self, bot: Bot, allowed_updates: Optional[List[str]] = None, polling_timeout: int = 30) -> None:
+        """Long-polls Telegram and routes updates to workers."""
+        offset = None
+        while True:
+            try:
+                updates = await bot.get_updates(
+                    offset=offset,
+                    timeout=polling_timeout,
+                    allowed_updates=allowed_updates,
+                    request_timeout=polling_timeout + 10,
+                )
+            except Exception as e:
+                log.warning("Failed to fetch updates: %s", e)
+                await asyncio.sleep(1)
+                continue
+
+            for update in updates:
+                offset = update.update_id + 1
+                await self.dispatch(update.model_dump(mode="json", by_alias=True, exclude_none=True))
+
+    async def handle_update(self, request: web.Request) -> web.Response:
+        """
+        Routes a webhook update to its worker without parsing it.
+        Only what routing needs is checked here, the worker validates the rest;
+        a body that cannot be routed is answered with 400.
+        """
+        if settings.WEBHOOK_SECRET and request.headers.get(SECRET_HEADER) != settings.WEBHOOK_SECRET:
+            return web.Response(status=401)
+        try:
+            update = await request.json()
+            dispatched = await self.dispatch(update, settings.WEBHOOK_ENQUEUE_TIMEOUT)
+        except ValueError:
+            return web.Response(status=400)
+        if not dispatched:
+            return web.Response(status=503, headers={"Retry-After": "1"})
+        return web.Response()
+
+    async def run_webhook(self, bot: Bot, allowed_updates: Optional[List[str]] = None) -> None:
+        """Accepts webhook updates and routes them to workers without parsing."""
+        app = web.Application()
+        app.router.add_post(settings.WEBHOOK_PATH, self.handle_update)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, settings.WEBAPP_HOST, settings.WEBAPP_PORT).start()
+
+        if settings.WEBHOOK_URL:
+            await bot.set_webhook(
+                url=settings.WEBHOOK_URL.rstrip("/") + settings.WEBHOOK_PATH,
+                secret_token=settings.WEBHOOK_SECRET,
+                allowed_updates=allowed_updates,
+            )
+
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await runner.cleanup()
@@ -3,6 +3,7 @@ from typing import Optional
 from sqlalchemy.exc import SQLAlchemyError
 from src.config.database_config import get_async_session
 from src.models.managers.user import UserManager
+from src.services.profile_cache import UserProfile, profile_cache
 from src.functionality.user.schemes import UserSchema
 
 
@@ -10,25 +11,40 @@ class UserService:
     """Сервис для работы с пользователем."""
 
     @staticmethod
-    async def get_or_create_user(user_id: str, username: Optional[str] = None):
-        """Получить или создать пользователя."""
+    async def get_or_create_user(user_id: str, username: Optional[str] = None) -> UserProfile:
+        """Получить (из кэша профилей) или создать пользователя."""
         async with get_async_session() as session:
             try:
-                user = await UserManager.get_user(session, user_id)
-                if not user:
+                profile = await profile_cache.get(session, user_id)
+                if not profile:
                     user = await UserManager.create_user(session, user_id, username)
-                return user
+                    profile = profile_cache.put(user)
+                return profile
             except SQLAlchemyError as e:
                 raise RuntimeError(f"Ошибка работы с БД: {str(e)}")
 
+    @staticmethod
+    async def save_profile(user_id: str, username: Optional[str] = None, **fields):
+        """
+        Создать пользователя или обновить любые поля профиля одним запросом,
+        записываются только изменившиеся поля.
+        :return: User | None — созданный или измененный пользователь, None если ничего не изменилось.
+        """
+        try:
+            profile = UserSchema(**fields)
+        except ValueError as e:
+            raise ValueError(f"Ошибка валидации данных: {e}")
+        async with get_async_session() as session:
+            return await UserManager.upsert_profile(session, user_id, profile, username)
+
     @staticmethod
     async def update_user_field(user_id: str, field: str, value):
-        """Обновить определенное поле пользователя."""
+        """Обновить определенное поле существующего пользователя."""
+        if field not in UserSchema.model_fields:
+            raise ValueError(f"Поле '{field}' нельзя изменить.")
+        try:
+            validated_data = UserSchema(**{field: value})
+        except ValueError as e:
+            raise ValueError(f"Ошибка валидации данных: {e}")
         async with get_async_session() as session:
-            try:
-                validated_data = UserSchema(**{field: value})
-                return await UserManager.update_user(session, user_id, field, validated_data.dict()[field])
-            except ValueError as e:
-                raise ValueError(f"Ошибка валидации данных: {e}")
-            except SQLAlchemyError as e:
-                raise RuntimeError(f"Ошибка работы с БД: {str(e)}")
+            return await UserManager.update_user(session, user_id, field, getattr(validated_data, field))
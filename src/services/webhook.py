@@ -0,0 +1,179 @@
+import asyncio
+from typing import List, Optional
+
+from aiogram import Bot, Dispatcher
+from aiogram.dispatcher.middlewares.user_context import UserContextMiddleware
+from aiogram.types import Update
+from aiogram.webhook.aiohttp_server import setup_application
+from aiohttp import web
+
+from src.config.app_config import settings
+from src.services.logger import LoggerProvider
+
+log = LoggerProvider().get_logger(__name__)
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+def update_chat_id(update: Update) -> int:
+    """
+    Returns the key an update is routed by.
+    Chat id when the update belongs to a chat, otherwise the user id,
+    otherwise the update id itself.
+    """
+    context = UserContextMiddleware.resolve_event_context(update)
+    if context.chat_id is not None:
+        return context.chat_id
+    if context.user_id is not None:
+        return context.user_id
+    return update.update_id
+
+
+class UpdateWorkerPool:
+    """
+    Bounded pool of workers feeding updates into the dispatcher.
+    Every worker owns its own queue and updates are routed to a worker by
+    chat, so the updates of one chat are processed in order while
+    different chats are processed concurrently.
+    """
+
+    def __init__(self, dispatcher: Dispatcher, bot: Bot, workers: int, queue_size: int):
+        self.dispatcher = dispatcher
+        self.bot = bot
+        per_worker = max(1, queue_size // workers)
+        self._queues: List[asyncio.Queue] = [asyncio.Queue(maxsize=per_worker) for _ in range(workers)]
+        self._tasks: List[asyncio.Task] = []
+        self.processed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Number of updates waiting in the queues."""
+        return sum(queue.qsize() for queue in self._queues)
+
+    def start(self) -> None:
+        """Starts worker tasks."""
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._worker(queue)) for queue in self._queues]
+
+    async def stop(self) -> None:
+        """Waits until accepted updates are processed and stops workers."""
+        for queue in self._queues:
+            await queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, update: Update, timeout: Optional[float] = 0.0) -> bool:
+        """
+        Puts the update into the queue of its worker.
+        :param update: Update to process.
+        :param timeout: How long to wait for a free slot, in seconds, None waits forever.
+        :return: False if the queue stayed full (backpressure), True otherwise.
+        """
+        queue = self._queues[update_chat_id(update) % len(self._queues)]
+        try:
+            if timeout is None:
+                await queue.put(update)
+            elif timeout > 0:
+                await asyncio.wait_for(queue.put(update), timeout)
+            else:
+                queue.put_nowait(update)
+        except (asyncio.QueueFull, asyncio.TimeoutError):
+            self.rejected += 1
+            return False
+        return True
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            update = await queue.get()
+            try:
+                await self.dispatcher.feed_update(self.bot, update)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                log.error("Failed to process update %s: %s", update.update_id, e)
+            finally:
+                queue.task_done()
+
+
+POOL_KEY = web.AppKey("pool", UpdateWorkerPool)
+
+
+def create_webhook_app(
+    dispatcher: Dispatcher,
+    bot: Bot,
+    pool: UpdateWorkerPool,
+    secret: Optional[str] = None,
+    path: str = "/webhook",
+    enqueue_timeout: float = 0.0,
+) -> web.Application:
+    """
+    Builds aiohttp application accepting webhook updates.
+    Updates are acknowledged as soon as they are queued. When the queue is
+    full the request is answered with 503, so Telegram redelivers it later.
+    A body that is not a valid update is answered with 400.
+    """
+
+    async def handle_update(request: web.Request) -> web.Response:
+        if secret and request.headers.get(SECRET_HEADER) != secret:
+            return web.Response(status=401)
+
+        try:
+            update = Update.model_validate(await request.json(), context={"bot": bot})
+        except ValueError:
+            # Not JSON or not an update, redelivery would fail the same way
+            return web.Response(status=400)
+        if not await pool.submit(update, enqueue_timeout):
+            log.warning("Update queue is full, rejecting update %s", update.update_id)
+            return web.Response(status=503, headers={"Retry-After": "1"})
+        return web.Response()
+
+    async def on_startup(app: web.Application) -> None:
+        pool.start()
+
+    async def on_cleanup(app: web.Application) -> None:
+        await pool.stop()
+
+    app = web.Application()
+    app[POOL_KEY] = pool
+    app.router.add_post(path, handle_update)
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    setup_application(app, dispatcher, bot=bot)
+    return app
+
+
+async def run_webhook(dispatcher: Dispatcher, bot: Bot) -> None:
+    """Runs the bot in webhook mode using settings."""
+    pool = UpdateWorkerPool(dispatcher, bot, settings.WEBHOOK_WORKERS, settings.WEBHOOK_QUEUE_SIZE)
+    app = create_webhook_app(
+        dispatcher,
+        bot,
+        pool,
+        secret=settings.WEBHOOK_SECRET,
+        path=settings.WEBHOOK_PATH,
+        enqueue_timeout=settings.WEBHOOK_ENQUEUE_TIMEOUT,
+    )
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, settings.WEBAPP_HOST, settings.WEBAPP_PORT)
+    await site.start()
+    log.info("Webhook server started on %s:%s", settings.WEBAPP_HOST, settings.WEBAPP_PORT)
+
+    if settings.WEBHOOK_URL:
+        await bot.set_webhook(
+            url=settings.WEBHOOK_URL.rstrip("/") + settings.WEBHOOK_PATH,
+            secret_token=settings.WEBHOOK_SECRET,
+            allowed_updates=dispatcher.resolve_used_update_types(),
+        )
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+        await bot.session.close()
@@ -0,0 +1,117 @@
+import asyncio
+from collections import defaultdict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Type
+
+from sqlalchemy import Table, insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.config.app_config import settings
+from src.config.database_config import async_engine
+from src.models.database_models import Base
+from src.services.logger import LoggerProvider
+
+log = LoggerProvider().get_logger(__name__)
+
+Row = Dict[str, Any]
+BatchKey = Tuple[Table, FrozenSet[str]]
+
+
+class WriteBehindBuffer:
+    """
+    Write-behind buffer for append-only tables (feedback and the like).
+    Rows are collected and written with one multi-row INSERT per table once
+    `max_rows` rows are pending or `max_delay` seconds after the first one.
+    `add()` returns only after the row is committed, so callers acknowledge
+    durable writes. A failing batch is retried row by row, so one bad row
+    fails only its own `add()`. `close()` flushes what is pending, rows
+    added later (updates still draining on shutdown) are written at once.
+    """
+
+    def __init__(self, engine: AsyncEngine, max_rows: int = 100, max_delay: float = 0.05):
+        self.engine = engine
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.closed = False
+        self._pending: Dict[BatchKey, List[Tuple[Row, asyncio.Future]]] = defaultdict(list)
+        self._size = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: set = set()
+
+    async def add(self, model: Type[Base], values: Row) -> Row:
+        """
+        Queues the row and waits until it is written.
+        :return: inserted values including the generated id
+        """
+        table = model.__table__
+        if "id" not in values and table.c.id.default is not None:
+            # The client side default, so the caller gets the id without RETURNING
+            values = {"id": table.c.id.default.arg(None), **values}
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[(table, frozenset(values))].append((values, future))
+        self._size += 1
+        if self.closed or self._size >= self.max_rows:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._start_flush)
+        await future
+        return values
+
+    def _start_flush(self) -> None:
+        task = asyncio.create_task(self.flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def flush(self) -> None:
+        """Writes all pending rows."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batches, self._pending, self._size = self._pending, defaultdict(list), 0
+        for (table, _), rows in batches.items():
+            try:
+                await self._insert(table, [values for values, _ in rows])
+            except DBAPIError as e:
+                if len(rows) == 1:
+                    self._resolve(rows, e)
+                    continue
+                log.warning("Batch insert into %s failed, retrying %s rows one by one: %s", table.name, len(rows), e)
+                for row in rows:
+                    try:
+                        await self._insert(table, [row[0]])
+                        self._resolve([row])
+                    except DBAPIError as row_error:
+                        self._resolve([row], row_error)
+            except Exception as e:
+                self._resolve(rows, e)
+            else:
+                self._resolve(rows)
+
+    async def _insert(self, table: Table, rows: List[Row]) -> None:
+        async with self.engine.begin() as connection:
+            await connection.execute(insert(table).values(rows))
+
+    @staticmethod
+    def _resolve(rows: List[Tuple[Row, asyncio.Future]], error: Optional[Exception] = None) -> None:
+        for _, future in rows:
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+    async def close(self) -> None:
+        """Writes the pending rows and stops batching (dispatcher shutdown)."""
+        self.closed = True
+        await asyncio.gather(*self._flushes, return_exceptions=True)
+        await self.flush()
+
+
+write_buffer = WriteBehindBuffer(
+    async_engine,
+    settings.WRITE_BEHIND_MAX_ROWS,
+    settings.WRITE_BEHIND_MAX_DELAY_MS / 1000,
+)
@@ -0,0 +1,42 @@
+from datetime import datetime, time, timedelta
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from src.config.app_config import settings
+
+# Format of event dates entered in and shown by the bot
+DATE_TIME_FORMAT = "%d.%m.%Y %H:%M"
+
+LOCAL_TIMEZONE = ZoneInfo(settings.TIMEZONE)
+
+SATURDAY = 5
+
+
+def parse_local(text: str) -> datetime:
+    """Aware datetime of a DATE_TIME_FORMAT string in the bot time zone, raises ValueError."""
+    return datetime.strptime(text.strip(), DATE_TIME_FORMAT).replace(tzinfo=LOCAL_TIMEZONE)
+
+
+def as_local(value: datetime) -> datetime:
+    """The datetime in the bot time zone, naive ones are taken as local."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=LOCAL_TIMEZONE)
+    return value.astimezone(LOCAL_TIMEZONE)
+
+
+def format_local(value: datetime) -> str:
+    return as_local(value).strftime(DATE_TIME_FORMAT)
+
+
+def weekend(now: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+    """
+    [start, end) of the current or next weekend in the bot time zone, from
+    Saturday 00:00 to Monday 00:00. During the weekend it starts at `now`.
+    """
+    now = as_local(now or datetime.now(LOCAL_TIMEZONE))
+    saturday = now.date() + timedelta(days=(SATURDAY - now.weekday()) % 7)
+    if now.weekday() > SATURDAY:
+        saturday -= timedelta(days=7)
+    start = datetime.combine(saturday, time(), LOCAL_TIMEZONE)
+    end = datetime.combine(saturday + timedelta(days=2), time(), LOCAL_TIMEZONE)
+    return max(start, now), end
@@ -0,0 +1,99 @@
+import math
+from typing import List, Tuple
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+DECODE = {char: index for index, char in enumerate(BASE32)}
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 2 * math.pi * EARTH_RADIUS_KM / 360
+
+MAX_PRECISION = 12
+
+BoundingBox = Tuple[float, float, float, float]
+
+
+def encode(latitude: float, longitude: float, precision: int = MAX_PRECISION) -> str:
+    """Geohash of the point, points in one cell share the geohash as a prefix."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits, value, even = 0, 0, True
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        if coordinate >= middle:
+            value = value << 1 | 1
+            interval[0] = middle
+        else:
+            value <<= 1
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def bounding_box(geohash: str) -> BoundingBox:
+    """(min latitude, min longitude, max latitude, max longitude) of the cell."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = DECODE[char]
+        for shift in range(4, -1, -1):
+            interval = lon_range if even else lat_range
+            middle = (interval[0] + interval[1]) / 2
+            if value >> shift & 1:
+                interval[0] = middle
+            else:
+                interval[1] = middle
+            even = not even
+    return lat_range[0], lon_range[0], lat_range[1], lon_range[1]
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """(height, width) of cells of the precision in degrees."""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180 / 2 ** lat_bits, 360 / 2 ** lon_bits
+
+
+def precision_for_radius(radius_km: float, latitude: float = 0.0) -> int:
+    """Highest precision whose cells are at least `radius_km` wide and high, so 3x3 cells cover the circle."""
+    for precision in range(MAX_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        width_km = width * KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01)
+        if min(height * KM_PER_DEGREE, width_km) >= radius_km:
+            return precision
+    return 1
+
+
+def neighborhood(geohash: str) -> List[str]:
+    """The cell and its (up to) 8 neighbours, across the antimeridian but not over the poles."""
+    min_lat, min_lon, max_lat, max_lon = bounding_box(geohash)
+    height, width = max_lat - min_lat, max_lon - min_lon
+    center_lat, center_lon = (min_lat + max_lat) / 2, (min_lon + max_lon) / 2
+    cells = []
+    for lat_step in (-1, 0, 1):
+        latitude = center_lat + lat_step * height
+        if not -90 < latitude < 90:
+            continue
+        for lon_step in (-1, 0, 1):
+            longitude = (center_lon + lon_step * width + 180) % 360 - 180
+            cell = encode(latitude, longitude, len(geohash))
+            if cell not in cells:
+                cells.append(cell)
+    return cells
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle (haversine) distance."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi, d_lambda = phi2 - phi1, math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def cover(latitude: float, longitude: float, radius_km: float) -> List[str]:
+    """Geohash cells whose union covers the circle around the point."""
+    return neighborhood(encode(latitude, longitude, precision_for_radius(radius_km, latitude)))
@@ -1,6 +1,48 @@
+import os
+import threading
+import time
 from uuid import UUID
 
+# (unix ms, sequence) of the last UUIDv7 made by this process
+_uuid7_state = (0, 0)
+_uuid7_lock = threading.Lock()
+
 
 def convert_telegram_id_to_uuid(telegram_id: int) -> UUID:
     """Convert Telegram ID to UUID."""
     return UUID(int=telegram_id, version=4)
+
+
+def shorten(text: str, limit: int) -> str:
+    """Cut text to `limit` characters, marking the cut with an ellipsis."""
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def convert_uuid_to_telegram_id(user_id: UUID) -> int:
+    """Reverse of :func:`convert_telegram_id_to_uuid` for Telegram ids (below 2**52)."""
+    # Drops the version and variant bits set by the conversion
+    return user_id.int & (2 ** 62 - 1)
+
+
+def uuid7() -> UUID:
+    """
+    Time-ordered UUID version 7 (RFC 9562): 48 bits of Unix time in milliseconds,
+    a 12 bit sequence and 62 random bits. New ids sort after older ones, so
+    inserts append to the right edge of primary key indexes instead of landing
+    on random pages. The sequence starts at a random value every millisecond and
+    is incremented within it, so ids of one process are strictly increasing.
+    """
+    global _uuid7_state
+    with _uuid7_lock:
+        milliseconds = time.time_ns() // 1_000_000
+        last_milliseconds, sequence = _uuid7_state
+        if milliseconds > last_milliseconds:
+            # Half of the range is left for ids made later in this millisecond
+            sequence = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            milliseconds, sequence = last_milliseconds, sequence + 1
+            if sequence > 0xFFF:
+                milliseconds, sequence = milliseconds + 1, 0
+        _uuid7_state = (milliseconds, sequence)
+    random_bits = int.from_bytes(os.urandom(8), "big") & (2 ** 62 - 1)
+    return UUID(int=milliseconds << 80 | 0x7 << 76 | sequence << 64 | 0b10 << 62 | random_bits)
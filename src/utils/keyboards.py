@@ -0,0 +1,142 @@
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Sequence, Tuple
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.methods import TelegramMethod
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+from aiohttp import FormData
+from cachetools import LRUCache
+from pydantic import ConfigDict, PrivateAttr
+
+Button = Tuple[str, str]
+
+
+class PreparedKeyboardMarkup(InlineKeyboardMarkup):
+    """Immutable inline keyboard which is serialized to JSON only once."""
+
+    model_config = ConfigDict(frozen=True)
+
+    _serialized: Optional[str] = PrivateAttr(default=None)
+
+    def serialized(self, json_dumps: Callable[..., str]) -> str:
+        if self._serialized is None:
+            self._serialized = json_dumps(self.model_dump(exclude_none=True))
+        return self._serialized
+
+
+def build_markup(buttons: Iterable[Button], width: int = 2) -> PreparedKeyboardMarkup:
+    """Lays out (text, callback_data) pairs in rows of `width` buttons."""
+    buttons = [InlineKeyboardButton(text=text, callback_data=callback_data) for text, callback_data in buttons]
+    rows = [buttons[index:index + width] for index in range(0, len(buttons), width)]
+    return PreparedKeyboardMarkup(inline_keyboard=rows)
+
+
+class KeyboardRegistry:
+    """
+    Static keyboards are built once at import time and shared by all updates.
+    Dynamic keyboards are cached by (name, data version) and rebuilt only when
+    the version changes.
+    """
+
+    def __init__(self, max_dynamic: int = 1024):
+        self._static: Dict[str, PreparedKeyboardMarkup] = {}
+        self._dynamic: LRUCache = LRUCache(maxsize=max_dynamic)
+        self.hits = 0
+        self.misses = 0
+
+    def register(self, name: str, buttons: Sequence[Button], width: int = 2) -> PreparedKeyboardMarkup:
+        markup = self._static[name] = build_markup(buttons, width)
+        return markup
+
+    def get(self, name: str) -> PreparedKeyboardMarkup:
+        return self._static[name]
+
+    def dynamic(
+        self,
+        name: str,
+        version: Hashable,
+        buttons: Callable[[], Iterable[Button]],
+        width: int = 2,
+    ) -> PreparedKeyboardMarkup:
+        """
+        Returns the cached markup of the keyboard for this data version.
+        :param buttons: called only on a cache miss
+        """
+        key = (name, version)
+        markup = self._dynamic.get(key)
+        if markup is None:
+            self.misses += 1
+            markup = self._dynamic[key] = build_markup(buttons(), width)
+        else:
+            self.hits += 1
+        return markup
+
+    def invalidate(self, name: str) -> None:
+        """Drops all cached versions of the dynamic keyboard."""
+        for key in [key for key in self._dynamic if key[0] == name]:
+            del self._dynamic[key]
+
+
+class PreparedMarkupSession(AiohttpSession):
+    """Sends prepared keyboards as their cached JSON instead of dumping them again."""
+
+    def build_form_data(self, bot: Bot, method: TelegramMethod[Any]) -> FormData:
+        markup = getattr(method, "reply_markup", None)
+        if not isinstance(markup, PreparedKeyboardMarkup):
+            return super().build_form_data(bot, method)
+        form = super().build_form_data(bot, method.model_copy(update={"reply_markup": None}))
+        form.add_field("reply_markup", markup.serialized(self.json_dumps))
+        return form
+
+
+keyboards = KeyboardRegistry()
+
+MAIN_MENU = keyboards.register(
+    "main_menu",
+    [
+        ("🔍 View Profile", "view_profile"),
+        ("✏️ Edit Profile", "edit_profile"),
+        # Event section
+        ("🎉 Create Event", "create_event"),
+        ("📝 View Events", "view_events"),
+        ("🔧 Edit Event", "edit_event"),
+        ("❌ Delete Event", "delete_event"),
+        # Team section
+        ("👥 Create Team", "create_team"),
+        ("🔎 View Teams", "view_teams"),
+        ("🛠 Edit Team", "edit_team"),
+        ("🗑 Delete Team", "delete_team"),
+        # Feedback section
+        ("💬 Create Feedback", "create_feedback"),
+        ("🔍 View Feedback", "view_feedback"),
+        # Settings and miscellaneous
+        ("⚙️ Settings", "settings"),
+        ("📜 Show Commands", "show_commands"),
+        ("🧹 Clear State", "clear"),
+    ],
+)
+
+START_MENU = keyboards.register(
+    "start_menu",
+    [
+        ("View Profile", "view_profile"),
+        ("Edit Profile", "edit_profile"),
+        ("Create Event", "create_event"),
+        ("View Events", "view_events"),
+        ("Edit Event", "edit_event"),
+        ("Delete Event", "delete_event"),
+        ("Create RSVP", "create_rsvp"),
+        ("View RSVP", "view_rsvp"),
+        ("Edit RSVP", "edit_rsvp"),
+        ("Delete RSVP", "delete_rsvp"),
+        ("Create Team", "create_team"),
+        ("View Teams", "view_teams"),
+        ("Edit Team", "edit_team"),
+        ("Delete Team", "delete_team"),
+        ("Create Feedback", "create_feedback"),
+        ("View Feedback", "view_feedback"),
+        ("Show Commands", "show_commands"),
+        ("Clear State", "clear"),
+        ("Settings", "settings"),
+    ],
+)
@@ -0,0 +1,97 @@
+import base64
+import struct
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from aiogram.filters.callback_data import CallbackData
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.utils.keyboards import PreparedKeyboardMarkup, build_markup
+
+PAGE_SIZE = 5
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+Cursor = Tuple[datetime, UUID]
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """Packs (created_at, id) into 32 url-safe characters."""
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    micros = (created_at - EPOCH) // timedelta(microseconds=1)
+    return base64.urlsafe_b64encode(struct.pack(">q", micros) + id.bytes).decode()
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    raw = base64.urlsafe_b64decode(cursor)
+    (micros,) = struct.unpack(">q", raw[:8])
+    return EPOCH + timedelta(microseconds=micros), UUID(bytes=raw[8:])
+
+
+class PageCallback(CallbackData, prefix="page"):
+    """Next/Prev button of a list view, `forward` tells which side of the cursor to read."""
+    view: str
+    number: int
+    forward: bool
+    cursor: str
+
+
+@dataclass
+class Page:
+    rows: Sequence[Any]
+    number: int
+    has_prev: bool
+    has_next: bool
+
+    @property
+    def offset(self) -> int:
+        """Position of the first row in the whole list."""
+        return self.number * PAGE_SIZE
+
+
+async def fetch_page(
+    session: AsyncSession,
+    statement: Select,
+    key: Tuple[Any, Any],
+    callback_data: Optional[PageCallback] = None,
+    limit: int = PAGE_SIZE,
+) -> Page:
+    """
+    Reads one page of `statement` ordered by the `key` columns (created_at, id).
+    Rows must expose `created_at` and `id`. Only limit + 1 rows are read, so the
+    cost of a page doesn't depend on the table size.
+    """
+    forward = callback_data is None or callback_data.forward
+    if callback_data is not None:
+        statement = statement.where(
+            tuple_(*key) > decode_cursor(callback_data.cursor)
+            if forward else tuple_(*key) < decode_cursor(callback_data.cursor)
+        )
+    order = key if forward else tuple(column.desc() for column in key)
+    rows: List[Any] = list((await session.execute(statement.order_by(*order).limit(limit + 1))).all())
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if forward:
+        return Page(rows, callback_data.number if callback_data else 0, callback_data is not None, has_more)
+    rows.reverse()
+    return Page(rows, callback_data.number, has_more, True)
+
+
+def page_markup(view: str, page: Page) -> Optional[PreparedKeyboardMarkup]:
+    """Prev/Next buttons carrying the cursors of the first and last rows."""
+    buttons = []
+    if page.has_prev and page.rows:
+        first = page.rows[0]
+        buttons.append(("⬅️ Prev", PageCallback(
+            view=view, number=page.number - 1, forward=False, cursor=encode_cursor(first.created_at, first.id)
+        ).pack()))
+    if page.has_next and page.rows:
+        last = page.rows[-1]
+        buttons.append(("Next ➡️", PageCallback(
+            view=view, number=page.number + 1, forward=True, cursor=encode_cursor(last.created_at, last.id)
+        ).pack()))
+    return build_markup(buttons) if buttons else None
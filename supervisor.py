@@ -0,0 +1,33 @@
+import logging
+import asyncio
+
+from main import create_bot, create_dispatcher
+from src.config.app_config import settings
+from src.services.sharding import ShardSupervisor
+
+
+async def main():
+    """Entry point running the bot in several chat-sharded worker processes."""
+    logging.basicConfig(level=logging.INFO)
+
+    supervisor = ShardSupervisor(
+        settings.SHARD_WORKERS,
+        queue_size=settings.SHARD_QUEUE_SIZE,
+        concurrency=settings.SHARD_CONCURRENCY,
+    )
+    supervisor.start()
+
+    bot = create_bot()
+    allowed_updates = create_dispatcher().resolve_used_update_types()
+
+    try:
+        if settings.BOT_MODE == "webhook":
+            await supervisor.run_webhook(bot, allowed_updates)
+        else:
+            await supervisor.run_polling(bot, allowed_updates)
+    finally:
+        await bot.session.close()
+        supervisor.stop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,40 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.engine import URL
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.config.app_config import settings
+from src.middlewares.database import track_statements
+
+
+@pytest.fixture
+async def db_engine():
+    """Engine of the migrated test database, tests are skipped if it is not reachable."""
+    engine = create_async_engine(URL.create(**settings.get_db_creds))
+    try:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+    except (OSError, DBAPIError) as e:
+        await engine.dispose()
+        pytest.skip(f"Database is not available: {e}")
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db_connection(db_engine):
+    """Connection inside a transaction which is rolled back after the test."""
+    async with db_engine.connect() as connection:
+        transaction = await connection.begin()
+        yield connection
+        await transaction.rollback()
+
+
+@pytest.fixture
+async def session(db_engine, db_connection):
+    """Session inside the test transaction, commits release savepoints; statements are counted."""
+    track_statements(db_engine)
+    session = AsyncSession(bind=db_connection, join_transaction_mode="create_savepoint", expire_on_commit=False)
+    yield session
+    await session.close()
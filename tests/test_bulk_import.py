@@ -0,0 +1,97 @@
+import json
+from uuid import uuid4
+
+from sqlalchemy import func, select
+
+from src.models.database_models import Category, Event, User
+from src.services.bulk_import import import_file
+from src.utils.helpers import convert_telegram_id_to_uuid
+
+TELEGRAM_IDS = range(9_000_000_001, 9_000_000_201)
+
+
+def write_users(path, rows):
+    path.write_text("telegram_id,username,first_name,age\n" + "".join(
+        f"{telegram_id},{username},{first_name},{age}\n" for telegram_id, username, first_name, age in rows
+    ))
+
+
+async def test_import_merges_users_categories_and_events(db_connection, tmp_path):
+    users = tmp_path / "users.csv"
+    write_users(users, [(telegram_id, f"import_{telegram_id}", "Ann", 20) for telegram_id in TELEGRAM_IDS])
+    report = await import_file(db_connection, "users", str(users))
+    assert (report.read, report.invalid, report.merged) == (200, 0, 200)
+
+    # One changed, one unchanged, one duplicated (last wins), one invalid and one new row
+    first, second, third = TELEGRAM_IDS[:3]
+    write_users(users, [
+        (first, f"import_{first}", "Bob", 20),
+        (second, f"import_{second}", "Ann", 20),
+        (third, f"import_{third}", "Tom", 20),
+        (third, f"import_{third}", "Kim", 20),
+        (9_000_000_999, "import_invalid", "Ann", -1),
+        (9_000_001_000, "import_new", "Ann", ""),
+    ])
+    report = await import_file(db_connection, "users", str(users))
+    assert (report.read, report.invalid, report.merged) == (6, 1, 3)
+    names = dict((await db_connection.execute(
+        select(User.username, User.first_name).where(User.id.in_([convert_telegram_id_to_uuid(i) for i in (first, third)]))
+    )).all())
+    assert names == {f"import_{first}": "Bob", f"import_{third}": "Kim"}
+
+    category_id = uuid4()
+    categories = tmp_path / "categories.ndjson"
+    categories.write_text(json.dumps({"id": str(category_id), "name": "Imported"}) + "\n")
+    assert (await import_file(db_connection, "categories", str(categories))).merged == 1
+
+    events = tmp_path / "events.ndjson"
+    organizer_id = convert_telegram_id_to_uuid(first)
+    event = {
+        "title": "Cup", "category_id": str(category_id), "organizer_id": str(organizer_id), "location": "Minsk",
+        "people_amount": 10, "experience": 1, "date_time": "2026-11-01", "description": "",
+    }
+    events.write_text("\n".join(json.dumps(row) for row in [
+        event,
+        {**event, "title": "Orphan", "category_id": str(uuid4())},
+    ]))
+    report = await import_file(db_connection, "events", str(events))
+    assert (report.read, report.invalid, report.merged) == (2, 0, 1)
+    titles = (await db_connection.execute(select(Event.title).where(Event.organizer_id == organizer_id))).scalars()
+    assert list(titles) == ["Cup"]
+    assert (await db_connection.execute(select(func.count()).select_from(Category).where(Category.id == category_id))).scalar() == 1
+
+
+async def test_import_skips_usernames_shared_in_one_file(db_connection, tmp_path):
+    users = tmp_path / "users.csv"
+    write_users(users, [
+        (9_100_000_001, "dupname_x", "Ann", 20),
+        (9_100_000_002, "dupname_x", "Bob", 20),
+        (9_100_000_003, "dupname_y", "Kim", 20),
+        (9_100_000_003, "dupname_y", "Tom", 20),
+    ])
+    report = await import_file(db_connection, "users", str(users))
+    assert (report.read, report.conflicting, report.merged) == (4, 2, 1)
+    usernames = (await db_connection.execute(
+        select(User.username).where(User.username.in_(["dupname_x", "dupname_y"]))
+    )).scalars()
+    assert list(usernames) == ["dupname_y"]
+
+
+async def test_narrower_import_keeps_columns_it_does_not_set(db_connection, tmp_path):
+    telegram_id = 9_200_000_001
+    user_id = convert_telegram_id_to_uuid(telegram_id)
+    await db_connection.execute(User.__table__.insert().values(
+        id=user_id, username="roster_old", first_name="Ann", last_name="Lee", age=30, experience=4,
+    ))
+
+    roster = tmp_path / "roster.csv"
+    roster.write_text(f"telegram_id,username,age\n{telegram_id},roster_new,\n")
+    report = await import_file(db_connection, "users", str(roster))
+    assert report.merged == 1
+    user = (await db_connection.execute(
+        select(User.username, User.first_name, User.last_name, User.age, User.experience).where(User.id == user_id)
+    )).one()
+    assert tuple(user) == ("roster_new", "Ann", "Lee", 30, 4)
+
+    # Re-importing the same roster changes nothing
+    assert (await import_file(db_connection, "users", str(roster))).merged == 0
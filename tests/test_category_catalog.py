@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.middlewares.database import count_statements, track_statements
+from src.models.database_models import Category
+from src.services.category_catalog import CategoryCatalog
+
+
+@pytest.fixture
+async def session_factory(db_engine, db_connection):
+    track_statements(db_engine)
+    return async_sessionmaker(
+        bind=db_connection, join_transaction_mode="create_savepoint", expire_on_commit=False
+    )
+
+
+async def add_category(session_factory, name: str) -> Category:
+    async with session_factory() as session:
+        category = Category(id=uuid4(), name=name, description="Test", updated_at=datetime.utcnow() + timedelta(days=1))
+        session.add(category)
+        await session.commit()
+        return category
+
+
+async def test_markup_is_built_once_per_version(session_factory):
+    catalog = CategoryCatalog(session_factory)
+    category = await add_category(session_factory, f"catalog_{uuid4().hex[:8]}")
+
+    with count_statements() as stats:
+        first = await catalog.markup()
+    assert stats.statements == 1
+    assert category.id in {item.id for item in catalog.categories}
+
+    with count_statements() as stats:
+        second = await catalog.markup()
+    assert stats.statements == 0
+    assert second is first
+    assert any(button.callback_data == f"{category.id}" for row in first.inline_keyboard for button in row)
+
+
+async def test_refresh_reloads_only_on_change(session_factory):
+    catalog = CategoryCatalog(session_factory)
+    await catalog.load()
+    first = await catalog.markup()
+
+    with count_statements() as stats:
+        assert not await catalog.refresh()
+    assert stats.statements == 1
+
+    category = await add_category(session_factory, f"catalog_{uuid4().hex[:8]}")
+    assert await catalog.refresh()
+    assert category.id in {item.id for item in catalog.categories}
+    assert await catalog.markup() is not first
+
+    async with session_factory() as session:
+        await session.delete(await session.get(Category, category.id))
+        await session.commit()
+    assert await catalog.refresh()
+    assert category.id not in {item.id for item in catalog.categories}
+
+
+async def test_invalidate_forces_reload(session_factory):
+    catalog = CategoryCatalog(session_factory)
+    await catalog.load()
+    catalog.invalidate()
+
+    with count_statements() as stats:
+        await catalog.markup()
+    assert stats.statements == 1
+
+
+async def test_refresh_sees_changes_with_older_timestamps(session_factory):
+    category = await add_category(session_factory, f"catalog_{uuid4().hex[:8]}")
+    catalog = CategoryCatalog(session_factory)
+    await catalog.load()
+
+    # A transaction started before the last change commits after it
+    async with session_factory() as session:
+        await session.execute(
+            update(Category)
+            .where(Category.id == category.id)
+            .values(name=f"renamed_{uuid4().hex[:8]}", updated_at=datetime.utcnow() - timedelta(days=1))
+        )
+        await session.commit()
+    assert await catalog.refresh()
+    assert not await catalog.refresh()
+
+
+async def test_stop_waits_for_the_refresh_task(session_factory):
+    catalog = CategoryCatalog(session_factory, refresh_interval=3600)
+    await catalog.start()
+    task = catalog._task
+    await catalog.stop()
+    assert task.cancelled() and catalog._task is None
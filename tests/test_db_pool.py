@@ -0,0 +1,41 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.config.database_config import InstrumentedQueuePool, database_url, warm_up_pool
+
+
+@pytest.fixture
+async def engine(db_engine):
+    engine = create_async_engine(database_url, poolclass=InstrumentedQueuePool, pool_size=2, max_overflow=0, pool_timeout=0.1)
+    yield engine
+    await engine.dispose()
+
+
+async def test_pool_stats_count_waits_and_timeouts(engine):
+    async with engine.connect() as first, engine.connect() as second:
+        stats = engine.pool.stats()
+        assert stats["checked_out"] == 2 and stats["idle"] == 0
+
+        with pytest.raises(PoolTimeoutError):
+            async with engine.connect():
+                pass
+
+    stats = engine.pool.stats()
+    assert stats["checked_out"] == 0 and stats["idle"] == 2
+    assert stats["timeouts"] == 1
+    assert stats["wait"]["count"] == 3
+    assert stats["wait"]["max_ms"] >= 100
+
+
+async def test_warm_up_opens_pool_size_connections(engine):
+    prepared = []
+
+    async def query(session):
+        prepared.append(id(await session.connection()))
+        await session.execute(text("SELECT 1"))
+
+    assert await warm_up_pool(engine, [query]) == 2
+    assert len(set(prepared)) == 2
+    assert engine.pool.stats()["idle"] == 2
@@ -0,0 +1,72 @@
+import json
+from datetime import date
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import delete, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.database_models import Category, Event, User
+from src.models.managers.event import EventManager
+
+EVENTS = [
+    ("Chess tournament", "Rapid games for juniors", "Minsk"),
+    ("Football cup", "Friendly tournament, bring your own boots", "Brest"),
+    ("Evening run", "Park run for everyone", "Minsk"),
+    ("Chess lessons", "Openings and endgames", "Grodno"),
+]
+
+
+@pytest.fixture
+async def session(db_connection):
+    session = AsyncSession(bind=db_connection, join_transaction_mode="create_savepoint", expire_on_commit=False)
+    user = User(id=uuid4(), username=f"search_{uuid4().hex[:8]}")
+    category = Category(id=uuid4(), name="Sports", description="")
+    session.add_all([user, category])
+    await session.flush()
+    session.add_all([
+        Event(
+            title=title, description=description, location=location, category_id=category.id,
+            people_amount=10, experience=0, date_time=date.today(), organizer_id=user.id,
+        )
+        for title, description, location in EVENTS
+    ])
+    await session.flush()
+    yield session
+    await session.close()
+
+
+async def titles(session, query, offset=0, limit=10):
+    event_ids = await EventManager.search_event_ids(session, query)
+    return [event.title for event in await EventManager.get_events_by_ids(session, event_ids[offset:offset + limit])]
+
+
+async def test_search_ranks_title_matches_first(session):
+    # Stemming: "tournaments" matches "tournament", the title match ranks above the description one
+    assert await titles(session, "tournaments") == ["Chess tournament", "Football cup"]
+    assert await titles(session, "chess -lessons") == ["Chess tournament"]
+    assert await titles(session, '"park run" minsk') == ["Evening run"]
+    assert await titles(session, "minsk", offset=1, limit=1) in (["Chess tournament"], ["Evening run"])
+    assert await titles(session, "the") == []
+
+
+async def test_search_uses_gin_index(session):
+    await session.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = (await session.execute(text(
+        "EXPLAIN (FORMAT JSON) SELECT id FROM event "
+        "WHERE search_vector @@ websearch_to_tsquery('english'::regconfig, 'chess')"
+    ))).scalar()
+    plan = json.dumps(plan if not isinstance(plan, str) else json.loads(plan))
+    assert "ix_event_search_vector" in plan
+
+
+async def test_search_pages_come_from_the_ranked_ids(session, monkeypatch):
+    monkeypatch.setattr("src.models.managers.event.SEARCH_MAX_CANDIDATES", 2)
+    # Three matches, only two of them are ranked
+    event_ids = await EventManager.search_event_ids(session, "chess or run")
+    assert len(event_ids) == 2
+
+    events = await EventManager.get_events_by_ids(session, event_ids)
+    assert [event.id for event in events] == event_ids
+    await session.execute(delete(Event).where(Event.id == event_ids[0]))
+    assert [event.id for event in await EventManager.get_events_by_ids(session, event_ids)] == event_ids[1:]
@@ -0,0 +1,106 @@
+import json
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.middlewares.database import count_statements, track_statements
+from src.models.database_models import Category, Event, User
+from src.models.managers.event import EventManager
+from src.services.geo_cache import CACHE_PRECISION, NearEventsCache
+from src.utils import geohash
+
+MINSK = (53.9023, 27.5619)
+PLACES = {
+    "Center": (53.9045, 27.5615),       # ~0.3 km
+    "Stadium": (53.9180, 27.5480),      # ~2 km
+    "Suburb": (53.9700, 27.6500),       # ~9.5 km
+    "Brest": (52.0976, 23.7341),        # ~325 km
+}
+
+
+def test_geohash_cells():
+    assert geohash.encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert sorted(geohash.neighborhood("u4pr")) == sorted(
+        ["u4pn", "u4pq", "u4pw", "u4pp", "u4pr", "u4px", "u4r0", "u4r2", "u4r8"]
+    )
+    # Across the antimeridian
+    assert "80" in geohash.neighborhood(geohash.encode(0, 179.9, 2))
+    cells = geohash.cover(*MINSK, 10)
+    assert any(geohash.encode(*PLACES["Suburb"]).startswith(cell) for cell in cells)
+    assert round(geohash.distance_km(*MINSK, *PLACES["Brest"])) == 325
+
+
+@pytest.fixture
+async def session(db_engine, db_connection):
+    track_statements(db_engine)
+    session = AsyncSession(bind=db_connection, join_transaction_mode="create_savepoint", expire_on_commit=False)
+    user = User(id=uuid4(), username=f"near_{uuid4().hex[:8]}")
+    category = Category(id=uuid4(), name="Sports", description="")
+    session.add_all([user, category])
+    await session.flush()
+    tomorrow = datetime.now(timezone.utc) + timedelta(days=1)
+    session.add_all([
+        Event(
+            title=title, location=title, description="", category_id=category.id, people_amount=10,
+            experience=0, date_time=tomorrow, organizer_id=user.id,
+            latitude=latitude, longitude=longitude, geohash=geohash.encode(latitude, longitude),
+        )
+        for title, (latitude, longitude) in PLACES.items()
+    ])
+    # Already happened, never listed
+    latitude, longitude = PLACES["Center"]
+    session.add(Event(
+        title="Yesterday", location="Center", description="", category_id=category.id, people_amount=10,
+        experience=0, date_time=tomorrow - timedelta(days=2), organizer_id=user.id,
+        latitude=latitude, longitude=longitude, geohash=geohash.encode(latitude, longitude),
+    ))
+    await session.flush()
+    yield session
+    await session.close()
+
+
+async def test_nearest_events_use_geohash_index(session):
+    events = await EventManager.get_events_near(session, *MINSK, radius_km=10)
+    assert [event.title for event in events] == ["Center", "Stadium", "Suburb"]
+    assert events[0].distance < 0.5
+
+    await session.execute(text("SET LOCAL enable_seqscan = off"))
+    cell = geohash.encode(*MINSK, 4)
+    plan = (await session.execute(
+        text("EXPLAIN (FORMAT JSON) SELECT id FROM event WHERE geohash >= :cell AND geohash < :cell || '~'"),
+        {"cell": cell},
+    )).scalar()
+    assert "ix_event_geohash" in json.dumps(plan if not isinstance(plan, str) else json.loads(plan))
+
+
+async def test_grid_cache_serves_hot_cell(session):
+    cache = NearEventsCache(radius_km=10)
+    await cache.get(session, *MINSK)
+
+    # A user ~20 m away is in the same cell, distances are their own
+    with count_statements() as stats:
+        events = await cache.get(session, MINSK[0] + 0.0002, MINSK[1])
+    assert stats.statements == 0
+    assert [event.title for event, _ in events] == ["Center", "Stadium", "Suburb"]
+    assert cache.stats()["hits"] == 1
+
+    cache.invalidate(geohash.encode(*PLACES["Brest"]))
+    assert cache.stats()["size"] == 1
+    cache.invalidate(geohash.encode(*PLACES["Stadium"]))
+    assert cache.stats()["size"] == 0
+
+
+async def test_grid_cache_drops_started_events(session):
+    cache = NearEventsCache(radius_km=10)
+    events = await cache.get(session, *MINSK)
+    assert [event.title for event, _ in events] == ["Center", "Stadium", "Suburb"]
+
+    # "Center" starts while its search is cached
+    cell = geohash.encode(*MINSK, CACHE_PRECISION)
+    area, (center, *rest) = cache._entries[cell]
+    cache._entries[cell] = (area, (replace(center, date_time=datetime.now(timezone.utc)), *rest))
+    assert [event.title for event, _ in await cache.get(session, *MINSK)] == ["Stadium", "Suburb"]
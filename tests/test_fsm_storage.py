@@ -0,0 +1,76 @@
+from datetime import datetime
+
+from aiogram import Bot, Dispatcher, Router
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.types import Message, Update
+
+from src.middlewares.fsm import setup_fsm_batch
+from src.services.fsm_storage import FileStorage
+
+KEY = StorageKey(bot_id=1, chat_id=10, user_id=10)
+
+
+class CountingFileStorage(FileStorage):
+    reads = 0
+    writes = 0
+
+    async def _read(self, key):
+        self.reads += 1
+        return await super()._read(key)
+
+    async def _write(self, records):
+        self.writes += 1
+        await super()._write(records)
+
+
+async def test_batch_coalesces_writes(tmp_path):
+    storage = CountingFileStorage(str(tmp_path / "fsm.json"))
+
+    async with storage.batch():
+        await storage.set_state(KEY, "EventStates:TITLE")
+        await storage.update_data(KEY, {"title": "Cup"})
+        await storage.update_data(KEY, {"date_time": datetime(2025, 5, 1, 18, 30)})
+        assert await storage.get_state(KEY) == "EventStates:TITLE"
+
+    assert storage.writes == 1
+
+    reloaded = FileStorage(str(tmp_path / "fsm.json"))
+    assert await reloaded.get_state(KEY) == "EventStates:TITLE"
+    assert await reloaded.get_data(KEY) == {"title": "Cup", "date_time": datetime(2025, 5, 1, 18, 30)}
+
+
+async def test_cleared_record_is_removed(tmp_path):
+    storage = FileStorage(str(tmp_path / "fsm.json"))
+    await storage.set_state(KEY, "TeamStates:NAME")
+
+    async with storage.batch():
+        await storage.set_state(KEY, None)
+        await storage.set_data(KEY, {})
+
+    assert FileStorage(str(tmp_path / "fsm.json"))._load() == {}
+
+
+async def test_update_reads_and_writes_storage_once(tmp_path):
+    storage = CountingFileStorage(str(tmp_path / "fsm.json"))
+    dispatcher = Dispatcher(storage=storage)
+    setup_fsm_batch(dispatcher, storage)
+    router = Router()
+
+    @router.message()
+    async def handler(message: Message, state: FSMContext):
+        await state.update_data(title=message.text)
+        await state.set_state("EventStates:DATE")
+        assert (await state.get_data())["title"] == "Cup"
+
+    dispatcher.include_router(router)
+    update = Update.model_validate({
+        "update_id": 1,
+        "message": {
+            "message_id": 1, "date": 0, "text": "Cup",
+            "chat": {"id": 10, "type": "private"},
+            "from": {"id": 10, "is_bot": False, "first_name": "John"},
+        },
+    })
+    await dispatcher.feed_update(Bot("42:TEST"), update)
+    assert (storage.reads, storage.writes) == (1, 1)
@@ -0,0 +1,42 @@
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.methods import SendMessage
+from aiogram.utils.keyboard import InlineKeyboardBuilder
+
+from src.utils.keyboards import MAIN_MENU, KeyboardRegistry, PreparedMarkupSession
+
+BOT = Bot(token="42:TEST")
+
+
+def form_fields(session, method):
+    return {options["name"]: value for options, _, value in session.build_form_data(BOT, method)._fields}
+
+
+def test_prepared_markup_is_sent_like_builder_markup():
+    builder = InlineKeyboardBuilder()
+    for row in MAIN_MENU.inline_keyboard:
+        for button in row:
+            builder.button(text=button.text, callback_data=button.callback_data)
+    builder.adjust(2)
+
+    expected = form_fields(AiohttpSession(), SendMessage(chat_id=1, text="menu", reply_markup=builder.as_markup()))
+    actual = form_fields(PreparedMarkupSession(), SendMessage(chat_id=1, text="menu", reply_markup=MAIN_MENU))
+    assert actual == expected
+
+
+def test_dynamic_keyboard_rebuilt_only_on_new_version():
+    registry = KeyboardRegistry()
+    builds = []
+
+    def buttons():
+        builds.append(1)
+        return [("Football", "1"), ("Chess", "2")]
+
+    first = registry.dynamic("categories", 1, buttons)
+    assert registry.dynamic("categories", 1, buttons) is first
+    assert registry.dynamic("categories", 2, buttons) is not first
+    assert len(builds) == 2
+
+    registry.invalidate("categories")
+    registry.dynamic("categories", 2, buttons)
+    assert len(builds) == 3
@@ -0,0 +1,123 @@
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.functionality.leaderboard.handlers import positions
+from src.middlewares.database import count_statements, track_statements
+from src.models.database_models import Category, Event, Statistic, User
+from src.models.managers.statistic import StatisticManager
+from src.services.leaderboard import Leaderboard, TopK
+
+
+def test_top_k_keeps_best_scores_sorted():
+    a, b, c, d = (UUID(int=i) for i in range(1, 5))
+    top = TopK(3)
+    top.update(a, 10)
+    top.update(b, 30)
+    top.update(c, 20)
+    top.update(d, 5)
+    assert top.top(10) == [(b, 30), (c, 20), (a, 10)]
+    assert top.rank(d) is None
+
+    top.update(a, 30)
+    assert top.top(2) == [(a, 30), (b, 30)]
+    assert top.rank(b) == (1, 30)
+    assert top.rank(c) == (3, 20)
+
+    top.update(d, 25)
+    assert top.top(10) == [(a, 30), (b, 30), (d, 25)]
+    assert top.rank(c) is None
+
+
+@pytest.fixture
+async def session_factory(db_engine, db_connection):
+    track_statements(db_engine)
+    factory = async_sessionmaker(bind=db_connection, join_transaction_mode="create_savepoint", expire_on_commit=False)
+    async with factory() as session:
+        await session.execute(text("DELETE FROM category_user_score"))
+        await session.execute(text("DELETE FROM user_score"))
+        await session.commit()
+    return factory
+
+
+async def add_players(session_factory, count: int):
+    async with session_factory() as session:
+        users = [User(id=uuid4(), username=f"player_{uuid4().hex[:8]}") for _ in range(count)]
+        categories = [Category(id=uuid4(), name=name, description="") for name in ("Chess", "Darts")]
+        session.add_all([*users, *categories])
+        await session.flush()
+        events = [
+            Event(
+                title=category.name, location="Minsk", description="", category_id=category.id, people_amount=10,
+                experience=0, date_time=datetime.now(timezone.utc), organizer_id=users[0].id,
+            )
+            for category in categories
+        ]
+        session.add_all(events)
+        await session.commit()
+        return [user.id for user in users], events
+
+
+async def test_record_statistic_updates_totals(session_factory):
+    (alice, bob), (chess, darts) = await add_players(session_factory, 2)
+    async with session_factory() as session:
+        with count_statements() as stats:
+            totals = await StatisticManager.record_statistic(session, alice, chess.id, 10, 4.0)
+        assert stats.statements == 1
+        assert (totals.total_score, totals.category_score, totals.category_id) == (10, 10, chess.category_id)
+
+        await StatisticManager.record_statistic(session, bob, chess.id, 15, 5.0)
+        totals = await StatisticManager.record_statistic(session, alice, darts.id, 7, 3.0)
+        assert (totals.total_score, totals.category_score) == (17, 7)
+
+        assert await StatisticManager.get_top_scores(session, 10) == [(alice, 17), (bob, 15)]
+        assert await StatisticManager.get_rank(session, bob) == (2, 15)
+        assert await StatisticManager.get_rank(session, bob, chess.category_id) == (1, 15)
+        assert await StatisticManager.get_rank(session, bob, darts.category_id) is None
+        count, rating = (await session.execute(
+            text("SELECT events_count, rating_sum FROM user_score WHERE user_id = :id"), {"id": alice}
+        )).one()
+        assert (count, rating) == (2, 7.0)
+
+
+async def test_leaderboard_serves_top_from_memory(session_factory):
+    (alice, bob, carol), (chess, _) = await add_players(session_factory, 3)
+    board = Leaderboard(session_factory, size=2)
+    async with session_factory() as session:
+        await board.record(session, alice, chess.id, 10, 4.0)
+        await board.record(session, bob, chess.id, 20, 4.0)
+        await board.record(session, carol, chess.id, 5, 4.0)
+
+        with count_statements() as stats:
+            assert board.top() == [(bob, 20), (alice, 10)]
+            assert board.top(category_id=chess.category_id) == [(bob, 20), (alice, 10)]
+            assert await board.rank(session, alice) == (2, 10)
+        assert stats.statements == 0
+
+        # Outside of the in-memory top the rank is counted in the database
+        with count_statements() as stats:
+            assert await board.rank(session, carol) == (3, 5)
+        assert stats.statements == 1
+
+    reloaded = Leaderboard(session_factory, size=2)
+    await reloaded.load()
+    assert reloaded.top() == board.top()
+    assert reloaded.top(category_id=chess.category_id) == [(bob, 20), (alice, 10)]
+
+
+def test_positions_share_ties_like_ranks():
+    a, b, c, d = (UUID(int=i) for i in range(1, 5))
+    assert positions([(a, 30), (b, 20), (c, 20), (d, 10)]) == [1, 2, 2, 4]
+    assert positions([]) == []
+
+
+async def test_statistics_are_only_recorded_through_the_manager(session_factory):
+    (alice,), (chess, _) = await add_players(session_factory, 1)
+    async with session_factory() as session:
+        session.add(Statistic(user_id=alice, event_id=chess.id, score=10, rating=4.0))
+        with pytest.raises(InvalidRequestError):
+            await session.flush()
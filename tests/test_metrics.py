@@ -0,0 +1,37 @@
+import json
+
+from src.services.metrics import Histogram, HandlerTiming, LatencyRecorder
+
+
+def test_histogram_percentiles_within_bucket_error():
+    histogram = Histogram()
+    for value in range(1, 100001):
+        histogram.record(value)
+
+    for percent in (50, 95, 99):
+        expected = 100000 * percent / 100
+        assert abs(histogram.percentile(percent) - expected) / expected < 0.02
+    assert histogram.max == 100000
+    assert histogram.count == 100000
+
+
+def test_histogram_small_values_are_exact():
+    histogram = Histogram()
+    for value in (1, 2, 3, 100):
+        histogram.record(value)
+    assert histogram.percentile(50) == 2
+    assert histogram.percentile(100) == 100
+
+
+def test_recorder_sorts_by_p95_and_dumps(tmp_path):
+    recorder = LatencyRecorder()
+    recorder.record(("user", "fast", "-"), 0.001, HandlerTiming(db=0.0005))
+    recorder.record(("event", "slow", "EventStates:TITLE"), 0.2, HandlerTiming(api=0.1))
+
+    rows = recorder.snapshot()
+    assert [row["handler"] for row in rows] == ["slow", "fast"]
+    assert rows[0]["api"]["count"] == 1
+
+    path = tmp_path / "latency.json"
+    recorder.dump(str(path))
+    assert len(json.loads(path.read_text())["routes"]) == 2
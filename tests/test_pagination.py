@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.database_models import Feedback, User
+from src.utils.pagination import PAGE_SIZE, PageCallback, decode_cursor, encode_cursor, fetch_page, page_markup
+
+
+def test_cursor_round_trip_fits_callback_data():
+    created_at = datetime(2024, 12, 7, 10, 30, 15, 123456, tzinfo=timezone.utc)
+    id = uuid4()
+    cursor = encode_cursor(created_at, id)
+    assert decode_cursor(cursor) == (created_at, id)
+
+    packed = PageCallback(view="feedback", number=1000, forward=False, cursor=cursor).pack()
+    assert len(packed.encode()) <= 64
+
+
+def button_data(markup, text):
+    for row in markup.inline_keyboard:
+        for button in row:
+            if text in button.text:
+                return PageCallback.unpack(button.callback_data)
+    return None
+
+
+async def test_pages_cover_all_rows_forward_and_back(db_connection):
+    session = AsyncSession(bind=db_connection, join_transaction_mode="create_savepoint")
+    user_id = uuid4()
+    await session.execute(insert(User).values(id=user_id, username=f"pagination_{user_id}"))
+    # Half of the rows share a timestamp, so ties are broken by id
+    started = datetime.now(timezone.utc)
+    await session.execute(insert(Feedback), [
+        {"id": uuid4(), "user_id": user_id, "text": str(number), "created_at": started + timedelta(seconds=number // 2)}
+        for number in range(PAGE_SIZE * 2 + 3)
+    ])
+
+    statement = select(Feedback.id, Feedback.created_at, Feedback.text).where(Feedback.user_id == user_id)
+    key = (Feedback.created_at, Feedback.id)
+    expected = (await session.execute(statement.order_by(*key))).all()
+
+    pages = [await fetch_page(session, statement, key)]
+    while pages[-1].has_next:
+        pages.append(await fetch_page(session, statement, key, button_data(page_markup("feedback", pages[-1]), "Next")))
+    assert [row for page in pages for row in page.rows] == expected
+    assert [page.number for page in pages] == [0, 1, 2]
+    assert not pages[0].has_prev and pages[1].has_prev
+
+    back = await fetch_page(session, statement, key, button_data(page_markup("feedback", pages[2]), "Prev"))
+    assert back.rows == pages[1].rows and back.number == 1 and back.has_prev and back.has_next
+    await session.close()
@@ -0,0 +1,67 @@
+import dataclasses
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.middlewares.database import count_statements
+from src.models.database_models import User
+from src.models.managers.user import UserManager
+from src.services.profile_cache import ProfileCache, profile_cache
+
+
+async def seed_users(session: AsyncSession, count: int) -> list:
+    users = [User(id=uuid4(), username=f"cache_{uuid4().hex[:12]}", first_name="Ann") for _ in range(count)]
+    session.add_all(users)
+    await session.flush()
+    session.expunge_all()
+    return users
+
+
+async def test_read_through_returns_frozen_snapshots(session):
+    [user] = await seed_users(session, 1)
+    cache = ProfileCache()
+
+    with count_statements() as stats:
+        first = await cache.get(session, user.id)
+        second = await cache.get(session, user.id)
+    assert stats.statements == 1
+    assert first is second and first.is_registered
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.first_name = "Bob"
+    assert not hasattr(first, "__dict__")
+
+    assert await cache.get(session, uuid4()) is None
+    assert cache.stats()["size"] == 1
+
+
+async def test_lru_eviction_and_ttl(session):
+    a, b, c = await seed_users(session, 3)
+    now = [0.0]
+    cache = ProfileCache(maxsize=2, ttl=10, timer=lambda: now[0])
+
+    await cache.get(session, a.id)
+    await cache.get(session, b.id)
+    await cache.get(session, a.id)
+    await cache.get(session, c.id)  # evicts b, the least recently used
+    assert cache.stats()["hits"] == 1
+
+    with count_statements() as stats:
+        await cache.get(session, a.id)
+        await cache.get(session, b.id)
+    assert stats.statements == 1
+
+    now[0] = 11
+    with count_statements() as stats:
+        await cache.get(session, a.id)
+    assert stats.statements == 1
+
+
+async def test_update_user_invalidates_profile(session):
+    [user] = await seed_users(session, 1)
+    assert (await profile_cache.get(session, user.id)).first_name == "Ann"
+
+    await UserManager.update_user(session, user.id, "first_name", "Bob")
+    assert (await profile_cache.get(session, user.id)).first_name == "Bob"
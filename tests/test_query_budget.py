@@ -0,0 +1,85 @@
+from datetime import date
+from uuid import uuid4
+
+import pytest
+from aiogram import Bot, Dispatcher, Router, types
+from aiogram.types import Update
+from sqlalchemy import insert, select, text
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.functionality.feedback.handlers import render_feedback_page
+from src.middlewares.database import DbSessionMiddleware, QueryBudgetExceeded, count_statements, track_statements
+from src.models.database_models import Category, Event, Feedback, User
+from src.models.managers.event import EventManager
+
+
+async def seed_user(session: AsyncSession) -> User:
+    user = User(id=uuid4(), username=f"budget_{uuid4().hex[:8]}")
+    session.add(user)
+    await session.flush()
+    return user
+
+
+async def test_feedback_page_is_one_statement_for_any_number_of_authors(session):
+    await session.execute(text("DELETE FROM feedback"))
+    users = [await seed_user(session) for _ in range(5)]
+    await session.execute(insert(Feedback), [
+        {"id": uuid4(), "user_id": user.id, "text": "nice"} for user in users
+    ])
+
+    with count_statements() as stats:
+        message_text, _ = await render_feedback_page(session)
+    assert stats.statements == 1
+    assert all(user.username in message_text for user in users)
+
+
+async def test_event_details_are_loaded_eagerly(session):
+    user = await seed_user(session)
+    category = Category(name="Chess", description="")
+    session.add(category)
+    await session.flush()
+    for number in range(3):
+        session.add(Event(
+            title=f"Event {number}", category_id=category.id, location="Minsk", people_amount=2,
+            experience=0, date_time=date.today(), organizer_id=user.id, description="",
+        ))
+    await session.flush()
+    session.expunge_all()
+
+    with count_statements() as stats:
+        events = await EventManager.get_events_by_organizer(session, user.id)
+        names = {(event.category.name, event.organizer.username) for event in events}
+    assert stats.statements == 1
+    assert names == {("Chess", user.username)}
+
+    session.expunge_all()
+    event = (await session.execute(select(Event).where(Event.organizer_id == user.id).limit(1))).scalar_one()
+    with pytest.raises(InvalidRequestError):
+        event.organizer
+
+
+async def test_strict_middleware_fails_handler_over_budget(db_engine):
+    track_statements(db_engine)
+    router = Router()
+
+    @router.message(flags={"query_budget": 1})
+    async def chatty_handler(message: types.Message, session: AsyncSession):
+        await session.execute(text("SELECT 1"))
+        await session.execute(text("SELECT 2"))
+
+    dispatcher = Dispatcher()
+    dispatcher.message.middleware(DbSessionMiddleware(async_sessionmaker(db_engine), strict=True))
+    dispatcher.include_router(router)
+
+    bot = Bot(token="42:TEST")
+    update = Update.model_validate({
+        "update_id": 1,
+        "message": {
+            "message_id": 1, "date": 0, "text": "hi",
+            "chat": {"id": 1, "type": "private"}, "from": {"id": 1, "is_bot": False, "first_name": "U"},
+        },
+    }, context={"bot": bot})
+    with pytest.raises(QueryBudgetExceeded):
+        await dispatcher.feed_update(bot, update)
+    await bot.session.close()
@@ -0,0 +1,121 @@
+import json
+
+from sqlalchemy import text
+
+USERS = 2000
+EVENTS = 20000
+TEAMS = 5000
+RSVPS = 40000
+FEEDBACKS = 10000
+
+SEED = [
+    f"""
+    CREATE TEMP TABLE plan_user ON COMMIT DROP AS
+    SELECT gen_random_uuid() AS id, i FROM generate_series(1, {USERS}) s(i)
+    """,
+    """
+    CREATE TEMP TABLE plan_category ON COMMIT DROP AS
+    SELECT gen_random_uuid() AS id, i FROM generate_series(1, 20) s(i)
+    """,
+    f"""
+    CREATE TEMP TABLE plan_event ON COMMIT DROP AS
+    SELECT gen_random_uuid() AS id, i FROM generate_series(1, {EVENTS}) s(i)
+    """,
+    f"""
+    CREATE TEMP TABLE plan_team ON COMMIT DROP AS
+    SELECT gen_random_uuid() AS id, i FROM generate_series(1, {TEAMS}) s(i)
+    """,
+    """
+    INSERT INTO "user" (id, username, created_at, updated_at)
+    SELECT id, 'plan_user_' || i, now(), now() FROM plan_user
+    """,
+    """
+    INSERT INTO category (id, name, description, created_at, updated_at)
+    SELECT id, 'plan_category_' || i, '', now(), now() FROM plan_category
+    """,
+    f"""
+    INSERT INTO event (id, title, category_id, location, people_amount, experience, date_time, organizer_id,
+                       description, created_at, updated_at)
+    SELECT e.id, 'plan_event_' || e.i, c.id, 'Minsk', 10, 1, current_date, u.id, '', now(), now()
+    FROM plan_event e
+    JOIN plan_category c ON c.i = 1 + e.i % 20
+    JOIN plan_user u ON u.i = 1 + e.i % {USERS}
+    """,
+    f"""
+    INSERT INTO team (id, name, description, logo_url, creator_id, created_at, updated_at)
+    SELECT t.id, 'plan_team_' || t.i, '', '', u.id, now(), now()
+    FROM plan_team t JOIN plan_user u ON u.i = 1 + t.i % {USERS}
+    """,
+    f"""
+    INSERT INTO rsvp (id, user_id, event_id, status, responded_at, created_at, updated_at)
+    SELECT gen_random_uuid(), u.id, e.id, 'accepted', current_date, now(), now()
+    FROM generate_series(1, {RSVPS}) s(i)
+    JOIN plan_user u ON u.i = 1 + (s.i + s.i / {EVENTS}) % {USERS}
+    JOIN plan_event e ON e.i = 1 + s.i % {EVENTS}
+    """,
+    f"""
+    INSERT INTO player (id, user_id, rsvp_id, team_id, created_at, updated_at)
+    SELECT gen_random_uuid(), r.user_id, r.id, t.id, now(), now()
+    FROM (SELECT id, user_id, row_number() OVER () AS i FROM rsvp) r
+    JOIN plan_team t ON t.i = 1 + r.i % {TEAMS}
+    """,
+    f"""
+    INSERT INTO statistic (id, user_id, event_id, score, rating, created_at, updated_at)
+    SELECT gen_random_uuid(), u.id, e.id, 1, 4, now(), now()
+    FROM plan_event e JOIN plan_user u ON u.i = 1 + e.i % {USERS}
+    """,
+    f"""
+    INSERT INTO feedback (id, user_id, text, created_at, updated_at)
+    SELECT gen_random_uuid(), u.id, 'feedback', now(), now()
+    FROM generate_series(1, {FEEDBACKS}) s(i) JOIN plan_user u ON u.i = 1 + s.i % {USERS}
+    """,
+    "ANALYZE",
+]
+
+# Hot lookups by foreign key: "my events/teams" pickers, feedback and
+# the lookups Postgres runs for ON DELETE CASCADE / SET NULL
+HOT_QUERIES = {
+    "ix_event_organizer_id": "SELECT * FROM event WHERE organizer_id = :id",
+    "ix_team_creator_id": "SELECT * FROM team WHERE creator_id = :id",
+    "ix_rsvp_user_id": "SELECT * FROM rsvp WHERE user_id = :id",
+    "ix_feedback_user_id": "SELECT * FROM feedback WHERE user_id = :id",
+    "ix_rsvp_event_id": "SELECT * FROM rsvp WHERE event_id = :event_id",
+    "ix_statistic_event_id": "SELECT * FROM statistic WHERE event_id = :event_id",
+    "ix_player_team_id": "SELECT * FROM player WHERE team_id = :team_id",
+    # Keyset pagination of list views
+    "ix_event_created_at_id": (
+        "SELECT id, title FROM event WHERE (created_at, id) > (now() - interval '1 day', :event_id) "
+        "ORDER BY created_at, id LIMIT 6"
+    ),
+    "ix_feedback_created_at_id": (
+        "SELECT id, text FROM feedback WHERE (created_at, id) > (now() - interval '1 day', :id) "
+        "ORDER BY created_at, id LIMIT 6"
+    ),
+}
+
+
+def plan_indexes(plan: dict) -> set:
+    """Names of all indexes used anywhere in the plan tree."""
+    indexes = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        indexes |= plan_indexes(child)
+    return indexes
+
+
+async def test_hot_queries_use_indexes(db_connection):
+    for statement in SEED:
+        await db_connection.execute(text(statement))
+    ids = (await db_connection.execute(text(
+        "SELECT (SELECT id FROM plan_user WHERE i = 1) AS id, "
+        "(SELECT id FROM plan_event WHERE i = 1) AS event_id, "
+        "(SELECT id FROM plan_team WHERE i = 1) AS team_id"
+    ))).mappings().one()
+
+    missing = {}
+    for index, query in HOT_QUERIES.items():
+        params = {name: value for name, value in ids.items() if f":{name}" in query}
+        plan = (await db_connection.execute(text(f"EXPLAIN (FORMAT JSON) {query}"), params)).scalar()
+        plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+        if index not in plan_indexes(plan):
+            missing[index] = plan["Node Type"]
+    assert not missing, f"Hot queries not using their index: {missing}"
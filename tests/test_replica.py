@@ -0,0 +1,73 @@
+from aiogram import Bot, Dispatcher, F, Router, types
+from aiogram.types import Update
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.middlewares.database import DbSessionMiddleware, track_statements
+from src.services.replica import ReplicaRouter
+
+
+def make_update(update_id: int, text: str) -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id, "date": 0, "text": text,
+            "chat": {"id": 1, "type": "private"}, "from": {"id": 1, "is_bot": False, "first_name": "U"},
+        },
+    }
+
+
+def test_reads_fall_back_to_primary():
+    now = [0.0]
+    router = ReplicaRouter(async_sessionmaker(), max_lag=5, sticky_seconds=10, timer=lambda: now[0])
+    assert not router.use_replica(1, read_only=True)  # lag not measured yet
+
+    router.lag = 1.0
+    assert router.use_replica(1, read_only=True)
+    assert not router.use_replica(1, read_only=False)
+
+    router.mark_write(1)
+    assert not router.use_replica(1, read_only=True)
+    assert router.use_replica(2, read_only=True)
+    now[0] = 11
+    assert router.use_replica(1, read_only=True)
+
+    router.lag = 6.0
+    assert not router.use_replica(1, read_only=True)
+    assert not ReplicaRouter(None).use_replica(1, read_only=True)
+
+
+async def test_lag_of_primary_is_zero(db_engine):
+    router = ReplicaRouter(async_sessionmaker(db_engine))
+    assert await router.check_lag() == 0
+    assert router.replica_available
+
+
+async def test_middleware_routes_read_only_handlers(db_engine):
+    track_statements(db_engine)
+    replicas = ReplicaRouter(async_sessionmaker(db_engine, info={"name": "replica"}))
+    replicas.lag = 0.0
+    used = []
+
+    router = Router()
+
+    @router.message(F.text == "read", flags={"read_only": True})
+    async def read(message: types.Message, session: AsyncSession):
+        used.append(session.info["name"])
+        await session.execute(text("SELECT 1"))
+
+    @router.message(F.text == "write")
+    async def write(message: types.Message, session: AsyncSession):
+        used.append(session.info["name"])
+        await session.execute(text("CREATE TEMP TABLE replica_test (id int)"))
+
+    dispatcher = Dispatcher()
+    primary = async_sessionmaker(db_engine, info={"name": "primary"})
+    dispatcher.message.middleware(DbSessionMiddleware(primary, replicas=replicas))
+    dispatcher.include_router(router)
+
+    bot = Bot(token="42:TEST")
+    for update_id, message_text in enumerate(["read", "write", "read"], start=1):
+        await dispatcher.feed_update(bot, Update.model_validate(make_update(update_id, message_text), context={"bot": bot}))
+    await bot.session.close()
+    assert used == ["replica", "primary", "primary"]
@@ -0,0 +1,212 @@
+import asyncio
+from datetime import date
+from uuid import uuid4
+
+import pytest
+from aiogram import types
+from sqlalchemy import delete, func, select
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.config.app_config import settings
+from src.functionality.rsvp.handlers import RSVPCallback, rsvp_router, save_status
+from src.functionality.rsvp.schemes import RSVPChangeSchema
+from src.middlewares.database import count_statements
+from src.models.database_models import Category, Event, RSVP, User
+from src.models.managers.event import EventManager
+from src.models.managers.rsvp import RSVPManager
+
+
+async def seed_event(session: AsyncSession, organizer: User, people_amount: int = 10) -> Event:
+    category = Category(name="Football", description="")
+    session.add(category)
+    await session.flush()
+    event = Event(
+        title="Match", category_id=category.id, location="Minsk", people_amount=people_amount,
+        experience=0, date_time=date.today(), organizer_id=organizer.id, description="",
+    )
+    session.add(event)
+    await session.flush()
+    return event
+
+
+async def seed_users(session: AsyncSession, count: int) -> list:
+    users = [User(id=uuid4(), username=f"rsvp_{uuid4().hex[:12]}") for _ in range(count)]
+    session.add_all(users)
+    await session.flush()
+    return users
+
+
+async def test_respond_without_seat_changes_upserts_in_one_statement(session):
+    [user] = await seed_users(session, 1)
+    event = await seed_event(session, user)
+
+    with count_statements() as stats:
+        first = (await RSVPManager.respond(session, user.id, event.id, "pending")).rsvp
+        second = (await RSVPManager.respond(session, user.id, event.id, "declined")).rsvp
+    assert stats.statements == 2
+    assert second.id == first.id and second.status == "declined"
+    assert await session.scalar(select(func.count()).select_from(RSVP).where(RSVP.event_id == event.id)) == 1
+
+    assert await RSVPManager.delete_rsvp(session, user.id, event.id) == []
+    assert await RSVPManager.delete_rsvp(session, user.id, event.id) is None
+
+    with pytest.raises(ValueError):
+        await RSVPManager.respond(session, uuid4(), uuid4(), "waitlisted")
+
+
+async def test_respond_moving_a_seat_locks_the_rsvp(session):
+    [user] = await seed_users(session, 1)
+    event = await seed_event(session, user)
+
+    # Locking upsert, seat and status
+    with count_statements() as stats:
+        first = (await RSVPManager.respond(session, user.id, event.id, "accepted")).rsvp
+    assert stats.statements == 3
+    assert await accepted_count(session, event) == 1
+
+    # Upsert that finds the seat, its release, the waitlist promotion and status
+    with count_statements() as stats:
+        second = (await RSVPManager.respond(session, user.id, event.id, "declined")).rsvp
+    assert stats.statements == 4
+    assert second.id == first.id and second.status == "declined"
+    assert await accepted_count(session, event) == 0
+
+
+def test_callback_rejects_unknown_status():
+    event_id = uuid4()
+    assert RSVPCallback.unpack(f"rsvp:set:{event_id}:pending").status == "pending"
+    for status in ("bogus", "waitlisted"):
+        with pytest.raises(ValueError):
+            RSVPCallback.unpack(f"rsvp:set:{event_id}:{status}")
+
+
+async def test_set_without_status_matches_no_handler():
+    [handler] = [handler for handler in rsvp_router.callback_query.handlers if handler.callback is save_status]
+    event_id = uuid4()
+
+    async def matches(data):
+        query = types.CallbackQuery(
+            id="1", chat_instance="1", data=data,
+            from_user=types.User(id=42, is_bot=False, first_name="John"),
+        )
+        return (await handler.check(query))[0]
+
+    assert await matches(RSVPCallback(action="set", event_id=event_id, status="accepted").pack())
+    assert not await matches(f"rsvp:set:{event_id}:")
+
+
+async def test_bulk_respond_is_one_idempotent_statement(session):
+    users = await seed_users(session, 3000)
+    event = await seed_event(session, users[0])
+    changes = [RSVPChangeSchema(user_id=user.id, event_id=event.id, status="pending") for user in users]
+    # Later changes of the same pair win
+    changes += [RSVPChangeSchema(user_id=user.id, event_id=event.id, status="accepted") for user in users[:1000]]
+
+    with count_statements() as stats:
+        assert await RSVPManager.bulk_respond(session, changes) == 3000
+    assert stats.statements == 1
+
+    statuses = dict((await session.execute(
+        select(RSVP.status, func.count()).where(RSVP.event_id == event.id).group_by(RSVP.status)
+    )).all())
+    assert statuses == {"accepted": 1000, "pending": 2000}
+    # Imports override the capacity but keep the counter exact
+    assert await session.scalar(select(Event.accepted_count).where(Event.id == event.id)) == 1000
+
+    # Re-applying the same import changes nothing
+    assert await RSVPManager.bulk_respond(session, changes) == 0
+    assert await RSVPManager.bulk_respond(session, []) == 0
+
+
+async def test_event_with_rsvps_can_be_deleted(session):
+    organizer, guest = await seed_users(session, 2)
+    event = await seed_event(session, organizer)
+    await RSVPManager.respond(session, guest.id, event.id, "accepted")
+
+    # The database cascades to the RSVPs, the ORM does not try to orphan them
+    assert await EventManager.delete_event(session, event.id)
+    assert await session.scalar(select(func.count()).select_from(RSVP).where(RSVP.event_id == event.id)) == 0
+
+
+async def accepted_count(session: AsyncSession, event: Event) -> int:
+    return await session.scalar(select(Event.accepted_count).where(Event.id == event.id))
+
+
+async def test_full_event_waitlists_and_promotes(session):
+    first, second, third, fourth = await seed_users(session, 4)
+    event = await seed_event(session, first, people_amount=2)
+
+    for user in (first, second):
+        assert (await RSVPManager.respond(session, user.id, event.id, "accepted")).rsvp.status == "accepted"
+    third_rsvp = (await RSVPManager.respond(session, third.id, event.id, "accepted")).rsvp
+    assert third_rsvp.status == "waitlisted" and third_rsvp.waitlisted_at is not None
+    await RSVPManager.respond(session, fourth.id, event.id, "accepted")
+    # Accepting again keeps the place on the waitlist
+    again = (await RSVPManager.respond(session, third.id, event.id, "accepted")).rsvp
+    assert again.status == "waitlisted" and again.waitlisted_at == third_rsvp.waitlisted_at
+    assert await accepted_count(session, event) == 2
+
+    result = await RSVPManager.respond(session, first.id, event.id, "declined")
+    assert result.rsvp.status == "declined" and result.promoted == [third.id]
+    assert await RSVPManager.delete_rsvp(session, second.id, event.id) == [fourth.id]
+    assert await accepted_count(session, event) == 2
+
+    statuses = dict((await session.execute(
+        select(RSVP.user_id, RSVP.status).where(RSVP.event_id == event.id)
+    )).all())
+    assert statuses == {first.id: "declined", third.id: "accepted", fourth.id: "accepted"}
+
+    # A raised capacity is filled from the waitlist
+    assert (await RSVPManager.respond(session, first.id, event.id, "accepted")).rsvp.status == "waitlisted"
+    event.people_amount = 3
+    await session.flush()
+    assert await RSVPManager.promote_waitlist(session, event.id) == [first.id]
+    assert await accepted_count(session, event) == 3
+
+
+# Committed concurrent transactions, each join on its own pooled connection
+STRESS_USERS = 300
+STRESS_SEATS = 50
+STRESS_CONNECTIONS = 40
+
+
+async def test_concurrent_joins_never_overbook(db_engine):
+    engine = create_async_engine(URL.create(**settings.get_db_creds), pool_size=STRESS_CONNECTIONS, max_overflow=0)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as session:
+        users = await seed_users(session, STRESS_USERS)
+        event = await seed_event(session, users[0], people_amount=STRESS_SEATS)
+        await session.commit()
+
+    async def respond(user, status):
+        async with session_factory() as session:
+            return await RSVPManager.respond(session, user.id, event.id, status)
+
+    try:
+        results = await asyncio.gather(*(respond(user, "accepted") for user in users))
+        accepted = [result.rsvp.user_id for result in results if result.rsvp.status == "accepted"]
+        assert len(accepted) == STRESS_SEATS
+
+        # Declines and joins at once: every freed seat goes to the waitlist
+        leaving = accepted[:20]
+        results = await asyncio.gather(
+            *(respond(user, "declined") for user in users if user.id in leaving),
+            *(respond(user, "accepted") for user in users if user.id not in leaving),
+        )
+        promoted = [user_id for result in results for user_id in result.promoted]
+        assert len(promoted) == len(set(promoted)) == len(leaving)
+
+        async with session_factory() as session:
+            counted = await session.scalar(
+                select(func.count()).select_from(RSVP).where(RSVP.event_id == event.id, RSVP.status == "accepted")
+            )
+            assert counted == STRESS_SEATS
+            assert await accepted_count(session, event) == STRESS_SEATS
+    finally:
+        async with session_factory() as session:
+            await session.execute(delete(Event).where(Event.id == event.id))
+            await session.execute(delete(Category).where(Category.id == event.category_id))
+            await session.execute(delete(User).where(User.id.in_([user.id for user in users])))
+            await session.commit()
+        await engine.dispose()
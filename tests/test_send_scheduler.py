@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+from aiogram.methods import EditChatInviteLink, EditMessageText, SendChatAction, SendMessage
+
+from src.middlewares.send_rate_limit import is_rate_limited
+from src.services.send_scheduler import Priority, SendScheduler, TokenBucket
+
+
+def test_token_bucket_delay():
+    bucket = TokenBucket(rate=2, capacity=1)
+    now = bucket.updated
+    assert bucket.delay(now) == 0
+    bucket.consume()
+    assert abs(bucket.delay(now) - 0.5) < 1e-6
+
+    bucket.block(now, 3)
+    assert bucket.delay(now + 1) > 1.9
+
+
+async def test_per_chat_limit_does_not_block_other_chats():
+    scheduler = SendScheduler(global_rate=1000, chat_rate=5, chat_burst=1)
+    started = time.monotonic()
+    await scheduler.acquire(1)
+    await asyncio.wait_for(scheduler.acquire(2), 0.05)
+    await scheduler.acquire(1)
+    assert time.monotonic() - started >= 0.15
+
+
+async def test_interactive_lane_goes_first():
+    scheduler = SendScheduler(global_rate=20, chat_rate=1000, chat_burst=1000)
+    scheduler._global.tokens = 0
+    order = []
+
+    async def send(chat_id, priority):
+        await scheduler.acquire(chat_id, priority)
+        order.append(priority)
+
+    bulk = [asyncio.create_task(send(chat_id, Priority.BULK)) for chat_id in range(3)]
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(send(100, Priority.INTERACTIVE))
+    await asyncio.gather(*bulk, interactive)
+
+    assert order[0] == Priority.INTERACTIVE
+    assert scheduler.metrics()["bulk"]["sent"] == 3
+
+
+def test_only_message_methods_are_rate_limited():
+    assert is_rate_limited(SendMessage(chat_id=1, text="hi"))
+    assert is_rate_limited(EditMessageText(chat_id=1, message_id=2, text="hi"))
+    assert not is_rate_limited(SendChatAction(chat_id=1, action="typing"))
+    assert not is_rate_limited(EditChatInviteLink(chat_id=1, invite_link="https://t.me/+x"))
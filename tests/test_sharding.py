@@ -0,0 +1,69 @@
+import pytest
+from aiogram.types import Update
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.services.sharding import ShardSupervisor, raw_update_chat_id, shard_index
+from src.services.webhook import update_chat_id
+
+MESSAGE_UPDATE = {
+    "update_id": 1,
+    "message": {
+        "message_id": 1,
+        "date": 0,
+        "chat": {"id": -100500, "type": "group"},
+        "from": {"id": 42, "is_bot": False, "first_name": "John"},
+        "text": "/menu",
+    },
+}
+
+CALLBACK_UPDATE = {
+    "update_id": 2,
+    "callback_query": {
+        "id": "1",
+        "chat_instance": "1",
+        "data": "view_events",
+        "from": {"id": 42, "is_bot": False, "first_name": "John"},
+        "message": {"message_id": 5, "date": 0, "chat": {"id": 42, "type": "private"}},
+    },
+}
+
+
+def test_raw_chat_id_matches_parsed_update():
+    for raw in (MESSAGE_UPDATE, CALLBACK_UPDATE):
+        assert raw_update_chat_id(raw) == update_chat_id(Update.model_validate(raw))
+
+
+def test_shard_index_is_stable_and_in_range():
+    for chat_id in (-100500, 0, 42, 2 ** 40):
+        index = shard_index(chat_id, 4)
+        assert 0 <= index < 4
+        assert index == shard_index(chat_id, 4)
+
+
+MALFORMED_UPDATES = (
+    ["not", "an", "update"],
+    {"message": {"chat": {}}},
+    {"update_id": 1, "message": {"chat": {}}},
+    {"message": {"chat": "x"}},
+    {"chat": {"id": "12"}},
+    {"update_id": "1"},
+)
+
+
+def test_raw_chat_id_rejects_unroutable_updates():
+    for raw in MALFORMED_UPDATES:
+        with pytest.raises(ValueError):
+            raw_update_chat_id(raw)
+
+
+async def test_webhook_answers_unroutable_updates_with_400():
+    supervisor = ShardSupervisor(workers=2)
+    app = web.Application()
+    app.router.add_post("/webhook", supervisor.handle_update)
+
+    async with TestClient(TestServer(app)) as client:
+        assert (await client.post("/webhook", data="not json")).status == 400
+        for raw in MALFORMED_UPDATES:
+            assert (await client.post("/webhook", json=raw)).status == 400
+        assert (await client.post("/webhook", json=MESSAGE_UPDATE)).status == 200
@@ -0,0 +1,86 @@
+import json
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.functionality.event.schemes import EventCreateSchema
+from src.models.database_models import Category, Event, User
+from src.models.managers.event import EventManager
+from src.utils.dates import LOCAL_TIMEZONE, format_local, parse_local, weekend
+
+NOW = datetime(2031, 6, 4, 12, 0, tzinfo=timezone.utc)  # Wednesday
+
+
+def test_local_dates():
+    parsed = parse_local("01.06.2031 18:30")
+    assert parsed.tzinfo is LOCAL_TIMEZONE and (parsed.hour, parsed.minute) == (18, 30)
+    assert format_local(parsed) == "01.06.2031 18:30"
+    with pytest.raises(ValueError):
+        parse_local("2031-06-01")
+
+    schema = EventCreateSchema(
+        title="Cup", category_id=uuid4(), location="Minsk", people_amount=10, experience=0,
+        date_time="2031-06-01T18:30:00", organizer_id=uuid4(), description="",
+    )
+    assert schema.date_time == parsed
+
+
+def test_weekend():
+    saturday = datetime(2031, 6, 7, tzinfo=LOCAL_TIMEZONE)
+    monday = datetime(2031, 6, 9, tzinfo=LOCAL_TIMEZONE)
+    assert weekend(NOW) == (saturday, monday)
+    # During the weekend it starts now
+    sunday_noon = datetime(2031, 6, 8, 12, 0, tzinfo=LOCAL_TIMEZONE)
+    assert weekend(sunday_noon) == (sunday_noon, monday)
+    assert weekend(monday) == (saturday + timedelta(days=7), monday + timedelta(days=7))
+
+
+@pytest.fixture
+async def session(db_connection):
+    session = AsyncSession(bind=db_connection, join_transaction_mode="create_savepoint", expire_on_commit=False)
+    user = User(id=uuid4(), username=f"upcoming_{uuid4().hex[:8]}")
+    category = Category(id=uuid4(), name="Sports", description="")
+    session.add_all([user, category])
+    await session.flush()
+    # Events are hidden in the far future, so other rows of the table come first or not at all
+    session.add_all([
+        Event(
+            title=f"Event {hours}", location="Minsk", description="", category_id=category.id, people_amount=10,
+            experience=0, date_time=NOW + timedelta(hours=hours), organizer_id=user.id,
+        )
+        for hours in (-48, -1, 1, 24, 72, 80, 24 * 8)
+    ])
+    await session.flush()
+    yield session
+    await session.close()
+
+
+def titles(events):
+    return [event.title for event in events]
+
+
+async def test_upcoming_events_skip_past_ones(session):
+    await session.execute(text("DELETE FROM event WHERE date_time >= :now AND title NOT LIKE 'Event %'"), {"now": NOW})
+    first = await EventManager.get_upcoming_events(session, NOW, limit=2)
+    assert titles(first) == ["Event 1", "Event 24"]
+    last = first[-1]
+    rest = await EventManager.get_upcoming_events(session, NOW, limit=10, after=(last.date_time, last.id))
+    assert titles(rest) == ["Event 72", "Event 80", "Event 192"]
+
+
+async def test_events_between(session):
+    start, end = weekend(NOW)
+    events = await EventManager.get_events_between(session, start, end)
+    assert [event.title for event in events if event.title.startswith("Event ")] == ["Event 72", "Event 80"]
+
+
+async def test_upcoming_events_use_date_time_index(session):
+    await session.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = (await session.execute(
+        text("EXPLAIN (FORMAT JSON) SELECT id FROM event WHERE date_time >= :now ORDER BY date_time, id LIMIT 10"),
+        {"now": NOW},
+    )).scalar()
+    assert "ix_event_date_time_id" in json.dumps(plan if not isinstance(plan, str) else json.loads(plan))
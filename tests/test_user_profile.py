@@ -0,0 +1,71 @@
+from uuid import uuid4
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.functionality.user.schemes import UserSchema
+from src.middlewares.database import count_statements
+from src.models.managers.user import UserManager
+from src.services.profile_cache import profile_cache
+from src.services.user import UserService
+
+
+async def row_version(session: AsyncSession, user_id):
+    return (await session.execute(text('SELECT xmin::text FROM "user" WHERE id = :id'), {"id": user_id})).scalar_one()
+
+
+async def test_upsert_profile_creates_and_updates_in_one_statement(session):
+    user_id = uuid4()
+    username = f"profile_{user_id.hex[:12]}"
+    with count_statements() as stats:
+        user = await UserManager.upsert_profile(
+            session, user_id, UserSchema(first_name="Ann", last_name="Lee", age=30, experience=0), username
+        )
+    assert stats.statements == 1
+    assert (user.username, user.first_name, user.experience) == (username, "Ann", 0)
+    assert user.created_at is not None
+
+    await session.execute(text("UPDATE \"user\" SET role = 'admin' WHERE id = :id"), {"id": user_id})
+    assert (await profile_cache.get(session, user_id)).age == 30
+    with count_statements() as stats:
+        user = await UserManager.upsert_profile(session, user_id, UserSchema(age=31), "other_name")
+    assert stats.statements == 1
+    # Only the given fields are written, the cached profile is dropped
+    assert (user.age, user.first_name, user.username, user.role) == (31, "Ann", username, "admin")
+    assert (await profile_cache.get(session, user_id)).age == 31
+
+
+async def test_upsert_profile_skips_unchanged_rows(session):
+    user_id = uuid4()
+    profile = UserSchema(first_name="Bob", last_name=None, age=40, experience=5)
+    await UserManager.upsert_profile(session, user_id, profile)
+    version = await row_version(session, user_id)
+
+    assert await UserManager.upsert_profile(session, user_id, profile) is None
+    assert await UserManager.upsert_profile(session, user_id, UserSchema()) is None
+    assert await row_version(session, user_id) == version
+
+    user = await UserManager.upsert_profile(session, user_id, UserSchema(last_name="Stone"))
+    assert (user.first_name, user.last_name) == ("Bob", "Stone")
+    assert await row_version(session, user_id) != version
+
+
+def test_profile_schema_validation():
+    with pytest.raises(ValidationError):
+        UserSchema(age=0)
+    with pytest.raises(ValidationError):
+        UserSchema(experience=-1)
+
+
+async def test_update_user_field_rejects_unknown_fields():
+    with pytest.raises(ValueError):
+        await UserService.update_user_field(uuid4(), "role", "admin")
+    with pytest.raises(ValueError):
+        await UserService.update_user_field(uuid4(), "age", 0)
+
+
+async def test_update_user_does_not_create_users(session):
+    with pytest.raises(ValueError):
+        await UserManager.update_user(session, uuid4(), "age", 30)
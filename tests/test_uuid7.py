@@ -0,0 +1,26 @@
+import time
+import uuid
+
+from src.models.database_models import Feedback
+from src.utils.helpers import convert_telegram_id_to_uuid, uuid7
+
+
+def test_uuid7_is_time_ordered():
+    before = int(time.time() * 1000)
+    ids = [uuid7() for _ in range(10_000)]
+    after = int(time.time() * 1000)
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    for value in (ids[0], ids[-1]):
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+        assert before <= value.int >> 80 <= after
+
+
+def test_new_rows_get_uuid7_keys():
+    assert Feedback.__table__.c.id.default.arg(None).version == 7
+
+
+def test_telegram_user_ids_are_unchanged():
+    assert convert_telegram_id_to_uuid(1234) == uuid.UUID(int=1234, version=4)
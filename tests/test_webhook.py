@@ -0,0 +1,69 @@
+import asyncio
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.services.webhook import UpdateWorkerPool, create_webhook_app, update_chat_id
+
+
+def make_update(update_id, chat_id):
+    return Update.model_validate({
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": chat_id, "type": "private"},
+            "text": "hello",
+        },
+    })
+
+
+class RecordingDispatcher:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.seen = []
+
+    async def feed_update(self, bot, update):
+        await asyncio.sleep(self.delay)
+        self.seen.append((update_chat_id(update), update.update_id))
+
+
+async def test_updates_of_one_chat_keep_order():
+    dispatcher = RecordingDispatcher()
+    pool = UpdateWorkerPool(dispatcher, bot=None, workers=4, queue_size=100)
+    pool.start()
+    for update_id in range(40):
+        assert await pool.submit(make_update(update_id, chat_id=update_id % 5))
+    await pool.stop()
+
+    assert pool.processed == 40
+    for chat_id in range(5):
+        ids = [update_id for chat, update_id in dispatcher.seen if chat == chat_id]
+        assert ids == sorted(ids)
+
+
+async def test_full_queue_rejects_updates():
+    pool = UpdateWorkerPool(RecordingDispatcher(delay=0.05), bot=None, workers=1, queue_size=2)
+
+    assert await pool.submit(make_update(1, chat_id=1))
+    assert await pool.submit(make_update(2, chat_id=1))
+    assert not await pool.submit(make_update(3, chat_id=1))
+    assert pool.rejected == 1
+
+    pool.start()
+    await pool.stop()
+    assert pool.processed == 2
+
+
+async def test_malformed_updates_are_rejected():
+    dispatcher = RecordingDispatcher()
+    pool = UpdateWorkerPool(dispatcher, bot=None, workers=1, queue_size=10)
+    app = create_webhook_app(Dispatcher(), Bot("42:TEST"), pool)
+
+    async with TestClient(TestServer(app)) as client:
+        assert (await client.post("/webhook", data="not json")).status == 400
+        assert (await client.post("/webhook", json=["not", "an", "update"])).status == 400
+        assert (await client.post("/webhook", json={"message": {}})).status == 400
+        assert (await client.post("/webhook", json={"update_id": 1})).status == 200
+    assert pool.processed == 1
@@ -0,0 +1,62 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+
+from src.middlewares.database import count_statements, track_statements
+from src.models.database_models import Feedback, User
+from src.services.write_behind import WriteBehindBuffer
+
+
+@pytest.fixture
+async def user(db_engine):
+    track_statements(db_engine)
+    user_id = uuid4()
+    async with db_engine.begin() as connection:
+        await connection.execute(User.__table__.insert().values(id=user_id, username=f"wb_{user_id.hex[:12]}"))
+    yield user_id
+    async with db_engine.begin() as connection:
+        await connection.execute(delete(User).where(User.id == user_id))
+
+
+async def saved_texts(engine, user_id) -> list:
+    async with engine.connect() as connection:
+        result = await connection.execute(select(Feedback.text).where(Feedback.user_id == user_id))
+        return sorted(result.scalars())
+
+
+async def test_rows_are_written_in_one_insert(db_engine, user):
+    buffer = WriteBehindBuffer(db_engine, max_rows=3, max_delay=10)
+
+    with count_statements() as stats:
+        rows = await asyncio.gather(*(buffer.add(Feedback, {"user_id": user, "text": f"t{n}"}) for n in range(3)))
+    assert stats.statements == 1
+    assert len({row["id"] for row in rows}) == 3
+    assert await saved_texts(db_engine, user) == ["t0", "t1", "t2"]
+
+
+async def test_rows_are_flushed_after_delay_and_on_close(db_engine, user):
+    buffer = WriteBehindBuffer(db_engine, max_rows=100, max_delay=0.01)
+    await asyncio.wait_for(buffer.add(Feedback, {"user_id": user, "text": "late"}), 1)
+
+    buffer.max_delay = 10
+    pending = asyncio.create_task(buffer.add(Feedback, {"user_id": user, "text": "pending"}))
+    await asyncio.sleep(0)
+    await buffer.close()
+    await asyncio.wait_for(pending, 1)
+    await asyncio.wait_for(buffer.add(Feedback, {"user_id": user, "text": "after close"}), 1)
+    assert await saved_texts(db_engine, user) == ["after close", "late", "pending"]
+
+
+async def test_bad_row_fails_only_its_own_add(db_engine, user):
+    buffer = WriteBehindBuffer(db_engine, max_rows=2, max_delay=10)
+    good, bad = await asyncio.gather(
+        buffer.add(Feedback, {"user_id": user, "text": "good"}),
+        buffer.add(Feedback, {"user_id": uuid4(), "text": "orphan"}),
+        return_exceptions=True,
+    )
+    assert isinstance(bad, IntegrityError)
+    assert good["text"] == "good"
+    assert await saved_texts(db_engine, user) == ["good"]
@@ -0,0 +1,52 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from src.functionality.event.schemes import EventCreateSchema, EventUpdateSchema
+from src.middlewares.database import count_statements
+from src.models.database_models import Category
+from src.models.managers.event import EventManager
+from src.models.managers.user import UserManager
+
+
+async def test_user_writes_take_one_statement(session):
+    user_id = uuid4()
+    with count_statements() as stats:
+        user = await UserManager.create_user(session, user_id, "writer")
+        assert user.created_at is not None and user.updated_at is not None
+    assert stats.statements == 1
+
+    with count_statements() as stats:
+        user = await UserManager.update_user(session, user_id, "first_name", "Ann")
+        assert (user.first_name, user.username) == ("Ann", "writer")
+        assert user.updated_at >= user.created_at
+    assert stats.statements == 1
+
+    with pytest.raises(ValueError):
+        await UserManager.update_user(session, user_id, "no_such_field", 1)
+
+
+async def test_event_writes_take_one_statement(session):
+    organizer = await UserManager.create_user(session, uuid4(), "organizer")
+    category = Category(name=f"Go {uuid4().hex[:8]}", description="")
+    session.add(category)
+    await session.commit()
+    data = EventCreateSchema(
+        title="Go night", category_id=category.id, location="Minsk", people_amount=8, experience=0,
+        date_time=datetime.now(timezone.utc), organizer_id=organizer.id, description="Bring a board",
+    )
+
+    with count_statements() as stats:
+        event = await EventManager.create_event(session, data)
+        # Server generated columns come back with the INSERT
+        assert (event.accepted_count, event.created_at is not None) == (0, True)
+        assert event.search_vector is not None
+    assert stats.statements == 1
+
+    with count_statements() as stats:
+        updated = await EventManager.update_event(session, event.id, EventUpdateSchema(title="Go evening"))
+        assert (updated.title, updated.location, updated.people_amount) == ("Go evening", "Minsk", 8)
+    assert stats.statements == 1
+
+    assert await EventManager.update_event(session, uuid4(), EventUpdateSchema(title="Nothing")) is None